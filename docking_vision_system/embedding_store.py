@@ -0,0 +1,318 @@
+"""
+Content-addressed store of ViT image embeddings
+
+train_model.ipynb recomputes the pooler_output of every image through
+dataset.map and keeps all of them in memory. The store keeps one float32
+row per distinct image content (SHA-256 of the file) in a memory-mapped
+.npy matrix, so only new or changed images go through the model and
+training slices features straight from the mapped file.
+
+Layout of the store directory:
+    embeddings.npy  (capacity, dim) float32, rows [0, count) valid
+    index.json      model name, count, content hash -> row, path -> (size, mtime, hash)
+
+Usage:
+    python embedding_store.py data/full_train/full/img vit_store/
+    python embedding_store.py IMG_DIR STORE_DIR --threads 8 --batch-size 32
+    python embedding_store.py IMG_DIR STORE_DIR --tune-threads   # pick the fastest thread count first
+
+Training:
+    store = EmbeddingStore("vit_store")
+    features = store.features(store.hashes_of(image_paths))   # view when rows are contiguous
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from preprocessing import iter_image_paths
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+MODEL_NAME = "google/vit-base-patch16-224"
+EMBEDDING_DIM = 768  # pooler_output size of ViT-Base
+MATRIX_FILE = "embeddings.npy"
+INDEX_FILE = "index.json"
+INITIAL_CAPACITY = 1024  # rows; doubled when full
+HASH_BLOCK = 1 << 20  # bytes read at a time when hashing
+
+# (images) -> (len(images), dim) float32
+Embedder = Callable[[List["Image.Image"]], np.ndarray]
+
+
+def content_hash(path: str) -> str:
+    """SHA-256 of the file contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as image_file:
+        for block in iter(lambda: image_file.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Embeddings keyed by image content hash
+
+    Rows are only appended: the matrix is flushed before the index that
+    references it is (atomically) replaced, so an interrupted update loses
+    at most the batch in progress.
+    """
+
+    def __init__(self, directory: str, model_name: str = MODEL_NAME, dim: int = EMBEDDING_DIM):
+        self.directory = directory
+        self.model_name = model_name
+        self.dim = dim
+        self.count = 0
+        self.rows: Dict[str, int] = {}
+        self.files: Dict[str, list] = {}
+        self._matrix: Optional[np.ndarray] = None
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as index_file:
+                index = json.load(index_file)
+            if index["model"] != model_name or index["dim"] != dim:
+                raise ValueError(
+                    f"Store {directory} holds {index['model']} ({index['dim']}-d) embeddings, "
+                    f"not {model_name} ({dim}-d)"
+                )
+            self.count = index["count"]
+            self.rows = index["rows"]
+            self.files = index["files"]
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    @property
+    def matrix_path(self) -> str:
+        return os.path.join(self.directory, MATRIX_FILE)
+
+    def matrix(self) -> np.ndarray:
+        """(count, dim) read-only view of the mapped matrix - no copy"""
+        if self.count == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        if self._matrix is None:
+            self._matrix = np.load(self.matrix_path, mmap_mode="r")
+        return self._matrix[:self.count]
+
+    # ---------------------------------------------------------------------------------------
+    # Lookup
+    # ---------------------------------------------------------------------------------------
+
+    def hash_of(self, path: str) -> str:
+        """Content hash of a file, re-hashed only when its size or mtime changed"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        known = self.files.get(key)
+        if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        digest = content_hash(path)
+        self.files[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def hashes_of(self, paths: Iterable[str]) -> List[str]:
+        return [self.hash_of(path) for path in paths]
+
+    def missing(self, hashes: Iterable[str]) -> List[str]:
+        """Hashes without an embedding yet (each once, in first-seen order)"""
+        return list(dict.fromkeys(digest for digest in hashes if digest not in self.rows))
+
+    def features(self, hashes: Sequence[str]) -> np.ndarray:
+        """
+        (len(hashes), dim) embeddings in the given order
+
+        A view of the mapped file when the rows are consecutive (images added in
+        dataset order), otherwise a gathered copy.
+
+        Raises:
+            KeyError: an image has no embedding (run update first)
+        """
+        rows = np.fromiter((self.rows[digest] for digest in hashes), dtype=np.int64, count=len(hashes))
+        matrix = self.matrix()
+        if len(rows) and np.array_equal(rows, np.arange(rows[0], rows[0] + len(rows))):
+            return matrix[rows[0]:rows[0] + len(rows)]
+        return matrix[rows]
+
+    # ---------------------------------------------------------------------------------------
+    # Update
+    # ---------------------------------------------------------------------------------------
+
+    def _writable_matrix(self, rows_needed: int) -> np.ndarray:
+        """Matrix opened for writing with room for rows_needed rows (grown by doubling)"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._matrix = None
+        if os.path.exists(self.matrix_path):
+            matrix = np.load(self.matrix_path, mmap_mode="r+")
+            if len(matrix) >= rows_needed:
+                return matrix
+        else:
+            matrix = None
+
+        capacity = max(INITIAL_CAPACITY, len(matrix) if matrix is not None else 0)
+        while capacity < rows_needed:
+            capacity *= 2
+        temporary_path = f"{self.matrix_path}.tmp"
+        grown = np.lib.format.open_memmap(temporary_path, mode="w+", dtype=np.float32, shape=(capacity, self.dim))
+        if matrix is not None:
+            grown[:self.count] = matrix[:self.count]
+            del matrix
+        grown.flush()
+        del grown
+        os.replace(temporary_path, self.matrix_path)
+        return np.load(self.matrix_path, mmap_mode="r+")
+
+    def append(self, hashes: Sequence[str], embeddings: np.ndarray):
+        """Stores embeddings of new contents and commits the index"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.shape != (len(hashes), self.dim):
+            raise ValueError(f"Expected ({len(hashes)}, {self.dim}) embeddings, got {embeddings.shape}")
+
+        matrix = self._writable_matrix(self.count + len(hashes))
+        matrix[self.count:self.count + len(hashes)] = embeddings
+        matrix.flush()
+        del matrix
+
+        for offset, digest in enumerate(hashes):
+            self.rows[digest] = self.count + offset
+        self.count += len(hashes)
+        self.save_index()
+
+    def save_index(self):
+        """Replaces the index atomically"""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = f"{self.index_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as index_file:
+            json.dump({
+                "model": self.model_name,
+                "dim": self.dim,
+                "count": self.count,
+                "rows": self.rows,
+                "files": self.files,
+            }, index_file)
+        os.replace(temporary_path, self.index_path)
+        self._matrix = None
+
+    def update(self, paths: Sequence[str], embed: Embedder, batch_size: int = 16) -> int:
+        """
+        Embeds images whose content is not in the store yet
+
+        Returns:
+            Number of images passed through the model
+        """
+        if Image is None:
+            raise RuntimeError("Pillow is required: pip install pillow")
+
+        path_of: Dict[str, str] = {}
+        for path, digest in zip(paths, self.hashes_of(paths)):
+            path_of.setdefault(digest, path)
+        pending = self.missing(path_of)
+
+        for first in range(0, len(pending), batch_size):
+            batch = pending[first:first + batch_size]
+            images = []
+            for digest in batch:
+                with Image.open(path_of[digest]) as image:
+                    images.append(image.convert("RGB"))
+            self.append(batch, embed(images))
+
+        if not pending:
+            self.save_index()  # keep refreshed file stats
+        return len(pending)
+
+
+# ---------------------------------------------------------------------------------------
+# ViT on CPU
+# ---------------------------------------------------------------------------------------
+
+class VitEmbedder:
+    """pooler_output of a Hugging Face ViT, batched CPU inference (torch/transformers needed)"""
+
+    def __init__(self, model_name: str = MODEL_NAME, threads: Optional[int] = None):
+        import torch
+        from transformers import ViTImageProcessor, ViTModel
+
+        self.torch = torch
+        self.processor = ViTImageProcessor.from_pretrained(model_name)
+        self.model = ViTModel.from_pretrained(model_name).eval()
+        self.set_threads(threads or os.cpu_count() or 1)
+
+    def set_threads(self, threads: int):
+        # Intra-op threads do the matrix work; a batch is one graph, so no inter-op parallelism
+        self.threads = threads
+        self.torch.set_num_threads(threads)
+
+    def __call__(self, images: List["Image.Image"]) -> np.ndarray:
+        inputs = self.processor(images=images, return_tensors="pt")
+        with self.torch.inference_mode():
+            return self.model(**inputs).pooler_output.numpy().astype(np.float32, copy=False)
+
+
+def tune_threads(embedder: VitEmbedder, images: List["Image.Image"], candidates: Sequence[int]) -> int:
+    """Sets and returns the thread count with the shortest batch time on the sample images"""
+    timings = {}
+    for threads in candidates:
+        embedder.set_threads(threads)
+        embedder(images)  # warm-up (allocations, thread pool start)
+        started = time.perf_counter()
+        embedder(images)
+        timings[threads] = time.perf_counter() - started
+        print(f"  {threads:3d} threads: {timings[threads] * 1000:.0f} ms / batch of {len(images)}")
+    best = min(timings, key=timings.get)
+    embedder.set_threads(best)
+    return best
+
+
+def thread_candidates() -> List[int]:
+    cores = os.cpu_count() or 1
+    candidates = {1, cores}
+    threads = 2
+    while threads < cores:
+        candidates.add(threads)
+        threads *= 2
+    return sorted(candidates)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compute ViT embeddings of new or changed images")
+    parser.add_argument("images", help="Image directory (imagefolder layout)")
+    parser.add_argument("store", help="Store directory")
+    parser.add_argument("--model", default=MODEL_NAME, help=f"Hugging Face model (default {MODEL_NAME})")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM, help=f"Embedding size (default {EMBEDDING_DIM})")
+    parser.add_argument("--batch-size", type=int, default=16, help="Images per forward pass (default 16)")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (default: CPU count)")
+    parser.add_argument("--tune-threads", action="store_true", help="Benchmark thread counts on one batch first")
+    args = parser.parse_args(argv)
+
+    store = EmbeddingStore(args.store, args.model, args.dim)
+    paths = [os.path.join(args.images, path) for path in iter_image_paths(args.images)]
+    pending = store.missing(store.hashes_of(paths))
+    print(f"{len(paths)} images, {len(pending)} to embed")
+    if not pending:
+        store.save_index()
+        return 0
+
+    embedder = VitEmbedder(args.model, args.threads)
+    if args.tune_threads:
+        sample = []
+        for path in paths[:args.batch_size]:
+            with Image.open(path) as image:
+                sample.append(image.convert("RGB"))
+        print(f"Using {tune_threads(embedder, sample, thread_candidates())} threads")
+
+    started = time.perf_counter()
+    embedded = store.update(paths, embedder, args.batch_size)
+    print(f"Embedded {embedded} images in {time.perf_counter() - started:.1f} s; store holds {store.count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
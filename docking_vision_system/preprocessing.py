@@ -0,0 +1,285 @@
+"""
+Streaming preprocessing of the docking camera images
+
+The notebooks convert the whole image set to RGB in memory and rebuild the
+gamma lookup table on every adjust_gamma call. Here the image directory is
+walked lazily, images are decoded, transformed and written by a process
+pool one at a time, and the lookup tables are built once per process - so
+memory stays at a few images per worker whatever the size of the set.
+
+Usage:
+    python preprocessing.py /data/full_train/full/img preprocessed/ --gamma 10
+    python preprocessing.py IMG_DIR OUT_DIR --shadow-threshold 40 --mask-dir masks/
+    python preprocessing.py IMG_DIR OUT_DIR --workers 8 --force
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+log = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+OUTPUT_EXTENSION = ".png"  # lossless, so repeated runs give identical inputs to the model
+IN_FLIGHT_PER_WORKER = 4  # images queued per worker (bounds memory and pending futures)
+MANIFEST_FILE = "preprocessing.json"  # settings the outputs in a target directory were made with
+MANIFEST_FORMAT = 1  # bump when the transforms change
+
+
+@dataclass(frozen=True)
+class PreprocessOptions:
+    """Transform settings sent to the workers"""
+    gamma: float = 10.0
+    shadow_threshold: Optional[int] = None  # luma below it counts as shadow; None = no masks
+    mask_directory: Optional[str] = None  # None = "<name>_shadow.png" next to the image
+    force: bool = False  # rewrite outputs that are newer than their source
+
+    def manifest(self) -> dict:
+        """Settings that determine the output pixels"""
+        return {
+            "format": MANIFEST_FORMAT,
+            "gamma": self.gamma,
+            "shadow_threshold": self.shadow_threshold,
+            "output": OUTPUT_EXTENSION,
+        }
+
+
+# ---------------------------------------------------------------------------------------
+# Transforms
+# ---------------------------------------------------------------------------------------
+
+@lru_cache(maxsize=16)
+def gamma_table(gamma: float) -> np.ndarray:
+    """256-entry gamma lookup table, same values as the notebook's adjust_gamma (built once)"""
+    table = ((np.arange(256) / 255.0) ** (1.0 / gamma) * 255).astype(np.uint8)
+    table.flags.writeable = False  # shared by every caller
+    return table
+
+
+def apply_lut(image: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """Maps every uint8 channel value through the table"""
+    if cv2 is not None:
+        return cv2.LUT(image, table)
+    return table[image]
+
+
+def to_rgb_array(image) -> np.ndarray:
+    """(H, W, 3) uint8 array of a PIL image (any mode) or an array"""
+    if isinstance(image, np.ndarray):
+        return image
+    return np.asarray(image.convert("RGB"))
+
+
+def adjust_gamma(image, gamma: float = 10.0) -> np.ndarray:
+    """Drop-in replacement for the notebook function - no per-call table, no PIL round trip"""
+    return apply_lut(to_rgb_array(image), gamma_table(gamma))
+
+
+def shadow_mask(rgb: np.ndarray, threshold: int) -> np.ndarray:
+    """(H, W) uint8 mask, 255 where the BT.601 luma of the original image is below threshold"""
+    channels = rgb.astype(np.uint16)
+    luma = (77 * channels[..., 0] + 150 * channels[..., 1] + 29 * channels[..., 2]) >> 8
+    return np.where(luma < threshold, 255, 0).astype(np.uint8)
+
+
+# ---------------------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------------------
+
+def iter_image_paths(directory: str) -> Iterator[str]:
+    """Image paths relative to directory, sorted, found lazily (class subfolders included)"""
+    for root, folders, files in os.walk(directory):
+        folders.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.relpath(os.path.join(root, name), directory)
+
+
+def output_path(directory: str, relative_path: str, suffix: str = "") -> str:
+    return os.path.join(directory, os.path.splitext(relative_path)[0] + suffix + OUTPUT_EXTENSION)
+
+
+def is_up_to_date(source: str, target: str) -> bool:
+    try:
+        return os.stat(target).st_mtime_ns >= os.stat(source).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def read_manifest(target_directory: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(target_directory, MANIFEST_FILE), encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_manifest(target_directory: str, manifest: Optional[dict]):
+    """Replaces the manifest atomically, or removes it (None)"""
+    path = os.path.join(target_directory, MANIFEST_FILE)
+    if manifest is None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+
+    os.makedirs(target_directory, exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+
+def save_image(array: np.ndarray, path: str):
+    """Writes under a temporary name and renames - an interrupted run leaves no partial files"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    Image.fromarray(array).save(temporary_path, format="PNG")
+    os.replace(temporary_path, path)
+
+
+def process_image(
+    source: str,
+    target: str,
+    mask_target: Optional[str],
+    options: PreprocessOptions
+) -> Tuple[str, Optional[str]]:
+    """
+    Preprocesses one image (runs in a worker)
+
+    Returns:
+        Source path and an error message, or None on success
+    """
+    try:
+        with Image.open(source) as image:
+            rgb = to_rgb_array(image)
+        save_image(apply_lut(rgb, gamma_table(options.gamma)), target)
+        if mask_target is not None:
+            save_image(shadow_mask(rgb, options.shadow_threshold), mask_target)
+    except Exception as error:  # one bad file must not stop the run
+        return source, f"{type(error).__name__}: {error}"
+    return source, None
+
+
+def preprocess_directory(
+    source_directory: str,
+    target_directory: str,
+    options: PreprocessOptions = PreprocessOptions(),
+    workers: Optional[int] = None
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Preprocesses every image under source_directory into target_directory
+
+    Results are yielded as images finish (not in order); at most
+    IN_FLIGHT_PER_WORKER images per worker are queued at any time.
+    Outputs newer than their source are skipped unless options.force, or
+    unless the target directory's manifest records other settings (or is
+    missing) - then every image is processed again. The manifest is removed
+    while the run is in progress and written when it ends, so an interrupted
+    run with new settings is not mistaken for a finished one.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required: pip install pillow")
+    workers = workers or os.cpu_count() or 1
+
+    manifest = options.manifest()
+    previous = read_manifest(target_directory)
+    if previous != manifest:
+        if previous is not None:
+            log.warning(
+                "Settings changed since %s was written (%s -> %s) - processing all images again",
+                target_directory, previous, manifest
+            )
+        options = replace(options, force=True)
+    write_manifest(target_directory, None)
+
+    yield from _preprocess_images(source_directory, target_directory, options, workers)
+    write_manifest(target_directory, manifest)
+
+
+def _preprocess_images(
+    source_directory: str,
+    target_directory: str,
+    options: PreprocessOptions,
+    workers: int
+) -> Iterator[Tuple[str, Optional[str]]]:
+    def tasks():
+        for relative_path in iter_image_paths(source_directory):
+            source = os.path.join(source_directory, relative_path)
+            target = output_path(target_directory, relative_path)
+            mask_target = None
+            if options.shadow_threshold is not None:
+                mask_target = (
+                    output_path(options.mask_directory, relative_path) if options.mask_directory
+                    else output_path(target_directory, relative_path, "_shadow")
+                )
+            if options.force or not all(
+                is_up_to_date(source, path) for path in (target, mask_target) if path is not None
+            ):
+                yield source, target, mask_target, options
+
+    if workers == 1:
+        for task in tasks():
+            yield process_image(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for task in tasks():
+            pending.add(pool.submit(process_image, *task))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Gamma / shadow preprocessing of the docking images")
+    parser.add_argument("source", help="Image directory (imagefolder layout)")
+    parser.add_argument("target", help="Output directory for gamma-corrected PNGs")
+    parser.add_argument("--gamma", type=float, default=10.0, help="Gamma (default 10, as in the notebook)")
+    parser.add_argument("--shadow-threshold", type=int, help="Also write shadow masks: luma below this (0-255)")
+    parser.add_argument("--mask-dir", help="Mask output directory (default: next to the images)")
+    parser.add_argument("--workers", type=int, help="Processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rewrite outputs that are already up to date")
+    args = parser.parse_args(argv)
+    if args.gamma <= 0:
+        parser.error("--gamma must be positive")
+
+    options = PreprocessOptions(args.gamma, args.shadow_threshold, args.mask_dir, args.force)
+    started = time.perf_counter()
+    processed = failed = 0
+    for source, error in preprocess_directory(args.source, args.target, options, args.workers):
+        if error is None:
+            processed += 1
+        else:
+            failed += 1
+            print(f"{source}: {error}", file=sys.stderr)
+
+    print(f"Preprocessed {processed} images ({failed} failed) in {time.perf_counter() - started:.1f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
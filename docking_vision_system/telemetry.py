@@ -0,0 +1,173 @@
+"""
+Binary cache of the docking telemetry (all_data.txt)
+
+train_model.ipynb parses the whitespace-delimited text with pandas on every
+run. Here the text is parsed once into one float64 .npy file per column;
+later loads memory-map those files, which takes milliseconds. The cache is
+rebuilt when the source changes: a size/mtime change triggers a SHA-256
+comparison, so a touched but identical file is not parsed again.
+
+Layout (default: next to the source):
+    all_data.txt.cache/<column>.npy   one column, (rows,) float64
+    all_data.txt.cache/meta.json      source hash, size, mtime, rows, columns
+
+Usage:
+    python telemetry.py data/full_train/full/data/all_data.txt      # build / check the cache
+
+    telemetry = load_telemetry("all_data.txt")
+    numeric_features = columns_matrix(telemetry, RELATIVE_POSITION)
+    y = columns_matrix(telemetry, POSE_TARGETS)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+COLUMNS = (
+    "rel_x", "rel_y", "rel_z",
+    "tar_x", "tar_y", "tar_z", "tar_w",
+    "chas_x", "chas_y", "chas_z", "chas_w",
+    "time",
+)
+RELATIVE_POSITION = ("rel_x", "rel_y", "rel_z")
+POSE_TARGETS = ("tar_x", "tar_y", "tar_z", "tar_w", "chas_x", "chas_y", "chas_z", "chas_w")
+
+CACHE_FORMAT = 1
+META_FILE = "meta.json"
+HASH_BLOCK = 1 << 20  # bytes read at a time when hashing
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of the file contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source_file:
+        for block in iter(lambda: source_file.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_cache_directory(source: str) -> str:
+    return f"{source}.cache"
+
+
+def read_meta(cache_directory: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(cache_directory, META_FILE), encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+    except (FileNotFoundError, ValueError):
+        return None
+    if meta.get("format") != CACHE_FORMAT or tuple(meta.get("columns", ())) != COLUMNS:
+        return None
+    return meta
+
+
+def write_meta(cache_directory: str, meta: dict):
+    """Replaces meta.json atomically - it is written last and marks the cache as complete"""
+    temporary_path = os.path.join(cache_directory, f"{META_FILE}.tmp")
+    with open(temporary_path, "w", encoding="utf-8") as meta_file:
+        json.dump(meta, meta_file, indent=1)
+    os.replace(temporary_path, os.path.join(cache_directory, META_FILE))
+
+
+def parse_text(source: str) -> np.ndarray:
+    """(rows, len(COLUMNS)) float64 parsed from whitespace-delimited text (NumPy's C reader)"""
+    data = np.loadtxt(source, dtype=np.float64, ndmin=2)
+    if data.shape[1] != len(COLUMNS):
+        raise ValueError(f"{source}: expected {len(COLUMNS)} columns, found {data.shape[1]}")
+    return data
+
+
+def build_cache(source: str, cache_directory: str, digest: Optional[str] = None) -> dict:
+    """Parses the source and writes one .npy per column; returns the new meta"""
+    stat = os.stat(source)
+    digest = digest or file_hash(source)
+    data = parse_text(source)
+
+    os.makedirs(cache_directory, exist_ok=True)
+    # Invalidate first: a run interrupted below leaves no meta and is rebuilt next time
+    try:
+        os.remove(os.path.join(cache_directory, META_FILE))
+    except FileNotFoundError:
+        pass
+
+    for index, name in enumerate(COLUMNS):
+        temporary_path = os.path.join(cache_directory, f"{name}.tmp.npy")
+        np.save(temporary_path, np.ascontiguousarray(data[:, index]))
+        os.replace(temporary_path, os.path.join(cache_directory, f"{name}.npy"))
+
+    meta = {
+        "format": CACHE_FORMAT,
+        "source_sha256": digest,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "rows": len(data),
+        "columns": list(COLUMNS),
+    }
+    write_meta(cache_directory, meta)
+    return meta
+
+
+def ensure_cache(source: str, cache_directory: Optional[str] = None) -> str:
+    """
+    Builds or refreshes the cache of source if needed
+
+    Returns:
+        Cache directory
+    """
+    cache_directory = cache_directory or default_cache_directory(source)
+    meta = read_meta(cache_directory)
+    stat = os.stat(source)
+
+    if meta is not None and meta["source_size"] == stat.st_size and meta["source_mtime_ns"] == stat.st_mtime_ns:
+        return cache_directory
+
+    digest = file_hash(source)
+    if meta is not None and meta["source_sha256"] == digest:
+        # Same contents under a new mtime (copy, touch, checkout) - keep the data
+        meta["source_size"] = stat.st_size
+        meta["source_mtime_ns"] = stat.st_mtime_ns
+        write_meta(cache_directory, meta)
+        return cache_directory
+
+    build_cache(source, cache_directory, digest)
+    return cache_directory
+
+
+def load_telemetry(source: str, cache_directory: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Telemetry columns by name, as read-only memory maps of the cache
+
+    The cache is built on first use and rebuilt when the source changes.
+    """
+    cache_directory = ensure_cache(source, cache_directory)
+    return {
+        name: np.load(os.path.join(cache_directory, f"{name}.npy"), mmap_mode="r")
+        for name in COLUMNS
+    }
+
+
+def columns_matrix(telemetry: Dict[str, np.ndarray], names: Sequence[str], dtype=np.float32) -> np.ndarray:
+    """(rows, len(names)) matrix of the given columns, e.g. model inputs or targets"""
+    return np.stack([telemetry[name] for name in names], axis=1).astype(dtype, copy=False)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build or check the binary cache of all_data.txt")
+    parser.add_argument("source", help="Whitespace-delimited telemetry text")
+    parser.add_argument("--cache-dir", help="Cache directory (default: <source>.cache)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    telemetry = load_telemetry(args.source, args.cache_dir)
+    print(f"{len(telemetry['time'])} rows, {len(COLUMNS)} columns in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
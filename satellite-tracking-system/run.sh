@@ -8,12 +8,21 @@ echo ""
 # Activate virtual environment
 source .venv/bin/activate
 
-# Run server from API module
-uvicorn satellite_api:system_api --reload --host 0.0.0.0 --port 8000
+# Number of worker processes (WORKERS=4 ./run.sh)
+WORKERS="${WORKERS:-1}"
+
+if [ "$WORKERS" -gt 1 ]; then
+    # Workers must share a file-backed catalog - an in-memory database is private to one process
+    export SATELLITE_DATABASE_URL="${SATELLITE_DATABASE_URL:-sqlite:///./satellites.db}"
+    echo "Workers: $WORKERS, database: $SATELLITE_DATABASE_URL"
+    uvicorn satellite_api:system_api --workers "$WORKERS" --host 0.0.0.0 --port 8000
+else
+    # Run server from API module
+    uvicorn satellite_api:system_api --reload --host 0.0.0.0 --port 8000
+fi
 
 # Info
 echo ""
 echo "Server running at: http://localhost:8000"
 echo "API Documentation: http://localhost:8000/docs"
 echo "Alternative documentation: http://localhost:8000/redoc"
-
@@ -8,20 +8,38 @@ Endpoints:
 - /status - system status check
 - /orbits/ - orbit management
 - /satellites/ - orbital object management
+- /satellites/tle - two-line element catalog import
 - /satellites/{id}/position - position calculation
+- /satellites/{id}/eclipses, /eclipses - Earth shadow windows
+- /ground-stations/ - ground station management and pass prediction
 - /proximities - satellite proximity detection
+- /proximities/jobs - background proximity scans (progress, paged results, cancellation)
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import math
 import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict
+from functools import cached_property
+from typing import Callable, List, Optional, Dict, Tuple
 
-from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, Path
+import numpy as np
+from fastapi import (
+    APIRouter, FastAPI, Depends, HTTPException, Query, Request, Response, Path, WebSocket, WebSocketDisconnect
+)
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from sqlalchemy.orm.exc import StaleDataError
 
 from satellite_models import (
     OrbitDBModel,
@@ -31,22 +49,78 @@ from satellite_models import (
     ObjectInputSchema,
     ObjectOutputSchema,
     PositionOutputSchema,
+    TrackPointSchema,
+    TrackSchema,
+    OverheadPositionSchema,
+    OverheadListSchema,
+    PositionSubscriptionSchema,
     OrbitListSchema,
     ObjectListSchema,
     CollisionListSchema,
     CollisionEventSchema,
+    TLEImportResultSchema,
+    EclipseWindowSchema,
+    SatelliteEclipsesSchema,
+    EclipseListSchema,
+    GroundStationInputSchema,
+    GroundStationOutputSchema,
+    CatalogChangeDBModel,
+    CatalogChangeSchema,
+    CatalogChangeListSchema,
+    GroundStationListSchema,
+    PassWindowSchema,
+    SatellitePassesSchema,
+    PassListSchema,
+    GroundStationDBModel,
+    ProximityJobDBModel,
+    ProximityJobEventDBModel,
+    ProximityJobInputSchema,
+    ProximityJobOutputSchema,
+    ProximityJobResultsSchema,
+    PoseInputSchema,
+    PoseOutputSchema,
+    QuaternionSchema,
+    OrbitalElementsBatch,
     SpaceEvent,
+    ScanCostEstimate,
+    ScanPlan,
+    ProximityScanResult,
     GeodeticCoordinates,
     OrbitalParameters,
     ObjectType,
+    format_precise_timestamp,
     get_db_session,
-    EARTH_BASE_RADIUS,
+    init_database,
+    configure_logging,
+    uses_memory_database,
+    SessionFactory,
     DEFAULT_PAGE_SIZE,
     MAX_ITEMS_PER_PAGE,
+    MAX_CHANGES_PER_PAGE,
     PROXIMITY_TOLERANCE,
+    PROPAGATOR_NAME,
+    MAX_ANALYSIS_RANGE_DAYS,
+    SCAN_COST_BUDGET,
+    SCAN_DEADLINE_SECONDS,
+    POSITION_CACHE_MAX_AGE,
+    MAX_TRACK_POINTS,
+    WARM_UP_ON_STARTUP,
+    SERVER_TIMING_ENABLED,
+    ENCOUNTER_LOG_LIMIT,
+    ENCOUNTER_LOG_PERIOD,
+    SCREEN_CHUNK_PAIR_STEPS,
+    ACTIVE_JOB_STATES,
+    LogRateLimiter,
 )
 from satellite_services import (
-    KeplerianPropagator,
+    CatalogSnapshotCache,
+    OrbitPropagator,
+    StageTimer,
+    current_stage_timer,
+    record_stage,
+    timed_stage,
+    TLECatalogImporter,
+    create_propagator,
     ISO8601Validator,
     TimeValidationError,
 )
@@ -64,7 +138,7 @@ class OrbitalCalculationService:
     def __init__(self, propagator):
         self.propagator = propagator
         self.validator = ISO8601Validator()
-        log.info(f"Initialized calculation service with propagator: {propagator.__class__.__name__}")
+        log.info("Initialized calculation service with propagator: %s", propagator.__class__.__name__)
     
     def calculate_position_at_time(
         self,
@@ -90,21 +164,14 @@ class OrbitalCalculationService:
             return None  # Object did not exist yet
         
         # Prepare orbital parameters
-        orbit = object_model.orbit_ref
-        params = OrbitalParameters(
-            semi_major_axis=EARTH_BASE_RADIUS + orbit.altitude_km,
-            inclination_deg=orbit.inclination_angle,
-            ascending_node=orbit.ascending_node
-        )
+        params = OrbitalParameters.from_model(object_model.orbit_ref)
         
-        # Calculate time from introduction
-        time_delta = (timestamp - introduction_date).total_seconds()
-        
-        # Propagate position
-        coordinates = self.propagator.propagate_position(
-            params,
-            time_delta,
-            object_model.starting_lon_position
+        # Propagate position from introduction date
+        coordinates = self.propagator.calculate_position(
+            orbit_params=params,
+            moment=timestamp,
+            initial_longitude=object_model.starting_lon_position,
+            start_date=introduction_date
         )
         
         return coordinates
@@ -113,10 +180,22 @@ class OrbitalCalculationService:
 class EventAnalysisService:
     """Service for orbital event analysis (collisions, proximities)"""
     
-    def __init__(self, calculation_service: OrbitalCalculationService):
+    def __init__(self, calculation_service: OrbitalCalculationService, backend=None):
+        """
+        Args:
+            calculation_service: Provides the propagator
+            backend: ComputeBackend screening stepped pairs (default: SATELLITE_COMPUTE_BACKEND)
+        """
+        if backend is None:
+            from satellite_backends import create_backend
+            backend = create_backend()
+        
         self.calculation_service = calculation_service
+        self.backend = backend
         self.detection_threshold = PROXIMITY_TOLERANCE
-        log.info(f"Initialized event service with threshold: {self.detection_threshold} km")
+        self.encounter_log = LogRateLimiter(ENCOUNTER_LOG_LIMIT, ENCOUNTER_LOG_PERIOD)
+        log.info("Initialized event service with threshold: %s km, %s backend",
+                 self.detection_threshold, self.backend.name)
     
     def parse_precision(self, precision_text: str) -> timedelta:
         """Parses precision string to timedelta"""
@@ -151,13 +230,91 @@ class EventAnalysisService:
         
         return datetime.fromtimestamp(rounded, tz=timezone.utc)
     
-    def detect_events_in_interval(
+    def plan_scan(
+        self,
+        objects,
+        start_time: datetime,
+        end_time: datetime,
+        time_delta: timedelta
+    ) -> ScanPlan:
+        """
+        Splits a scan into closed-form encounters and pairs that must be stepped
+        
+        Returns:
+            Co-orbital encounters, stepped (id_a, id_b) pairs and the objects they involve
+        """
+        with timed_stage("plan"):
+            active_objects = sorted(
+                (obj for obj in objects if obj.operational_state == ObjectType.ACTIVE.value),
+                key=lambda obj: obj.record_id
+            )
+            
+            # Co-orbital pairs are solved once; only the remaining pairs are stepped
+            events, closed_form_pairs = self._co_orbital_encounters(
+                active_objects, start_time, end_time, time_delta
+            )
+            stepped_pairs = [
+                (obj_a.record_id, obj_b.record_id)
+                for i, obj_a in enumerate(active_objects)
+                for obj_b in active_objects[i+1:]
+                if (obj_a.record_id, obj_b.record_id) not in closed_form_pairs
+            ]
+            stepped_ids = {object_id for pair in stepped_pairs for object_id in pair}
+            stepped_objects = [obj for obj in active_objects if obj.record_id in stepped_ids]
+        
+        return ScanPlan(events, stepped_pairs, stepped_objects, time_delta)
+    
+    def estimate_scan_cost(
         self,
         objects,
         start_time: datetime,
         end_time: datetime,
         time_delta: timedelta
-    ):
+    ) -> Tuple[ScanCostEstimate, ScanPlan]:
+        """
+        Cost of a scan in pair-steps, computed before any stepping
+        
+        Returns:
+            The estimate and the plan it was computed from - pass the plan to
+            detect_events_in_interval so the co-orbital pass is not repeated
+        """
+        start_time = self.round_to_grid(start_time, time_delta)
+        end_time = self.round_to_grid(end_time, time_delta)
+        plan = self.plan_scan(objects, start_time, end_time, time_delta)
+        
+        estimate = ScanCostEstimate(
+            steps=int((end_time - start_time) / time_delta) + 1,
+            pairs=len(plan.stepped_pairs),
+            span_seconds=(end_time - start_time).total_seconds()
+        )
+        return estimate, plan
+    
+    def downgrade_precision(self, estimate: ScanCostEstimate, budget: int) -> timedelta:
+        """
+        Coarsest needed whole-second step that brings the scan within budget
+        
+        Raises:
+            ValueError: If even a single step exceeds the budget
+        """
+        affordable_steps = budget // max(estimate.pairs, 1)
+        if affordable_steps < 2:
+            raise ValueError(
+                f"Scan of {estimate.pairs} pairs exceeds budget of {budget} pair-steps at any precision"
+            )
+        
+        return timedelta(seconds=max(1, math.ceil(estimate.span_seconds / (affordable_steps - 1))))
+    
+    def detect_events_in_interval(
+        self,
+        objects,
+        start_time: datetime,
+        end_time: datetime,
+        time_delta: timedelta,
+        deadline: Optional[float] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        plan: Optional[ScanPlan] = None
+    ) -> ProximityScanResult:
         """
         Detects events in time interval
         
@@ -166,69 +323,215 @@ class EventAnalysisService:
             start_time: Interval start
             end_time: Interval end
             time_delta: Analysis time step
+            deadline: time.monotonic() value after which the scan stops early
+            progress_callback: Called with the number of steps done after every step
+            cancel_event: Stops the scan early when set
+            plan: Plan from estimate_scan_cost; ignored if made for another time step
             
         Returns:
-            List of detected events
+            Encounters - consecutive steps within threshold of one pair are merged
+            into a single event at the closest approach - and how far the scan got
         """
-        events = []
+        open_encounters: Dict[Tuple[int, int], SpaceEvent] = {}
         
         # Round boundaries to grid
         start_time = self.round_to_grid(start_time, time_delta)
         end_time = self.round_to_grid(end_time, time_delta)
         
-        log.info(f"Starting event analysis from {start_time} to {end_time}")
+        log.info("Starting event analysis from %s to %s", start_time, end_time)
+        
+        if plan is None or plan.time_delta != time_delta:
+            plan = self.plan_scan(objects, start_time, end_time, time_delta)
+        events = [self._close_encounter(evt) for evt in plan.events]
+        stepped_pairs, stepped_objects = plan.stepped_pairs, plan.stepped_objects
+        
+        if not stepped_pairs:
+            # Closed-form encounters already cover the whole interval
+            self._report_suppressed_encounters()
+            log.info("Analysis completed without stepping, detected %d encounters", len(events))
+            return ProximityScanResult(events=events, analyzed_until=end_time)
         
-        # Iterate over time grid
-        current_time = start_time
+        # Screen the time grid in chunks; the backend returns only pair-steps within threshold
+        propagator = self.calculation_service.propagator
+        elements = OrbitalElementsBatch.from_models(stepped_objects)
+        rows = {obj.record_id: row for row, obj in enumerate(stepped_objects)}
+        pair_rows = np.array([(rows[id_a], rows[id_b]) for id_a, id_b in stepped_pairs], dtype=np.int64)
+        
+        step_count = int((end_time - start_time) / time_delta) + 1
+        chunk_steps = max(1, SCREEN_CHUNK_PAIR_STEPS // len(stepped_pairs))
+        analyzed_until = None
         step_counter = 0
         
-        while current_time <= end_time:
-            # Calculate positions of all active objects
-            positions_map: Dict[int, GeodeticCoordinates] = {}
+        while step_counter < step_count:
+            if deadline is not None and time.monotonic() > deadline:
+                log.warning("Event analysis deadline reached after %d steps at %s",
+                            step_counter, start_time + step_counter * time_delta)
+                break
+            if cancel_event is not None and cancel_event.is_set():
+                log.info("Event analysis cancelled after %d steps at %s",
+                         step_counter, start_time + step_counter * time_delta)
+                break
             
-            for obj in objects:
-                if obj.operational_state != ObjectType.ACTIVE.value:
-                    continue
-                
-                position = self.calculation_service.calculate_position_at_time(
-                    obj,
-                    current_time
-                )
-                
-                if position is not None:
-                    positions_map[obj.record_id] = position
+            chunk_end = min(step_count, step_counter + chunk_steps)
+            moments = start_time.timestamp() + np.arange(step_counter, chunk_end) * time_delta.total_seconds()
+            hits = self.backend.screen_pairs(propagator, elements, pair_rows, moments, self.detection_threshold)
             
-            # Analyze object pairs
-            active_ids = sorted(positions_map.keys())
+            # Hits are sorted by step - walk them step by step to merge encounters
+            step_bounds = np.searchsorted(hits.steps, np.arange(len(moments) + 1)).tolist()
+            hit_pairs, distances = hits.pairs.tolist(), hits.distances.tolist()
+            latitude, longitude, altitude = hits.latitude.tolist(), hits.longitude.tolist(), hits.altitude.tolist()
             
-            for i, id_a in enumerate(active_ids):
-                for id_b in active_ids[i+1:]:
-                    pos_a = positions_map[id_a]
-                    pos_b = positions_map[id_b]
-                    
-                    distance = pos_a.distance_to(pos_b)
+            for offset in range(len(moments)):
+                current_time = start_time + (step_counter + offset) * time_delta
+                pairs_in_range = set()
+                
+                for hit in range(step_bounds[offset], step_bounds[offset + 1]):
+                    pair = stepped_pairs[hit_pairs[hit]]
+                    pairs_in_range.add(pair)
+                    location = GeodeticCoordinates(
+                        latitude=latitude[hit], longitude=longitude[hit], altitude_asl=altitude[hit]
+                    )
                     
-                    if distance < self.detection_threshold:
-                        event = SpaceEvent(
-                            object_id_a=min(id_a, id_b),
-                            object_id_b=max(id_a, id_b),
+                    encounter = open_encounters.get(pair)
+                    if encounter is None:
+                        open_encounters[pair] = SpaceEvent(
+                            object_id_a=pair[0],
+                            object_id_b=pair[1],
                             time_moment=current_time,
-                            location=pos_a,
-                            min_distance=distance
-                        )
-                        events.append(event)
-                        
-                        log.warning(
-                            f"Proximity detected: {id_a} <-> {id_b} "
-                            f"distance={distance:.6f}km at {current_time}"
+                            location=location,
+                            min_distance=distances[hit],
+                            start_time=current_time,
+                            end_time=current_time
                         )
+                    else:
+                        encounter.record_step(current_time, location, distances[hit])
+                
+                # Pairs that left the threshold close their encounter
+                for pair in [p for p in open_encounters if p not in pairs_in_range]:
+                    events.append(self._close_encounter(open_encounters.pop(pair)))
+            
+            step_counter = chunk_end
+            analyzed_until = start_time + (step_counter - 1) * time_delta
             
-            current_time += time_delta
-            step_counter += 1
+            if progress_callback is not None:
+                progress_callback(step_counter)
+        
+        events.extend(self._close_encounter(encounter) for encounter in open_encounters.values())
+        
+        complete = step_counter == step_count
+        if not complete:
+            # Closed-form encounters only hold as far as the scan got
+            events = [evt for evt in events if analyzed_until is not None and evt.start_time <= analyzed_until]
+            for evt in events:
+                evt.end_time = min(evt.end_time, analyzed_until)
+        
+        self._report_suppressed_encounters()
+        log.info("Analysis completed. Analyzed %d steps, detected %d encounters", step_counter, len(events))
+        
+        return ProximityScanResult(events=events, analyzed_until=analyzed_until, complete=complete)
+    
+    def _co_orbital_encounters(
+        self,
+        active_objects,
+        start_time: datetime,
+        end_time: datetime,
+        time_delta: timedelta
+    ) -> Tuple[List[SpaceEvent], set]:
+        """
+        Encounters between objects sharing an orbit record, in closed form
+        
+        Where the propagator keeps their separation constant, a pair within threshold
+        is in range from the first grid step both objects exist until the end. An orbit
+        with any pair the propagator cannot solve is left to stepping as a whole.
+        
+        Not logged here: the plan is also built for cost estimates. The scan logs
+        the encounters it reports.
+        
+        Returns:
+            Encounters and the set of (id_a, id_b) pairs that need no stepping
+        """
+        events = []
+        closed_form_pairs = set()
+        propagator = self.calculation_service.propagator
         
-        log.info(f"Analysis completed. Analyzed {step_counter} steps, detected {len(events)} events")
+        objects_by_orbit = defaultdict(list)
+        for obj in active_objects:
+            objects_by_orbit[obj.associated_orbit_id].append(obj)
         
-        return events
+        for members in objects_by_orbit.values():
+            if len(members) < 2:
+                continue
+            
+            separations = self._co_orbital_separations(
+                propagator, OrbitalParameters.from_model(members[0].orbit_ref), members
+            )
+            if separations is None:
+                continue
+            
+            for obj_a, obj_b, separation in separations:
+                closed_form_pairs.add((obj_a.record_id, obj_b.record_id))
+                if separation >= self.detection_threshold:
+                    continue
+                
+                # First grid step at which both objects exist
+                latest_epoch = max(self._as_utc(obj_a.introduction_date), self._as_utc(obj_b.introduction_date))
+                steps_to_epoch = max(0, math.ceil((latest_epoch - start_time) / time_delta))
+                first_step = start_time + steps_to_epoch * time_delta
+                if first_step > end_time:
+                    continue
+                
+                events.append(SpaceEvent(
+                    object_id_a=obj_a.record_id,
+                    object_id_b=obj_b.record_id,
+                    time_moment=first_step,
+                    location=self.calculation_service.calculate_position_at_time(obj_a, first_step),
+                    min_distance=separation,
+                    start_time=first_step,
+                    end_time=end_time
+                ))
+        
+        return events, closed_form_pairs
+    
+    def _co_orbital_separations(
+        self,
+        propagator: OrbitPropagator,
+        params: OrbitalParameters,
+        members
+    ) -> Optional[List[Tuple[ObjectDBModel, ObjectDBModel, float]]]:
+        """Constant separation of every pair of one orbit, or None if any pair has none"""
+        separations = []
+        for i, obj_a in enumerate(members):
+            for obj_b in members[i+1:]:
+                separation = propagator.co_orbital_separation(
+                    params, obj_a.starting_lon_position, self._as_utc(obj_a.introduction_date),
+                    obj_b.starting_lon_position, self._as_utc(obj_b.introduction_date)
+                )
+                if separation is None:
+                    return None
+                separations.append((obj_a, obj_b, separation))
+        return separations
+    
+    @staticmethod
+    def _as_utc(moment: datetime) -> datetime:
+        return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+    
+    def _close_encounter(self, encounter: SpaceEvent) -> SpaceEvent:
+        """Logs finished encounter once (not per step), rate-limited and formatted lazily"""
+        if log.isEnabledFor(logging.WARNING) and self.encounter_log.allow():
+            log.warning(
+                "Proximity detected: %s <-> %s min distance=%.6fkm at %s (%s - %s)",
+                encounter.object_id_a, encounter.object_id_b, encounter.min_distance,
+                encounter.time_moment, encounter.start_time, encounter.end_time
+            )
+        return encounter
+    
+    def _report_suppressed_encounters(self):
+        suppressed = self.encounter_log.take_suppressed()
+        if suppressed:
+            log.warning(
+                "%d further proximity logs suppressed (limit %d per %.0f s)",
+                suppressed, self.encounter_log.limit, self.encounter_log.period
+            )
 
 
 # ===========================================================================================
@@ -252,36 +555,272 @@ def validate_pagination_parameters(skipped: int, limit: int):
         raise HTTPException(status_code=400, detail="Invalid pagination parameters")
 
 
+def validate_analysis_range(start: str, end: str, max_days: Optional[int] = MAX_ANALYSIS_RANGE_DAYS):
+    """Parses and validates an ISO-8601 analysis interval (max_days None: any length)"""
+    validator = ISO8601Validator()
+    
+    try:
+        dt_start = validator.validate_timestamp(start)
+        dt_end = validator.validate_timestamp(end)
+    except TimeValidationError:
+        raise HTTPException(status_code=400, detail="Invalid timestamp format")
+    
+    if dt_start >= dt_end:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    
+    if max_days is not None and dt_end - dt_start > timedelta(days=max_days):
+        raise HTTPException(status_code=400, detail=f"Date range longer than {max_days} days")
+    
+    return dt_start, dt_end
+
+
+CATALOG_CACHE_CONTROL = "no-cache"  # may be stored, but revalidated with If-None-Match
+POSITION_CACHE_CONTROL = f"public, max-age={POSITION_CACHE_MAX_AGE}"
+
+
+def make_etag(*parts) -> str:
+    """Strong entity tag from everything that determines a response"""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str
+) -> Optional[Response]:
+    """
+    Handles If-None-Match
+    
+    Returns:
+        304 response if the client already has this representation, otherwise
+        None after setting ETag/Cache-Control on the regular response
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison, as required for If-None-Match
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in candidates or etag in candidates:
+            return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+
+def validate_scan_request(start_date: str, end_date: str, precision: str):
+    """Parses proximity scan parameters (400 on invalid input)"""
+    validator = ISO8601Validator()
+    
+    try:
+        dt_start = validator.validate_timestamp(start_date)
+        dt_end = validator.validate_timestamp(end_date)
+    except TimeValidationError:
+        raise HTTPException(status_code=400, detail="Invalid timestamp format")
+    
+    if dt_start >= dt_end:
+        raise HTTPException(status_code=400, detail="Invalid timestamp format")
+    
+    try:
+        time_delta = services.events.parse_precision(precision)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid timestamp format")
+    
+    return dt_start, dt_end, time_delta
+
+
 # ===========================================================================================
-# FASTAPI APPLICATION - Presentation layer
+# SERVICE REGISTRY - built on first use, not at import
 # ===========================================================================================
 
-system_api = FastAPI(
-    title="Satellite Orbit Tracking System",
-    version="2.0.0",
-    description="Orbital object management and tracking system"
-)
+class ServiceRegistry:
+    """
+    Services shared by all requests of one process
+    
+    Each service is created on first access, so importing the module (and
+    starting a worker) does no work beyond defining routes. Modules needed
+    only by some endpoints are imported by their service.
+    """
+    
+    @cached_property
+    def propagator(self) -> OrbitPropagator:
+        return create_propagator(PROPAGATOR_NAME)
+    
+    @cached_property
+    def calculation(self) -> OrbitalCalculationService:
+        return OrbitalCalculationService(self.propagator)
+    
+    @cached_property
+    def compute_backend(self):
+        from satellite_backends import create_backend
+        return create_backend()
+    
+    @cached_property
+    def events(self) -> EventAnalysisService:
+        return EventAnalysisService(self.calculation, self.compute_backend)
+    
+    @cached_property
+    def catalog_cache(self) -> CatalogSnapshotCache:
+        return CatalogSnapshotCache()
+    
+    @cached_property
+    def tle_importer(self) -> TLECatalogImporter:
+        return TLECatalogImporter()
+    
+    @cached_property
+    def eclipses(self):
+        from satellite_visibility import EclipseAnalysisService
+        return EclipseAnalysisService(self.propagator)
+    
+    @cached_property
+    def passes(self):
+        from satellite_visibility import PassPredictionService
+        return PassPredictionService(self.propagator)
+    
+    @cached_property
+    def ephemeris(self):
+        from satellite_ephemeris import EphemerisArchive
+        return EphemerisArchive()
+    
+    @cached_property
+    def regions(self):
+        from satellite_visibility import RegionQueryService
+        return RegionQueryService(self.propagator)
+    
+    @cached_property
+    def position_stream(self):
+        from satellite_streaming import PositionStreamHub
+        return PositionStreamHub(self.propagator, load_stream_elements)
+    
+    @cached_property
+    def proximity_jobs(self):
+        from satellite_jobs import ProximityJobManager
+        return ProximityJobManager(self.events, load_proximity_objects)
+    
+    @cached_property
+    def pose(self):
+        # Not cached on failure: the model is looked up again on the next request
+        from satellite_pose import create_pose_batcher
+        return create_pose_batcher()
+    
+    def is_built(self, name: str) -> bool:
+        """True if the service was already created (no side effects)"""
+        return name in self.__dict__
 
-# Middleware CORS
-system_api.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Service initialization
-main_propagator = KeplerianPropagator()
-global_calculation_service = OrbitalCalculationService(main_propagator)
-serwis_zdarzen_globalny = EventAnalysisService(global_calculation_service)
+services = ServiceRegistry()
+
+# Module-level names of the services from before the registry existed
+_LEGACY_SERVICE_NAMES = {
+    "main_propagator": "propagator",
+    "global_calculation_service": "calculation",
+    "serwis_zdarzen_globalny": "events",
+    "catalog_cache": "catalog_cache",
+    "tle_importer": "tle_importer",
+    "eclipse_service": "eclipses",
+    "pass_service": "passes",
+    "proximity_jobs": "proximity_jobs",
+}
+
+
+def __getattr__(name: str):
+    if name in _LEGACY_SERVICE_NAMES:
+        return getattr(services, _LEGACY_SERVICE_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_catalog_objects(session: Session):
+    """Loads all objects with their orbits in one query"""
+    return (
+        session.query(ObjectDBModel)
+        .join(OrbitDBModel)
+        .options(contains_eager(ObjectDBModel.orbit_ref))
+        .all()
+    )
+
+
+def load_proximity_objects(session: Session):
+    """
+    Loads active objects with their orbits in one query (cached per catalog revision)
+    
+    The state filter runs in SQL on the (operational_state, associated_orbit_id)
+    index, so inactive objects are never loaded; orbits come with the same query.
+    """
+    return (
+        session.query(ObjectDBModel)
+        .join(OrbitDBModel)
+        .options(contains_eager(ObjectDBModel.orbit_ref))
+        .filter(ObjectDBModel.operational_state == ObjectType.ACTIVE.value)
+        .all()
+    )
+
+
+def load_active_elements(session: Session) -> OrbitalElementsBatch:
+    """Orbital elements of all active objects as arrays (cached per catalog revision)"""
+    def build(session: Session):
+        objects = services.catalog_cache.get_or_build(session, "proximity_objects", load_proximity_objects)
+        return OrbitalElementsBatch.from_models(objects)
+    
+    return services.catalog_cache.get_or_build(session, "active_elements", build)
+
+
+def load_stream_elements() -> Tuple[OrbitalElementsBatch, Dict[int, int]]:
+    """All objects as one batch plus ID -> row (cached; one revision lookup per call)"""
+    def build(session: Session):
+        objects = load_catalog_objects(session)
+        return (
+            OrbitalElementsBatch.from_models(objects),
+            {obj.record_id: row for row, obj in enumerate(objects)}
+        )
+    
+    session = SessionFactory()
+    try:
+        return services.catalog_cache.get_or_build(session, "stream_elements", build)
+    finally:
+        session.close()
+
+
+def warm_up_services():
+    """
+    Builds every service and the catalog snapshot ahead of the first request
+    
+    Optional (SATELLITE_WARM_UP=1): trades a slower start for a fast first request.
+    """
+    session = SessionFactory()
+    try:
+        elements = load_active_elements(session)
+    finally:
+        session.close()
+    
+    for name in ("events", "tle_importer", "eclipses", "passes"):
+        getattr(services, name)
+    
+    # Touch the vectorized propagation paths once
+    services.propagator.propagate_batch_cartesian(
+        elements.subset(np.arange(min(len(elements), 1))), np.array([time.time()])
+    )
+
+
+def has_unfinished_jobs() -> bool:
+    """True if the database holds queued or running proximity jobs (one indexed lookup)"""
+    session = SessionFactory()
+    try:
+        return session.query(ProximityJobDBModel.record_id).filter(
+            ProximityJobDBModel.job_status.in_(ACTIVE_JOB_STATES)
+        ).first() is not None
+    finally:
+        session.close()
+
+
+router = APIRouter()
 
 
 # ===========================================================================================
 # EXCEPTION HANDLING
 # ===========================================================================================
 
-@system_api.exception_handler(RequestValidationError)
 async def handle_validation_error(request: Request, exception: RequestValidationError):
     """Handles validation errors"""
     try:
@@ -307,11 +846,16 @@ async def handle_validation_error(request: Request, exception: RequestValidation
         return JSONResponse(status_code=400, content={"detail": "Invalid input data"})
 
 
+async def handle_concurrent_update(request: Request, exception: StaleDataError):
+    """Row revision changed between read and write (another request or worker)"""
+    return JSONResponse(status_code=409, content={"detail": "Resource was modified concurrently, retry"})
+
+
 # ===========================================================================================
 # ENDPOINTS - Main
 # ===========================================================================================
 
-@system_api.get("/")
+@router.get("/")
 async def main_endpoint():
     """Main endpoint with system information"""
     return {
@@ -321,7 +865,7 @@ async def main_endpoint():
     }
 
 
-@system_api.get("/status")
+@router.get("/status")
 async def check_status():
     """System health check"""
     return {"status": "running", "timestamp": datetime.now(timezone.utc).isoformat()}
@@ -331,7 +875,7 @@ async def check_status():
 # ENDPOINTS - Orbits (CRUD)
 # ===========================================================================================
 
-@system_api.post("/orbits/", status_code=201, response_model=OrbitOutputSchema)
+@router.post("/orbits/", status_code=201, response_model=OrbitOutputSchema)
 async def create_orbit(
     input_data: OrbitInputSchema,
     session: Session = Depends(get_db_session)
@@ -350,7 +894,9 @@ async def create_orbit(
         orbit_identifier=input_data.name,
         altitude_km=input_data.altitude,
         inclination_angle=input_data.inclination,
-        ascending_node=input_data.raan
+        ascending_node=input_data.raan,
+        eccentricity=input_data.eccentricity,
+        argument_of_perigee=input_data.arg_perigee
     )
     
     session.add(new_orbit)
@@ -362,8 +908,10 @@ async def create_orbit(
     return OrbitOutputSchema.from_model(new_orbit)
 
 
-@system_api.get("/orbits/{id}", response_model=OrbitOutputSchema)
+@router.get("/orbits/{id}", response_model=OrbitOutputSchema)
 async def get_orbit(
+    request: Request,
+    response: Response,
     resource_id: str = Path(alias="id"),
     session: Session = Depends(get_db_session)
 ):
@@ -377,10 +925,16 @@ async def get_orbit(
     if not orbit:
         raise HTTPException(status_code=404, detail="Orbit not found")
     
+    not_modified = conditional_response(
+        request, response, make_etag("orbit", id_val, orbit.row_revision), CATALOG_CACHE_CONTROL
+    )
+    if not_modified:
+        return not_modified
+    
     return OrbitOutputSchema.from_model(orbit)
 
 
-@system_api.get("/orbits/", response_model=OrbitListSchema)
+@router.get("/orbits/", response_model=OrbitListSchema)
 async def list_orbits(
     skip: int = Query(0, ge=0),
     limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_ITEMS_PER_PAGE),
@@ -408,7 +962,7 @@ async def list_orbits(
     )
 
 
-@system_api.put("/orbits/{id}", response_model=OrbitOutputSchema)
+@router.put("/orbits/{id}", response_model=OrbitOutputSchema)
 async def update_orbit(
     input_data: OrbitInputSchema,
     resource_id: str = Path(alias="id"),
@@ -438,6 +992,8 @@ async def update_orbit(
     orbit.altitude_km = input_data.altitude
     orbit.inclination_angle = input_data.inclination
     orbit.ascending_node = input_data.raan
+    orbit.eccentricity = input_data.eccentricity
+    orbit.argument_of_perigee = input_data.arg_perigee
     
     session.commit()
     session.refresh(orbit)
@@ -447,7 +1003,7 @@ async def update_orbit(
     return OrbitOutputSchema.from_model(orbit)
 
 
-@system_api.delete("/orbits/{id}", status_code=204)
+@router.delete("/orbits/{id}", status_code=204)
 async def delete_orbit(
     resource_id: str = Path(alias="id"),
     session: Session = Depends(get_db_session)
@@ -482,7 +1038,7 @@ async def delete_orbit(
 # ENDPOINTS - Satellites (CRUD)
 # ===========================================================================================
 
-@system_api.post("/satellites/", status_code=201, response_model=ObjectOutputSchema)
+@router.post("/satellites/", status_code=201, response_model=ObjectOutputSchema)
 async def create_object(
     input_data: ObjectInputSchema,
     session: Session = Depends(get_db_session)
@@ -529,8 +1085,74 @@ async def create_object(
         raise HTTPException(status_code=400, detail="Invalid identifier format or data")
 
 
-@system_api.get("/satellites/{id}", response_model=ObjectOutputSchema)
+@router.post("/satellites/tle", status_code=201, response_model=TLEImportResultSchema)
+async def import_tle_catalog(
+    request: Request,
+    operator: str = Query("UNKNOWN", min_length=1, max_length=50, description="Operator of imported objects"),
+    session: Session = Depends(get_db_session)
+):
+    """Imports a plain-text catalog of two-line element sets (2-line or 3-line format)"""
+    body = await request.body()
+    
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Catalog must be UTF-8 text")
+    
+    created, updated, errors = services.tle_importer.import_catalog(session, text, operator)
+    
+    if created == 0 and updated == 0 and errors:
+        raise HTTPException(status_code=400, detail=errors[:10])
+    
+    return TLEImportResultSchema(created=created, updated=updated, errors=errors)
+
+
+# Registered before /satellites/{id}, which would otherwise match "overhead" as an ID
+@router.get("/satellites/overhead", response_model=OverheadListSchema)
+async def find_overhead_objects(
+    lat_min: float = Query(..., ge=-90.0, le=90.0, description="Southern edge [degrees]"),
+    lat_max: float = Query(..., ge=-90.0, le=90.0, description="Northern edge [degrees]"),
+    lon_min: float = Query(..., ge=-180.0, le=180.0, description="Western edge [degrees]"),
+    lon_max: float = Query(..., ge=-180.0, le=180.0, description="Eastern edge; below lon_min crosses 180°"),
+    timestamp: Optional[str] = Query(None, description="ISO-8601 UTC datetime (default: now)"),
+    session: Session = Depends(get_db_session)
+):
+    """Lists active objects inside a latitude/longitude box at one moment"""
+    if lat_min > lat_max:
+        raise HTTPException(status_code=400, detail="lat_min must not exceed lat_max")
+    
+    if timestamp is None:
+        timestamp_dt = datetime.now(timezone.utc)
+    else:
+        try:
+            timestamp_dt = ISO8601Validator().validate_timestamp(timestamp)
+        except TimeValidationError:
+            raise HTTPException(status_code=400, detail="Invalid timestamp format")
+    
+    with timed_stage("db"):
+        elements = load_active_elements(session)
+    
+    with timed_stage("propagate"):
+        found = services.regions.find_in_region(elements, timestamp_dt, lat_min, lat_max, lon_min, lon_max)
+    
+    return OverheadListSchema(
+        timestamp=format_precise_timestamp(timestamp_dt),
+        satellites=[
+            OverheadPositionSchema(id=object_id, latitude=latitude, longitude=longitude, altitude=altitude)
+            for object_id, latitude, longitude, altitude in zip(
+                found.object_ids.tolist(), found.latitude.tolist(),
+                found.longitude.tolist(), found.altitude.tolist()
+            )
+        ],
+        candidates=found.candidates,
+        total=len(elements)
+    )
+
+
+@router.get("/satellites/{id}", response_model=ObjectOutputSchema)
 async def get_object(
+    request: Request,
+    response: Response,
     resource_id: str = Path(alias="id"),
     session: Session = Depends(get_db_session)
 ):
@@ -544,10 +1166,16 @@ async def get_object(
     if not obj:
         raise HTTPException(status_code=404, detail="Satellite not found")
     
+    not_modified = conditional_response(
+        request, response, make_etag("satellite", id_val, obj.row_revision), CATALOG_CACHE_CONTROL
+    )
+    if not_modified:
+        return not_modified
+    
     return ObjectOutputSchema.from_model(obj)
 
 
-@system_api.get("/satellites/", response_model=ObjectListSchema)
+@router.get("/satellites/", response_model=ObjectListSchema)
 async def list_objects(
     skip: int = Query(0, ge=0),
     limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_ITEMS_PER_PAGE),
@@ -575,7 +1203,7 @@ async def list_objects(
     )
 
 
-@system_api.put("/satellites/{id}", response_model=ObjectOutputSchema)
+@router.put("/satellites/{id}", response_model=ObjectOutputSchema)
 async def update_object(
     input_data: ObjectInputSchema,
     resource_id: str = Path(alias="id"),
@@ -624,7 +1252,7 @@ async def update_object(
     return ObjectOutputSchema.from_model(obj)
 
 
-@system_api.delete("/satellites/{id}", status_code=204)
+@router.delete("/satellites/{id}", status_code=204)
 async def delete_object(
     resource_id: str = Path(alias="id"),
     session: Session = Depends(get_db_session)
@@ -647,12 +1275,87 @@ async def delete_object(
     return Response(status_code=204)
 
 
+# ===========================================================================================
+# ENDPOINTS - Change feed
+# ===========================================================================================
+
+# Change feed entity name -> model and output schema of its current state
+CHANGE_FEED_SCHEMAS = {
+    "orbit": (OrbitDBModel, OrbitOutputSchema),
+    "satellite": (ObjectDBModel, ObjectOutputSchema),
+    "ground_station": (GroundStationDBModel, GroundStationOutputSchema),
+}
+
+
+def load_changed_entities(session: Session, changes: List[CatalogChangeDBModel]) -> Dict[Tuple[str, int], object]:
+    """Current state of every entity in a page of changes - one query per entity type"""
+    ids_by_type = defaultdict(set)
+    for change in changes:
+        ids_by_type[change.entity_type].add(change.entity_id)
+    
+    current = {}
+    for entity_type, entity_ids in ids_by_type.items():
+        model, schema = CHANGE_FEED_SCHEMAS[entity_type]
+        for row in session.query(model).filter(model.record_id.in_(entity_ids)):
+            current[entity_type, row.record_id] = schema.from_model(row)
+    
+    return current
+
+
+@router.get("/changes", response_model=CatalogChangeListSchema)
+async def list_catalog_changes(
+    since: int = Query(0, ge=0, description="Cursor returned by the previous call (0: from the beginning)"),
+    limit: int = Query(MAX_CHANGES_PER_PAGE, ge=1, le=MAX_CHANGES_PER_PAGE),
+    session: Session = Depends(get_db_session)
+):
+    """
+    Catalog changes after a cursor, oldest first
+    
+    Entries are written in the transaction of the change itself, so a committed
+    write is always in the feed and a rolled-back one never is. Cursors increase
+    in commit order because SQLite admits one writer at a time.
+    """
+    with timed_stage("db"):
+        changes = (
+            session.query(CatalogChangeDBModel)
+            .filter(CatalogChangeDBModel.record_id > since)
+            .order_by(CatalogChangeDBModel.record_id)
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        current = load_changed_entities(session, changes)
+    
+    with timed_stage("serialize"):
+        entries = [
+            CatalogChangeSchema(
+                cursor=change.record_id,
+                entity=change.entity_type,
+                id=change.entity_id,
+                operation=change.operation,
+                revision=change.row_revision,
+                time=format_precise_timestamp(change.change_timestamp.replace(tzinfo=timezone.utc)),
+                data=current.get((change.entity_type, change.entity_id))
+            )
+            for change in changes
+        ]
+    
+    return CatalogChangeListSchema(
+        changes=entries,
+        next_cursor=changes[-1].record_id if changes else since,
+        has_more=has_more
+    )
+
+
 # ===========================================================================================
 # ENDPOINTS - Position calculations
 # ===========================================================================================
 
-@system_api.get("/satellites/{id}/position", response_model=PositionOutputSchema)
+@router.get("/satellites/{id}/position", response_model=PositionOutputSchema)
 async def calculate_object_position(
+    request: Request,
+    response: Response,
     resource_id: str = Path(alias="id"),
     timestamp: str = Query(..., description="ISO-8601 UTC datetime"),
     session: Session = Depends(get_db_session)
@@ -662,10 +1365,13 @@ async def calculate_object_position(
         # Validate ID
         id_val = validate_positive_id(resource_id)
         
-        # Fetch object
-        obj = session.query(ObjectDBModel).filter(
-            ObjectDBModel.record_id == id_val
-        ).first()
+        # Fetch object with its orbit
+        with timed_stage("db"):
+            obj = session.query(ObjectDBModel).options(
+                joinedload(ObjectDBModel.orbit_ref)
+            ).filter(
+                ObjectDBModel.record_id == id_val
+            ).first()
         
         if not obj:
             raise HTTPException(status_code=404, detail="Satellite not found")
@@ -689,12 +1395,29 @@ async def calculate_object_position(
     if timestamp_dt < introduction_date:
         raise HTTPException(status_code=400, detail="Timestamp before introduction date")
     
-    # Calculate position
-    coordinates = global_calculation_service.calculate_position_at_time(obj, timestamp_dt)
+    # Grid moments of a precomputed range are read from the archive
+    with timed_stage("archive"):
+        coordinates = services.ephemeris.position(obj, timestamp_dt)
+    source = "archive"
+    
+    if coordinates is None:
+        with timed_stage("propagate"):
+            coordinates = services.calculation.calculate_position_at_time(obj, timestamp_dt)
+        source = "propagated"
     
     if coordinates is None:
         raise HTTPException(status_code=400, detail="Cannot calculate position")
     
+    # Determined by both rows, the moment and the model; float32 archive samples differ
+    # from float64 propagation in the low digits, so the source is part of the tag
+    etag = make_etag(
+        "position", id_val, obj.row_revision, obj.orbit_ref.row_revision,
+        timestamp_dt.isoformat(), PROPAGATOR_NAME, source
+    )
+    not_modified = conditional_response(request, response, etag, POSITION_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    
     return PositionOutputSchema(
         latitude=coordinates.latitude,
         longitude=coordinates.longitude,
@@ -702,69 +1425,345 @@ async def calculate_object_position(
     )
 
 
+@router.get("/satellites/{id}/track", response_model=TrackSchema)
+async def calculate_object_track(
+    resource_id: str = Path(alias="id"),
+    start: str = Query(..., description="First sample (ISO-8601)"),
+    end: str = Query(..., description="Last moment to cover (ISO-8601)"),
+    step: str = Query("1m", description="Sample spacing (e.g. 10s, 1m, 1h)"),
+    session: Session = Depends(get_db_session)
+):
+    """Positions of one satellite at start + k * step, from the ephemeris archive when it covers them"""
+    id_val = validate_positive_id(resource_id)
+    dt_start, dt_end = validate_analysis_range(start, end, max_days=None)
+    
+    try:
+        step_seconds = services.events.parse_precision(step).total_seconds()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    count = int((dt_end - dt_start).total_seconds() // step_seconds) + 1
+    if count > MAX_TRACK_POINTS:
+        raise HTTPException(
+            status_code=400, detail=f"Track longer than {MAX_TRACK_POINTS} points - use a coarser step"
+        )
+    
+    with timed_stage("db"):
+        obj = session.query(ObjectDBModel).options(
+            joinedload(ObjectDBModel.orbit_ref)
+        ).filter(ObjectDBModel.record_id == id_val).first()
+    
+    if not obj:
+        raise HTTPException(status_code=404, detail="Satellite not found")
+    
+    with timed_stage("archive"):
+        archived = services.ephemeris.track(obj, dt_start, step_seconds, count)
+    
+    if archived is not None:
+        source = "archive"
+        moments, samples = archived
+    else:
+        source = "propagated"
+        with timed_stage("propagate"):
+            moments = dt_start.timestamp() + np.arange(count) * step_seconds
+            samples = np.stack(
+                [values[0] for values in services.propagator.propagate_batch(
+                    OrbitalElementsBatch.from_models([obj]), moments
+                )],
+                axis=1
+            )
+    
+    with timed_stage("serialize"):
+        # Samples before the introduction date are NaN and left out
+        introduced = ~np.isnan(samples[:, 0])
+        points = [
+            TrackPointSchema(
+                time=format_precise_timestamp(datetime.fromtimestamp(moment, tz=timezone.utc)),
+                latitude=latitude,
+                longitude=longitude,
+                altitude=altitude
+            )
+            for moment, (latitude, longitude, altitude) in zip(
+                moments[introduced].tolist(), samples[introduced].tolist()
+            )
+        ]
+    
+    return TrackSchema(satellite_id=id_val, source=source, points=points)
+
+
+# ===========================================================================================
+# ENDPOINTS - Eclipses
+# ===========================================================================================
+
+@router.get("/satellites/{id}/eclipses", response_model=SatelliteEclipsesSchema)
+async def calculate_object_eclipses(
+    resource_id: str = Path(alias="id"),
+    start: str = Query(..., description="Interval start (ISO-8601)"),
+    end: str = Query(..., description="Interval end (ISO-8601)"),
+    session: Session = Depends(get_db_session)
+):
+    """Calculates Earth shadow windows of one satellite"""
+    id_val = validate_positive_id(resource_id)
+    dt_start, dt_end = validate_analysis_range(start, end)
+    
+    obj = session.query(ObjectDBModel).options(
+        joinedload(ObjectDBModel.orbit_ref)
+    ).filter(ObjectDBModel.record_id == id_val).first()
+    
+    if not obj:
+        raise HTTPException(status_code=404, detail="Satellite not found")
+    
+    windows = services.eclipses.find_eclipses(
+        OrbitalElementsBatch.from_models([obj]), dt_start, dt_end
+    )
+    
+    return SatelliteEclipsesSchema(
+        satellite_id=id_val,
+        eclipses=[EclipseWindowSchema.from_window(w) for w in windows[id_val]]
+    )
+
+
+@router.get("/eclipses", response_model=EclipseListSchema)
+async def calculate_catalog_eclipses(
+    start: str = Query(..., description="Interval start (ISO-8601)"),
+    end: str = Query(..., description="Interval end (ISO-8601)"),
+    satellite_ids: Optional[List[int]] = Query(None, description="Restrict to these satellites"),
+    session: Session = Depends(get_db_session)
+):
+    """Calculates Earth shadow windows of all active satellites in one batch"""
+    dt_start, dt_end = validate_analysis_range(start, end)
+    
+    elements = load_active_elements(session)
+    if satellite_ids:
+        elements = elements.subset(np.isin(elements.object_ids, satellite_ids))
+    
+    windows = services.eclipses.find_eclipses(elements, dt_start, dt_end)
+    
+    return EclipseListSchema(satellites=[
+        SatelliteEclipsesSchema(
+            satellite_id=object_id,
+            eclipses=[EclipseWindowSchema.from_window(w) for w in object_windows]
+        )
+        for object_id, object_windows in sorted(windows.items())
+    ])
+
+
+# ===========================================================================================
+# ENDPOINTS - Ground stations and passes
+# ===========================================================================================
+
+def load_ground_station(session: Session, id_val: int) -> GroundStationDBModel:
+    """Gets ground station or raises 404"""
+    station = session.query(GroundStationDBModel).filter(
+        GroundStationDBModel.record_id == id_val
+    ).first()
+    
+    if not station:
+        raise HTTPException(status_code=404, detail="Ground station not found")
+    
+    return station
+
+
+@router.post("/ground-stations/", status_code=201, response_model=GroundStationOutputSchema)
+async def create_ground_station(
+    input_data: GroundStationInputSchema,
+    session: Session = Depends(get_db_session)
+):
+    """Registers new ground station"""
+    existing = session.query(GroundStationDBModel).filter(
+        GroundStationDBModel.station_name == input_data.name
+    ).first()
+    
+    if existing:
+        raise HTTPException(status_code=409, detail="Ground station name already exists")
+    
+    station = GroundStationDBModel(
+        station_name=input_data.name,
+        latitude=input_data.latitude,
+        longitude=input_data.longitude,
+        altitude_km=input_data.altitude,
+        min_elevation=input_data.min_elevation
+    )
+    
+    session.add(station)
+    session.commit()
+    session.refresh(station)
+    
+    log.info(f"Created ground station: {input_data.name}")
+    
+    return GroundStationOutputSchema.from_model(station)
+
+
+@router.get("/ground-stations/", response_model=GroundStationListSchema)
+async def list_ground_stations(session: Session = Depends(get_db_session)):
+    """Lists ground stations"""
+    stations = session.query(GroundStationDBModel).order_by(GroundStationDBModel.record_id).all()
+    return GroundStationListSchema(stations=[GroundStationOutputSchema.from_model(s) for s in stations])
+
+
+@router.get("/ground-stations/{id}", response_model=GroundStationOutputSchema)
+async def get_ground_station(
+    resource_id: str = Path(alias="id"),
+    session: Session = Depends(get_db_session)
+):
+    """Gets ground station by ID"""
+    return GroundStationOutputSchema.from_model(
+        load_ground_station(session, validate_positive_id(resource_id))
+    )
+
+
+@router.delete("/ground-stations/{id}", status_code=204)
+async def delete_ground_station(
+    resource_id: str = Path(alias="id"),
+    session: Session = Depends(get_db_session)
+):
+    """Removes ground station"""
+    id_val = validate_positive_id(resource_id)
+    
+    session.delete(load_ground_station(session, id_val))
+    session.commit()
+    
+    log.info(f"Deleted ground station ID={id_val}")
+    
+    return Response(status_code=204)
+
+
+@router.get("/satellites/{id}/passes", response_model=SatellitePassesSchema)
+async def predict_object_passes(
+    resource_id: str = Path(alias="id"),
+    station_id: int = Query(..., ge=1, description="Ground station ID"),
+    start: str = Query(..., description="Interval start (ISO-8601)"),
+    end: str = Query(..., description="Interval end (ISO-8601)"),
+    session: Session = Depends(get_db_session)
+):
+    """Predicts passes of one satellite over a ground station"""
+    id_val = validate_positive_id(resource_id)
+    dt_start, dt_end = validate_analysis_range(start, end)
+    station = load_ground_station(session, station_id)
+    
+    obj = session.query(ObjectDBModel).options(
+        joinedload(ObjectDBModel.orbit_ref)
+    ).filter(ObjectDBModel.record_id == id_val).first()
+    
+    if not obj:
+        raise HTTPException(status_code=404, detail="Satellite not found")
+    
+    passes = services.passes.find_passes(
+        OrbitalElementsBatch.from_models([obj]), station, dt_start, dt_end
+    )
+    
+    return SatellitePassesSchema(
+        satellite_id=id_val,
+        station_id=station.record_id,
+        passes=[PassWindowSchema.from_window(p) for p in passes[id_val]]
+    )
+
+
+@router.get("/ground-stations/{id}/passes", response_model=PassListSchema)
+async def predict_station_passes(
+    resource_id: str = Path(alias="id"),
+    start: str = Query(..., description="Interval start (ISO-8601)"),
+    end: str = Query(..., description="Interval end (ISO-8601)"),
+    satellite_ids: Optional[List[int]] = Query(None, description="Restrict to these satellites"),
+    session: Session = Depends(get_db_session)
+):
+    """Predicts passes of all active satellites over a ground station in one batch"""
+    station = load_ground_station(session, validate_positive_id(resource_id))
+    dt_start, dt_end = validate_analysis_range(start, end)
+    
+    elements = load_active_elements(session)
+    if satellite_ids:
+        elements = elements.subset(np.isin(elements.object_ids, satellite_ids))
+    
+    passes = services.passes.find_passes(elements, station, dt_start, dt_end)
+    
+    # Objects that never rise above the mask are left out
+    return PassListSchema(
+        station_id=station.record_id,
+        satellites=[
+            SatellitePassesSchema(
+                satellite_id=object_id,
+                station_id=station.record_id,
+                passes=[PassWindowSchema.from_window(p) for p in object_passes]
+            )
+            for object_id, object_passes in sorted(passes.items())
+            if object_passes
+        ]
+    )
+
+
 # ===========================================================================================
 # ENDPOINTS - Event analysis
 # ===========================================================================================
 
-@system_api.get("/proximities", response_model=CollisionListSchema)
+@router.get("/proximities", response_model=CollisionListSchema)
 async def detect_proximities(
     start_date: str = Query(..., description="Analysis start date (ISO-8601)"),
     end_date: str = Query(..., description="Analysis end date (ISO-8601)"),
     precision: str = Query("1m", description="Time precision (e.g. 1m, 5s, 1h)"),
+    downgrade: bool = Query(False, description="Coarsen precision instead of rejecting scans over budget"),
+    debug: bool = Query(False, description="Include per-stage timings in the response"),
     session: Session = Depends(get_db_session)
 ):
     """Detects satellite proximity locations (encounters) in time interval"""
     try:
-        validator = ISO8601Validator()
-        
-        # Parse dates
-        try:
-            dt_start = validator.validate_timestamp(start_date)
-            dt_end = validator.validate_timestamp(end_date)
-        except TimeValidationError:
-            raise HTTPException(status_code=400, detail="Invalid timestamp format")
+        dt_start, dt_end, time_delta = validate_scan_request(start_date, end_date, precision)
         
-        # Validate range
-        if dt_start >= dt_end:
-            raise HTTPException(status_code=400, detail="Invalid timestamp format")
+        # Get all objects (reused until another request or worker changes the catalog)
+        with timed_stage("db"):
+            objects = services.catalog_cache.get_or_build(session, "proximity_objects", load_proximity_objects)
         
-        # Parse precision
-        try:
-            time_delta = serwis_zdarzen_globalny.parse_precision(precision)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid timestamp format")
+        # Admission control - cost is known before stepping starts
+        estimate, plan = services.events.estimate_scan_cost(objects, dt_start, dt_end, time_delta)
         
-        # Get all objects
-        objects = session.query(ObjectDBModel).join(OrbitDBModel).all()
+        if estimate.cost > SCAN_COST_BUDGET:
+            if not downgrade:
+                raise HTTPException(
+                    status_code=400,
+                    detail=(
+                        f"Scan too expensive: {estimate.steps} steps x {estimate.pairs} pairs = "
+                        f"{estimate.cost} pair-steps exceeds budget of {SCAN_COST_BUDGET}; "
+                        f"use a coarser precision, a shorter range or downgrade=true"
+                    )
+                )
+            
+            try:
+                time_delta = services.events.downgrade_precision(estimate, SCAN_COST_BUDGET)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Scan too expensive: {e}")
+            
+            precision = f"{int(time_delta.total_seconds())}s"
+            log.info(f"Proximity scan of {estimate.cost} pair-steps downgraded to precision {precision}")
         
         # Detect events
-        events = serwis_zdarzen_globalny.detect_events_in_interval(
+        scan = services.events.detect_events_in_interval(
             objects,
             dt_start,
             dt_end,
-            time_delta
+            time_delta,
+            deadline=time.monotonic() + SCAN_DEADLINE_SECONDS,
+            plan=plan
         )
+        events = scan.events
         
-        # Sort
-        events.sort(key=lambda evt: (evt.time_moment, evt.object_id_a, evt.object_id_b))
-        
-        # Convert to schemas
-        collisions_out = [
-            CollisionEventSchema(
-                satellite1=evt.object_id_a,
-                satellite2=evt.object_id_b,
-                time=evt.time_moment.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                position=PositionOutputSchema(
-                    latitude=evt.location.latitude,
-                    longitude=evt.location.longitude,
-                    altitude=evt.location.altitude_asl
-                ),
-                distance=evt.distance_km
-            )
-            for evt in events
-        ]
+        with timed_stage("serialize"):
+            # Sort
+            events.sort(key=lambda evt: (evt.time_moment, evt.object_id_a, evt.object_id_b))
+            
+            # Convert to schemas
+            collisions_out = [CollisionEventSchema.from_event(evt) for evt in events]
         
-        return CollisionListSchema(proximities=collisions_out)
+        timer = current_stage_timer()
+        
+        return CollisionListSchema(
+            proximities=collisions_out,
+            precision=precision,
+            complete=scan.complete,
+            analyzed_until=(
+                scan.analyzed_until.strftime("%Y-%m-%dT%H:%M:%SZ") if scan.analyzed_until else None
+            ),
+            timings=timer.as_milliseconds() if debug and timer is not None else None
+        )
     
     except HTTPException:
         raise
@@ -772,6 +1771,288 @@ async def detect_proximities(
         raise HTTPException(status_code=400, detail="Invalid timestamp format")
 
 
+# ===========================================================================================
+# ENDPOINTS - Live position streaming
+# ===========================================================================================
+
+async def forward_position_frames(websocket: WebSocket, subscriber):
+    """Sends the newest frame of a subscriber whenever one is ready"""
+    while True:
+        await websocket.send_text(await subscriber.frames.get())
+
+
+@router.websocket("/ws/positions")
+async def stream_positions(websocket: WebSocket):
+    """
+    Streams positions of subscribed satellites
+    
+    Client messages: {"action": "subscribe" | "unsubscribe" | "replace", "ids": [...],
+    "interval": seconds}. Server frames: {"timestamp", "positions": [{"id", "latitude",
+    "longitude", "altitude"}], "unavailable": [ids unknown or not yet introduced]}.
+    """
+    await websocket.accept()
+    hub = services.position_stream
+    subscriber = hub.connect()
+    sender = asyncio.create_task(forward_position_frames(websocket, subscriber))
+    
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                request = PositionSubscriptionSchema(**json.loads(message))
+                hub.update(subscriber, request.action, request.ids, request.interval)
+            except (json.JSONDecodeError, TypeError, ValidationError, ValueError) as e:
+                error = e.errors()[0]["msg"] if isinstance(e, ValidationError) else str(e)
+                await websocket.send_json({"error": f"Invalid subscription: {error}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        hub.disconnect(subscriber)
+        log.debug("Position stream closed (%d frames dropped)", subscriber.dropped_frames)
+
+
+# ===========================================================================================
+# ENDPOINTS - Proximity jobs
+# ===========================================================================================
+
+def load_proximity_job(session: Session, resource_id: str) -> ProximityJobDBModel:
+    """Gets job by ID or raises 404"""
+    job = session.query(ProximityJobDBModel).filter(
+        ProximityJobDBModel.record_id == validate_positive_id(resource_id)
+    ).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Proximity job not found")
+    
+    return job
+
+
+@router.post("/proximities/jobs", status_code=202, response_model=ProximityJobOutputSchema)
+async def submit_proximity_job(
+    input_data: ProximityJobInputSchema,
+    session: Session = Depends(get_db_session)
+):
+    """Queues a proximity scan in the background (no cost budget or deadline)"""
+    if uses_memory_database():
+        raise HTTPException(
+            status_code=503,
+            detail="Proximity jobs need a file database: set SATELLITE_DATABASE_URL "
+                   "(the in-memory catalog shares one connection with request handlers)"
+        )
+    
+    dt_start, dt_end, _time_delta = validate_scan_request(
+        input_data.start_date, input_data.end_date, input_data.precision
+    )
+    
+    job = services.proximity_jobs.submit(session, dt_start, dt_end, input_data.precision)
+    return ProximityJobOutputSchema.from_model(job)
+
+
+@router.get("/proximities/jobs/{id}", response_model=ProximityJobOutputSchema)
+async def get_proximity_job(
+    resource_id: str = Path(alias="id"),
+    session: Session = Depends(get_db_session)
+):
+    """Gets job status and progress (steps done / total)"""
+    job = load_proximity_job(session, resource_id)
+    services.proximity_jobs.requeue_if_stale(session, job)
+    return ProximityJobOutputSchema.from_model(job)
+
+
+@router.get("/proximities/jobs/{id}/results", response_model=ProximityJobResultsSchema)
+async def get_proximity_job_results(
+    resource_id: str = Path(alias="id"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_ITEMS_PER_PAGE),
+    session: Session = Depends(get_db_session)
+):
+    """Pages through encounters found by a job, ordered by closest approach"""
+    validate_pagination_parameters(skip, limit)
+    job = load_proximity_job(session, resource_id)
+    
+    query = session.query(ProximityJobEventDBModel).filter(
+        ProximityJobEventDBModel.job_id == job.record_id
+    )
+    total = query.count()
+    rows = query.order_by(
+        ProximityJobEventDBModel.closest_approach,
+        ProximityJobEventDBModel.object_id_a,
+        ProximityJobEventDBModel.object_id_b
+    ).offset(skip).limit(limit).all()
+    
+    return ProximityJobResultsSchema(
+        job_id=job.record_id,
+        status=job.job_status,
+        proximities=[CollisionEventSchema.from_event(row.to_event()) for row in rows],
+        total=total,
+        skip=skip,
+        limit=limit
+    )
+
+
+@router.delete("/proximities/jobs/{id}", status_code=204)
+async def cancel_proximity_job(
+    resource_id: str = Path(alias="id"),
+    session: Session = Depends(get_db_session)
+):
+    """Cancels an active job (keeping partial results) or deletes a finished one"""
+    services.proximity_jobs.cancel(session, load_proximity_job(session, resource_id))
+    return Response(status_code=204)
+
+
+# ===========================================================================================
+# ENDPOINTS - Docking pose
+# ===========================================================================================
+
+@router.post("/pose", response_model=PoseOutputSchema)
+async def predict_pose(input_data: PoseInputSchema):
+    """
+    Predicts target and chaser orientation from docking camera features
+    
+    Concurrent requests are answered by shared forward passes (micro-batches);
+    batch_size and batch_ms tell which pass served the request. Server-Timing
+    splits the time into batch_wait and inference.
+    """
+    from satellite_pose import PoseModelUnavailableError
+    
+    try:
+        batcher = services.pose
+    except PoseModelUnavailableError as error:
+        raise HTTPException(status_code=503, detail=str(error))
+    
+    if len(input_data.features) != batcher.input_dim:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Expected {batcher.input_dim} features, got {len(input_data.features)}"
+        )
+    
+    try:
+        outputs, batch = await batcher.predict(np.asarray(input_data.features, dtype=np.float32))
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=f"Pose inference failed: {error}")
+    
+    record_stage("batch_wait", batch.waited)
+    record_stage("inference", batch.duration)
+    
+    target_x, target_y, target_z, target_w, chaser_x, chaser_y, chaser_z, chaser_w = (float(value) for value in outputs)
+    return PoseOutputSchema(
+        target=QuaternionSchema(x=target_x, y=target_y, z=target_z, w=target_w),
+        chaser=QuaternionSchema(x=chaser_x, y=chaser_y, z=chaser_z, w=chaser_w),
+        batch_size=batch.size,
+        batch_ms=round(batch.duration * 1000.0, 3)
+    )
+
+
+# ===========================================================================================
+# FASTAPI APPLICATION - Presentation layer
+# ===========================================================================================
+
+class ServerTimingMiddleware:
+    """
+    Times every HTTP request and reports its stages in a Server-Timing header
+    
+    Plain ASGI (no BaseHTTPMiddleware task hop): the header is added when the
+    response starts, after the endpoint and response serialization have run.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timer = StageTimer()
+        token = timer.activate()
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timer.header_value().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            StageTimer.deactivate(token)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initializes storage at startup (not import) and stops background work at shutdown"""
+    started = time.perf_counter()
+    configure_logging()
+    
+    init_database()
+    storage_done = time.perf_counter()
+    
+    # The job manager (and its compute backend) is built only if there is work to resume;
+    # the in-memory catalog refuses jobs and starts empty
+    if not uses_memory_database() and has_unfinished_jobs():
+        services.proximity_jobs.resume_interrupted()
+    
+    if app.state.warm_up:
+        warm_up_services()
+    
+    log.info(
+        f"Startup completed in {(time.perf_counter() - started) * 1000:.0f} ms "
+        f"(storage {(storage_done - started) * 1000:.0f} ms, warm-up {'on' if app.state.warm_up else 'off'})"
+    )
+    
+    yield
+    
+    if services.is_built("position_stream"):
+        await services.position_stream.close()
+    if services.is_built("proximity_jobs"):
+        services.proximity_jobs.shutdown()
+    if services.is_built("pose"):
+        services.pose.close()
+
+
+def create_app(warm_up: Optional[bool] = None) -> FastAPI:
+    """
+    Application factory
+    
+    Args:
+        warm_up: Build services and catalog snapshot at startup
+            (default: SATELLITE_WARM_UP environment variable)
+    """
+    app = FastAPI(
+        title="Satellite Orbit Tracking System",
+        version="2.0.0",
+        description="Orbital object management and tracking system",
+        lifespan=lifespan
+    )
+    app.state.warm_up = WARM_UP_ON_STARTUP if warm_up is None else warm_up
+    
+    # Middleware CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Server-Timing"],
+    )
+    
+    # Added last, so it is outermost and its total covers the CORS middleware too
+    if SERVER_TIMING_ENABLED:
+        app.add_middleware(ServerTimingMiddleware)
+    
+    app.add_exception_handler(RequestValidationError, handle_validation_error)
+    app.add_exception_handler(StaleDataError, handle_concurrent_update)
+    app.include_router(router)
+    
+    return app
+
+
+# Module-level application for `uvicorn satellite_api:system_api`
+system_api = create_app()
+
+
 # ===========================================================================================
 # ENTRY POINT
 # ===========================================================================================
@@ -0,0 +1,507 @@
+"""
+Backends - Interchangeable compute kernels for propagation and pair screening
+
+Satellite Orbit Tracking System - Services Layer
+Author: Aleks Czarnecki
+
+Contains:
+- Pure-Python reference backend (scalar propagation, GeodeticCoordinates distances)
+- NumPy backend (batch propagation, vectorized pair distances)
+- Optional Numba backend fusing circular propagation and distance checks in one kernel
+- Runtime selection with fallback (SATELLITE_COMPUTE_BACKEND) and an equivalence check
+
+Usage:
+    python satellite_backends.py --verify     # compare every available backend to the reference
+"""
+
+import argparse
+import logging
+import math
+import sys
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional dependency - only needed by NumbaBackend
+    numba = None
+
+from satellite_models import (
+    GeodeticCoordinates,
+    OrbitalParameters,
+    OrbitalElementsBatch,
+    ScreeningHits,
+    configure_logging,
+    EARTH_BASE_RADIUS,
+    EARTH_GRAV_PARAMETER,
+    COMPUTE_BACKEND_NAME,
+)
+from satellite_services import (
+    OrbitPropagator,
+    KeplerianPropagator,
+    OrbitalCalculationError,
+    create_propagator,
+    record_stage,
+)
+
+log = logging.getLogger(__name__)
+
+Cartesian = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+# ===========================================================================================
+# ABSTRACT BACKEND - Strategy Pattern
+# ===========================================================================================
+
+class ComputeBackend(ABC):
+    """
+    Numerical kernels of the proximity engine
+    
+    Every backend returns the same results as PythonBackend (up to rounding):
+    positions in the GeodeticCoordinates.to_cartesian frame and hits sorted by
+    (step, pair). Objects are not screened before their introduction date.
+    """
+    
+    name = ""
+    
+    @abstractmethod
+    def propagate_cartesian(
+        self,
+        propagator: OrbitPropagator,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Cartesian:
+        """(N, T) arrays of x, y, z [km], NaN before each object's epoch"""
+    
+    @abstractmethod
+    def screen_pairs(
+        self,
+        propagator: OrbitPropagator,
+        elements: OrbitalElementsBatch,
+        pairs: np.ndarray,
+        moments: np.ndarray,
+        threshold: float
+    ) -> ScreeningHits:
+        """
+        Finds pair-steps closer than threshold
+        
+        Args:
+            elements: Objects taking part in the pairs
+            pairs: (P, 2) row indices into elements
+            moments: T time moments [POSIX seconds]
+            threshold: Detection distance [km]
+        """
+
+
+def _hits_from_arrays(steps, pairs, distances, x, y, z) -> ScreeningHits:
+    """Sorts hits by (step, pair) and converts positions back to latitude/longitude/altitude"""
+    order = np.lexsort((pairs, steps))
+    x, y, z = x[order], y[order], z[order]
+    radius = np.sqrt(x**2 + y**2 + z**2)
+    
+    return ScreeningHits(
+        steps=steps[order],
+        pairs=pairs[order],
+        distances=distances[order],
+        latitude=np.degrees(np.arcsin(np.clip(z / radius, -1.0, 1.0))),
+        longitude=np.degrees(np.arctan2(y, x)),
+        altitude=radius - EARTH_BASE_RADIUS
+    )
+
+
+# ===========================================================================================
+# BACKEND IMPLEMENTATIONS
+# ===========================================================================================
+
+class PythonBackend(ComputeBackend):
+    """
+    Reference implementation - one calculate_position call per object and step
+    
+    Slow, but it is the scalar code path of the position endpoint, so the
+    other backends are verified against it.
+    """
+    
+    name = "python"
+    
+    def _positions(self, propagator, elements, moments) -> List[List[GeodeticCoordinates]]:
+        """Geodetic position per (object, step); None before the object's epoch"""
+        moment_times = [datetime.fromtimestamp(float(moment), tz=timezone.utc) for moment in moments]
+        positions = []
+        
+        for row in range(len(elements)):
+            parameters = OrbitalParameters(
+                semi_major_axis=float(elements.semi_major_axis[row]),
+                inclination_deg=float(elements.inclination_deg[row]),
+                ascending_node=float(elements.ascending_node[row]),
+                eccentricity=float(elements.eccentricity[row]),
+                argument_of_perigee=float(elements.argument_of_perigee[row]),
+                drag_term=float(elements.drag_term[row])
+            )
+            epoch = float(elements.epoch[row])
+            start_date = datetime.fromtimestamp(epoch, tz=timezone.utc)
+            
+            positions.append([
+                propagator.calculate_position(
+                    parameters, moment_time, float(elements.initial_longitude[row]), start_date
+                ) if moment >= epoch else None
+                for moment, moment_time in zip(moments, moment_times)
+            ])
+        
+        return positions
+    
+    def propagate_cartesian(self, propagator, elements, moments) -> Cartesian:
+        shape = (len(elements), len(moments))
+        x, y, z = (np.full(shape, np.nan) for _ in range(3))
+        
+        for row, row_positions in enumerate(self._positions(propagator, elements, moments)):
+            for column, position in enumerate(row_positions):
+                if position is not None:
+                    x[row, column], y[row, column], z[row, column] = position.to_cartesian()
+        
+        return x, y, z
+    
+    def screen_pairs(self, propagator, elements, pairs, moments, threshold) -> ScreeningHits:
+        positions = self._positions(propagator, elements, moments)
+        
+        hits = []
+        for step in range(len(moments)):
+            for pair_index, (row_a, row_b) in enumerate(pairs):
+                position_a = positions[row_a][step]
+                position_b = positions[row_b][step]
+                if position_a is None or position_b is None:
+                    continue
+                
+                distance = position_a.distance_to(position_b)
+                if distance < threshold:
+                    hits.append((step, pair_index, distance, position_a))
+        
+        return ScreeningHits(
+            steps=np.array([hit[0] for hit in hits], dtype=np.int64),
+            pairs=np.array([hit[1] for hit in hits], dtype=np.int64),
+            distances=np.array([hit[2] for hit in hits], dtype=np.float64),
+            latitude=np.array([hit[3].latitude for hit in hits], dtype=np.float64),
+            longitude=np.array([hit[3].longitude for hit in hits], dtype=np.float64),
+            altitude=np.array([hit[3].altitude_asl for hit in hits], dtype=np.float64)
+        )
+
+
+class NumpyBackend(ComputeBackend):
+    """Batch propagation of all objects, then all pair distances as array operations"""
+    
+    name = "numpy"
+    
+    def propagate_cartesian(self, propagator, elements, moments) -> Cartesian:
+        return propagator.propagate_batch_cartesian(elements, moments)
+    
+    def screen_pairs(self, propagator, elements, pairs, moments, threshold) -> ScreeningHits:
+        started = time.perf_counter()
+        x, y, z = self.propagate_cartesian(propagator, elements, moments)
+        propagated = time.perf_counter()
+        
+        rows_a, rows_b = pairs[:, 0], pairs[:, 1]
+        distances = np.sqrt(
+            (x[rows_a] - x[rows_b])**2 + (y[rows_a] - y[rows_b])**2 + (z[rows_a] - z[rows_b])**2
+        )
+        # NaN (object not yet introduced) compares False
+        hit_pairs, hit_steps = np.nonzero(distances < threshold)
+        hit_rows = rows_a[hit_pairs]
+        
+        hits = _hits_from_arrays(
+            hit_steps, hit_pairs, distances[hit_pairs, hit_steps],
+            x[hit_rows, hit_steps], y[hit_rows, hit_steps], z[hit_rows, hit_steps]
+        )
+        
+        record_stage("propagate", propagated - started)
+        record_stage("pairs", time.perf_counter() - propagated)
+        return hits
+
+
+def _screen_circular_kernel(
+    semi_major_axis, inclination_rad, raan_rad, initial_longitude_rad, epoch, angular_velocity,
+    moments, rows_a, rows_b, threshold,
+    hit_steps, hit_pairs, hit_distances, hit_x, hit_y, hit_z
+):
+    """
+    Fused circular propagation and pair screening (compiled by NumbaBackend)
+    
+    Same formulas as KeplerianPropagator.propagate_batch_cartesian. Writes at most
+    len(hit_steps) hits and returns the total count, so the caller can retry with
+    larger buffers. Plain Python as written - Numba compiles it unchanged.
+    """
+    object_count = semi_major_axis.shape[0]
+    x = np.empty(object_count)
+    y = np.empty(object_count)
+    z = np.empty(object_count)
+    two_pi = 2.0 * math.pi
+    threshold_squared = threshold * threshold
+    capacity = hit_steps.shape[0]
+    count = 0
+    
+    for step in range(moments.shape[0]):
+        for row in range(object_count):
+            elapsed = moments[step] - epoch[row]
+            if elapsed < 0.0:
+                x[row] = np.nan
+                y[row] = np.nan
+                z[row] = np.nan
+                continue
+            
+            argument_of_latitude = (angular_velocity[row] * elapsed + initial_longitude_rad[row]) % two_pi
+            cos_u = math.cos(argument_of_latitude)
+            sin_u = math.sin(argument_of_latitude)
+            cos_raan = math.cos(raan_rad[row])
+            sin_raan = math.sin(raan_rad[row])
+            cos_incl = math.cos(inclination_rad[row])
+            radius = semi_major_axis[row]
+            
+            x[row] = radius * (cos_u * cos_raan - sin_u * cos_incl * sin_raan)
+            y[row] = radius * (cos_u * sin_raan + sin_u * cos_incl * cos_raan)
+            z[row] = radius * sin_u * math.sin(inclination_rad[row])
+        
+        for pair in range(rows_a.shape[0]):
+            row_a = rows_a[pair]
+            row_b = rows_b[pair]
+            dx = x[row_a] - x[row_b]
+            dy = y[row_a] - y[row_b]
+            dz = z[row_a] - z[row_b]
+            distance_squared = dx * dx + dy * dy + dz * dz
+            
+            if distance_squared < threshold_squared:
+                if count < capacity:
+                    hit_steps[count] = step
+                    hit_pairs[count] = pair
+                    hit_distances[count] = math.sqrt(distance_squared)
+                    hit_x[count] = x[row_a]
+                    hit_y[count] = y[row_a]
+                    hit_z[count] = z[row_a]
+                count += 1
+    
+    return count
+
+
+class NumbaBackend(NumpyBackend):
+    """
+    JIT-compiled screening for the circular Keplerian propagator
+    
+    Propagation and distance checks run in one compiled loop without (P, T)
+    temporaries. Other propagators, and propagation alone, use the NumPy path.
+    """
+    
+    name = "numba"
+    INITIAL_HIT_CAPACITY = 4096
+    
+    def __init__(self, jit: bool = True):
+        """
+        Args:
+            jit: Compile the kernel; False runs it as plain Python (verification only)
+        """
+        if not jit:
+            self._kernel = _screen_circular_kernel
+        elif numba is None:
+            raise ImportError("Numba backend requires the numba package (pip install numba)")
+        else:
+            # Compiled on first use; cache=True keeps the machine code between processes
+            self._kernel = numba.njit(cache=True)(_screen_circular_kernel)
+    
+    @staticmethod
+    def supports(propagator: OrbitPropagator) -> bool:
+        """The kernel implements circular Keplerian motion only"""
+        return type(propagator) is KeplerianPropagator
+    
+    def screen_pairs(self, propagator, elements, pairs, moments, threshold) -> ScreeningHits:
+        if not self.supports(propagator):
+            return super().screen_pairs(propagator, elements, pairs, moments, threshold)
+        
+        started = time.perf_counter()
+        arguments = (
+            np.ascontiguousarray(elements.semi_major_axis, dtype=np.float64),
+            np.radians(elements.inclination_deg),
+            np.radians(elements.ascending_node),
+            np.radians(elements.initial_longitude),
+            np.ascontiguousarray(elements.epoch, dtype=np.float64),
+            np.sqrt(EARTH_GRAV_PARAMETER / elements.semi_major_axis**3),
+            np.ascontiguousarray(moments, dtype=np.float64),
+            np.ascontiguousarray(pairs[:, 0], dtype=np.int64),
+            np.ascontiguousarray(pairs[:, 1], dtype=np.int64),
+            float(threshold),
+        )
+        
+        capacity = self.INITIAL_HIT_CAPACITY
+        while True:
+            buffers = _hit_buffers(capacity)
+            count = self._kernel(*arguments, *buffers)
+            if count <= capacity:
+                break
+            capacity = count
+        
+        hit_steps, hit_pairs, hit_distances, hit_x, hit_y, hit_z = (buffer[:count] for buffer in buffers)
+        hits = _hits_from_arrays(hit_steps, hit_pairs, hit_distances, hit_x, hit_y, hit_z)
+        
+        # Propagation and pair loop are one kernel - reported as a single stage
+        record_stage("screen", time.perf_counter() - started)
+        return hits
+
+
+def _hit_buffers(capacity: int):
+    """Output arrays of the screening kernel: steps, pairs, distances, x, y, z"""
+    return (
+        np.empty(capacity, dtype=np.int64),
+        np.empty(capacity, dtype=np.int64),
+        *(np.empty(capacity, dtype=np.float64) for _ in range(4))
+    )
+
+
+# ===========================================================================================
+# BACKEND SELECTION
+# ===========================================================================================
+
+# Backends selectable by name (SATELLITE_COMPUTE_BACKEND)
+BACKENDS = {
+    "python": PythonBackend,
+    "numpy": NumpyBackend,
+    "numba": NumbaBackend,
+}
+
+
+def create_backend(name: str = COMPUTE_BACKEND_NAME) -> ComputeBackend:
+    """
+    Creates compute backend by its registered name
+    
+    "auto" picks Numba when installed, NumPy otherwise. A backend that cannot be
+    created (missing optional package) falls back to NumPy with a warning.
+    """
+    if name == "auto":
+        name = "numba" if numba is not None else "numpy"
+    
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise OrbitalCalculationError(
+            f"Unknown compute backend: {name}. Available: auto, {', '.join(sorted(BACKENDS))}"
+        ) from None
+    
+    try:
+        return backend_class()
+    except ImportError as e:
+        log.warning("Compute backend '%s' unavailable (%s), falling back to numpy", name, e)
+        return NumpyBackend()
+
+
+def available_backends() -> List[str]:
+    """Names of backends that can be created in this environment"""
+    return [name for name in BACKENDS if name != "numba" or numba is not None]
+
+
+# ===========================================================================================
+# EQUIVALENCE CHECK
+# ===========================================================================================
+
+VERIFY_DISTANCE_TOLERANCE = 1e-6  # km
+VERIFY_ANGLE_TOLERANCE = 1e-6  # degrees
+
+
+def random_scenario(rng: np.random.Generator, object_count: int, eccentric: bool) -> OrbitalElementsBatch:
+    """Random LEO catalog; a few objects are introduced in the middle of the scan"""
+    epoch = np.full(object_count, 1_700_000_000.0)
+    epoch[::7] += 1800.0
+    
+    return OrbitalElementsBatch(
+        object_ids=np.arange(1, object_count + 1, dtype=np.int64),
+        semi_major_axis=EARTH_BASE_RADIUS + rng.uniform(500.0, 560.0, object_count),
+        inclination_deg=rng.uniform(0.0, 100.0, object_count),
+        ascending_node=rng.uniform(0.0, 360.0, object_count),
+        eccentricity=rng.uniform(0.0, 0.01, object_count) if eccentric else np.zeros(object_count),
+        argument_of_perigee=rng.uniform(0.0, 360.0, object_count) if eccentric else np.zeros(object_count),
+        initial_longitude=rng.uniform(-180.0, 180.0, object_count),
+        epoch=epoch,
+        drag_term=np.zeros(object_count)
+    )
+
+
+def compare_hits(reference: ScreeningHits, candidate: ScreeningHits, threshold: float) -> List[str]:
+    """Differences beyond rounding; a hit may only be missing if it lies at the threshold"""
+    problems = []
+    reference_hits = {(int(s), int(p)): i for i, (s, p) in enumerate(zip(reference.steps, reference.pairs))}
+    candidate_hits = {(int(s), int(p)): i for i, (s, p) in enumerate(zip(candidate.steps, candidate.pairs))}
+    
+    for key in reference_hits.keys() ^ candidate_hits.keys():
+        hits, index = (reference, reference_hits[key]) if key in reference_hits else (candidate, candidate_hits[key])
+        if abs(hits.distances[index] - threshold) > VERIFY_DISTANCE_TOLERANCE:
+            problems.append(f"hit {key} found by only one backend at {hits.distances[index]:.6f} km")
+    
+    for key in reference_hits.keys() & candidate_hits.keys():
+        i, j = reference_hits[key], candidate_hits[key]
+        longitude_error = abs((reference.longitude[i] - candidate.longitude[j] + 180.0) % 360.0 - 180.0)
+        if abs(reference.distances[i] - candidate.distances[j]) > VERIFY_DISTANCE_TOLERANCE:
+            problems.append(f"hit {key} distance {reference.distances[i]} != {candidate.distances[j]}")
+        elif max(abs(reference.latitude[i] - candidate.latitude[j]), longitude_error) > VERIFY_ANGLE_TOLERANCE:
+            problems.append(f"hit {key} position differs")
+        elif abs(reference.altitude[i] - candidate.altitude[j]) > VERIFY_DISTANCE_TOLERANCE:
+            problems.append(f"hit {key} altitude differs")
+    
+    return problems
+
+
+def verify_backends(object_count: int = 40, step_count: int = 120, seed: int = 7) -> bool:
+    """Runs every available backend on random scenarios and compares it with PythonBackend"""
+    rng = np.random.default_rng(seed)
+    reference = PythonBackend()
+    all_match = True
+    
+    for propagator_name, eccentric in (("keplerian", False), ("eccentric-j2", True)):
+        propagator = create_propagator(propagator_name)
+        elements = random_scenario(rng, object_count, eccentric)
+        moments = elements.epoch.min() + np.arange(step_count) * 30.0
+        pairs = np.array(
+            [(a, b) for a in range(object_count) for b in range(a + 1, object_count)], dtype=np.int64
+        )
+        # Wide threshold so that every scenario produces many hits
+        threshold = 1500.0
+        
+        expected = reference.screen_pairs(propagator, elements, pairs, moments, threshold)
+        expected_positions = reference.propagate_cartesian(propagator, elements, moments)
+        
+        candidates = [(name, create_backend(name)) for name in available_backends()]
+        if numba is None:
+            # Kernel logic is still checked without the compiler, interpreted
+            candidates.append(("kernel", NumbaBackend(jit=False)))
+        
+        for name, backend in candidates:
+            problems = compare_hits(expected, backend.screen_pairs(propagator, elements, pairs, moments, threshold), threshold)
+            
+            position_error = np.nanmax(np.abs(
+                np.stack(backend.propagate_cartesian(propagator, elements, moments)) - np.stack(expected_positions)
+            ))
+            if position_error > VERIFY_DISTANCE_TOLERANCE:
+                problems.append(f"positions differ by up to {position_error:.3g} km")
+            
+            status = "OK" if not problems else "MISMATCH"
+            print(f"{name:<8}{propagator_name:<14}{len(expected):>7} hits  {status}")
+            for problem in problems[:5]:
+                print(f"    {problem}")
+            all_match &= not problems
+    
+    return all_match
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compute backends of the proximity engine")
+    parser.add_argument("--verify", action="store_true", help="Compare available backends with the reference")
+    parser.add_argument("--objects", type=int, default=40, help="Objects per verification scenario (default 40)")
+    parser.add_argument("--steps", type=int, default=120, help="Time steps per scenario (default 120)")
+    args = parser.parse_args(argv)
+    configure_logging()
+    
+    print(f"Available backends: {', '.join(available_backends())} (selected: {create_backend().name})")
+    if not args.verify:
+        return 0
+    
+    return 0 if verify_backends(args.objects, args.steps) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
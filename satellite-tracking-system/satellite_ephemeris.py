@@ -0,0 +1,384 @@
+"""
+Ephemeris - Precomputed positions archived in memory-mapped files
+
+Satellite Orbit Tracking System - Services Layer
+Author: Aleks Czarnecki
+
+Contains:
+- Precomputation of per-object positions on a fixed time grid (float32 .npy files)
+- JSON index with the grid and the object/orbit row revisions each file was built from
+- Reader serving grid-aligned positions and tracks by slicing read-only memory maps;
+  entries whose rows were edited since (or built by another propagator) are ignored
+
+Usage:
+    python satellite_ephemeris.py --start 2024-01-01T00:00:00Z --end 2025-01-01T00:00:00Z --step 60
+    python satellite_ephemeris.py --start ... --end ... --ids 1 2 3   # selected objects only
+    python satellite_ephemeris.py --prune                              # drop stale entries
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session, joinedload
+
+from satellite_models import (
+    ObjectDBModel,
+    OrbitalElementsBatch,
+    GeodeticCoordinates,
+    SessionFactory,
+    init_database,
+    configure_logging,
+    EPHEMERIS_DIR,
+    PROPAGATOR_NAME,
+)
+from satellite_services import (
+    OrbitPropagator,
+    ISO8601Validator,
+    create_propagator,
+)
+
+log = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+INDEX_FORMAT = 1
+ARCHIVE_DTYPE = np.float32  # ~2 m in longitude, well below propagation model error
+WRITE_STEPS_PER_CHUNK = 100_000  # time steps propagated at once per object (bounds memory)
+GRID_TOLERANCE = 1e-3  # s - how far from a grid moment a query may be and still be served
+
+
+@dataclass
+class EphemerisEntry:
+    """Index record of one archived object"""
+    file: str
+    start: float  # first grid moment [POSIX seconds]
+    step: float  # grid step [s]
+    count: int  # grid moments
+    object_revision: str
+    orbit_revision: str
+    propagator: str
+    
+    def is_current(self, obj: ObjectDBModel, propagator_name: str = PROPAGATOR_NAME) -> bool:
+        """False once the object or its orbit was edited, or another model is configured"""
+        return (
+            self.object_revision == obj.row_revision
+            and self.orbit_revision == obj.orbit_ref.row_revision
+            and self.propagator == propagator_name
+        )
+    
+    def grid_index(self, moment: float) -> Optional[int]:
+        """Row of the grid moment at `moment`, or None if it falls between or outside"""
+        offset = (moment - self.start) / self.step
+        row = round(offset)
+        if abs(offset - row) * self.step > GRID_TOLERANCE or not 0 <= row < self.count:
+            return None
+        return row
+
+
+def archive_file_name(object_id: int, entry: EphemerisEntry) -> str:
+    """File name unique to the object's grid, row revisions and propagator"""
+    key = f"{entry.start!r}:{entry.step!r}:{entry.count}:{entry.object_revision}:{entry.orbit_revision}:{entry.propagator}"
+    return f"{object_id}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.npy"
+
+
+# ===========================================================================================
+# ARCHIVE
+# ===========================================================================================
+
+class EphemerisArchive:
+    """
+    Directory of archived ephemerides
+    
+    The index is re-read when its file changes, so positions written by the
+    precomputation job (another process) are picked up without a restart. Reads
+    only touch the mapped pages they need; the OS page cache keeps hot ranges.
+    """
+    
+    def __init__(self, directory: str = EPHEMERIS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index_mtime: Optional[int] = None
+        self._entries: Dict[int, EphemerisEntry] = {}
+        self._maps: Dict[str, np.ndarray] = {}
+    
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+    
+    def entries(self) -> Dict[int, EphemerisEntry]:
+        """Current index (object ID -> entry); empty if nothing was archived"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        
+        with self._lock:
+            if mtime != self._index_mtime:
+                self._entries = self._read_index() if mtime is not None else {}
+                # Files may have been replaced - map them again on next access
+                self._maps.clear()
+                self._index_mtime = mtime
+            return self._entries
+    
+    def _read_index(self) -> Dict[int, EphemerisEntry]:
+        with open(self.index_path, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+        
+        if index.get("format") != INDEX_FORMAT:
+            log.warning("Ignoring ephemeris index %s with unknown format", self.index_path)
+            return {}
+        return {int(object_id): EphemerisEntry(**entry) for object_id, entry in index["objects"].items()}
+    
+    def write_index(self, entries: Dict[int, EphemerisEntry]):
+        """Replaces the index atomically - readers see the old or the new one, never a mix"""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = f"{self.index_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as index_file:
+            json.dump({
+                "format": INDEX_FORMAT,
+                "objects": {str(object_id): asdict(entry) for object_id, entry in sorted(entries.items())}
+            }, index_file, indent=1)
+        os.replace(temporary_path, self.index_path)
+    
+    def _samples(self, entry: EphemerisEntry) -> np.ndarray:
+        """(count, 3) latitude, longitude, altitude map of one file, opened once per index version"""
+        samples = self._maps.get(entry.file)
+        if samples is None:
+            samples = np.load(os.path.join(self.directory, entry.file), mmap_mode="r")
+            with self._lock:
+                self._maps[entry.file] = samples
+        return samples
+    
+    def lookup(self, obj: ObjectDBModel) -> Optional[EphemerisEntry]:
+        """Entry of the object if it is still valid for its current rows"""
+        entry = self.entries().get(obj.record_id)
+        if entry is None or not entry.is_current(obj):
+            return None
+        return entry
+    
+    def position(self, obj: ObjectDBModel, moment: datetime) -> Optional[GeodeticCoordinates]:
+        """
+        Archived position at a grid moment
+        
+        Returns:
+            Coordinates, or None if the moment is not archived for the current rows
+            (the caller then propagates)
+        """
+        entry = self.lookup(obj)
+        row = entry.grid_index(moment.timestamp()) if entry is not None else None
+        if row is None:
+            return None
+        
+        latitude, longitude, altitude = (float(value) for value in self._samples(entry)[row])
+        if math.isnan(latitude):
+            return None  # grid moment before introduction date
+        
+        return GeodeticCoordinates(latitude=latitude, longitude=longitude, altitude_asl=altitude)
+    
+    def track(
+        self,
+        obj: ObjectDBModel,
+        start_time: datetime,
+        step: float,
+        count: int
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Archived samples at start_time + k * step, k < count
+        
+        Served only when every moment is a grid moment: start on the grid, step a
+        whole multiple of the archive step and the range inside the archive.
+        
+        Returns:
+            Moments [POSIX seconds] and (count, 3) float64 samples, or None
+        """
+        entry = self.lookup(obj)
+        if entry is None:
+            return None
+        
+        first_row = entry.grid_index(start_time.timestamp())
+        stride = step / entry.step
+        if first_row is None or abs(stride - round(stride)) * entry.step > GRID_TOLERANCE or round(stride) < 1:
+            return None
+        
+        stride = round(stride)
+        last_row = first_row + (count - 1) * stride
+        if last_row >= entry.count:
+            return None
+        
+        rows = slice(first_row, last_row + 1, stride)
+        moments = entry.start + np.arange(first_row, last_row + 1, stride) * entry.step
+        return moments, np.asarray(self._samples(entry)[rows], dtype=np.float64)
+    
+    # ---------------------------------------------------------------------------------------
+    # Precomputation
+    # ---------------------------------------------------------------------------------------
+    
+    def precompute(
+        self,
+        propagator: OrbitPropagator,
+        objects: List[ObjectDBModel],
+        start_time: datetime,
+        end_time: datetime,
+        step: float,
+        propagator_name: str = PROPAGATOR_NAME
+    ) -> int:
+        """
+        Archives positions of the objects on the grid start_time + k * step
+        
+        File names depend on the grid and the row revisions, so a new file never
+        replaces one the current index points to: replacing the index is the only
+        commit point. Files the new index no longer references are removed after it.
+        
+        Returns:
+            Bytes written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        start = start_time.timestamp()
+        count = int((end_time.timestamp() - start) // step) + 1
+        previous = self.entries()
+        entries = dict(previous)
+        written = 0
+        
+        for obj in objects:
+            entry = EphemerisEntry(
+                file="",
+                start=start,
+                step=step,
+                count=count,
+                object_revision=obj.row_revision,
+                orbit_revision=obj.orbit_ref.row_revision,
+                propagator=propagator_name
+            )
+            entry.file = archive_file_name(obj.record_id, entry)
+            if previous.get(obj.record_id) == entry and os.path.exists(os.path.join(self.directory, entry.file)):
+                continue  # same grid, rows and model - already archived
+            
+            elements = OrbitalElementsBatch.from_models([obj])
+            file_name = entry.file
+            temporary_path = os.path.join(self.directory, f"{file_name}.tmp")
+            
+            samples = np.lib.format.open_memmap(
+                temporary_path, mode="w+", dtype=ARCHIVE_DTYPE, shape=(count, 3)
+            )
+            for first in range(0, count, WRITE_STEPS_PER_CHUNK):
+                moments = start + np.arange(first, min(first + WRITE_STEPS_PER_CHUNK, count)) * step
+                latitude, longitude, altitude = propagator.propagate_batch(elements, moments)
+                samples[first:first + len(moments)] = np.stack((latitude[0], longitude[0], altitude[0]), axis=1)
+            samples.flush()
+            written += samples.nbytes
+            del samples
+            
+            os.replace(temporary_path, os.path.join(self.directory, file_name))
+            entries[obj.record_id] = entry
+        
+        self.write_index(entries)
+        self._remove_unreferenced(entries)
+        return written
+    
+    def prune(self, objects: List[ObjectDBModel], propagator_name: str = PROPAGATOR_NAME) -> int:
+        """
+        Removes entries of deleted or edited objects and their files
+        
+        Returns:
+            Number of entries removed
+        """
+        current = {obj.record_id: obj for obj in objects}
+        entries = dict(self.entries())
+        stale = [
+            object_id for object_id, entry in entries.items()
+            if object_id not in current or not entry.is_current(current[object_id], propagator_name)
+        ]
+        
+        for object_id in stale:
+            del entries[object_id]
+        
+        if stale:
+            self.write_index(entries)
+        self._remove_unreferenced(entries)
+        return len(stale)
+    
+    def _remove_unreferenced(self, entries: Dict[int, EphemerisEntry]):
+        """
+        Deletes archive files the index does not list (replaced, pruned or left by a crash)
+        
+        Workers that still map a deleted file keep reading it until they see the new
+        index; where the OS refuses to delete a mapped file it is left for the next run.
+        """
+        referenced = {entry.file for entry in entries.values()}
+        for name in os.listdir(self.directory):
+            if (name.endswith(".npy") or name.endswith(".npy.tmp")) and name not in referenced:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+# ===========================================================================================
+# ENTRY POINT
+# ===========================================================================================
+
+def load_archive_objects(session: Session, object_ids: Optional[List[int]] = None) -> List[ObjectDBModel]:
+    """Objects with their orbits, all or selected by ID"""
+    query = session.query(ObjectDBModel).options(joinedload(ObjectDBModel.orbit_ref))
+    if object_ids:
+        query = query.filter(ObjectDBModel.record_id.in_(object_ids))
+    return query.order_by(ObjectDBModel.record_id).all()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompute the ephemeris archive")
+    parser.add_argument("--start", help="First grid moment (ISO-8601)")
+    parser.add_argument("--end", help="Last moment to cover (ISO-8601)")
+    parser.add_argument("--step", type=float, default=60.0, help="Grid step [s] (default 60)")
+    parser.add_argument("--ids", type=int, nargs="*", help="Archive only these objects")
+    parser.add_argument("--prune", action="store_true", help="Remove entries of edited or deleted objects")
+    parser.add_argument("--directory", default=EPHEMERIS_DIR, help=f"Archive directory (default {EPHEMERIS_DIR})")
+    args = parser.parse_args(argv)
+    
+    if not args.prune and not (args.start and args.end):
+        parser.error("--start and --end are required unless --prune is given")
+    if args.step <= 0:
+        parser.error("--step must be positive")
+    
+    configure_logging()
+    init_database()
+    archive = EphemerisArchive(args.directory)
+    session = SessionFactory()
+    
+    try:
+        if args.prune:
+            removed = archive.prune(load_archive_objects(session))
+            print(f"Removed {removed} stale entries")
+        
+        if args.start and args.end:
+            validator = ISO8601Validator()
+            start_time = validator.validate_timestamp(args.start)
+            end_time = validator.validate_timestamp(args.end)
+            if end_time <= start_time:
+                parser.error("--end must be after --start")
+            
+            objects = load_archive_objects(session, args.ids)
+            started = time.perf_counter()
+            written = archive.precompute(create_propagator(PROPAGATOR_NAME), objects, start_time, end_time, args.step)
+            print(
+                f"Archived {len(objects)} objects, {written / 2**20:.1f} MB "
+                f"in {time.perf_counter() - started:.1f} s to {args.directory}"
+            )
+    finally:
+        session.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""
+Jobs - Background proximity scans
+
+Satellite Orbit Tracking System - Services Layer
+Author: Aleks Czarnecki
+
+Contains:
+- Thread pool running EventAnalysisService scans outside the request cycle
+- Job state, progress and results persisted in the database (survive restarts)
+- Cancellation and re-queueing of jobs interrupted by a stopped worker
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from satellite_models import (
+    ProximityJobDBModel,
+    ProximityJobEventDBModel,
+    JobStatus,
+    SessionFactory,
+    ACTIVE_JOB_STATES,
+    JOB_WORKERS,
+    JOB_PROGRESS_INTERVAL,
+    JOB_STALE_AFTER,
+)
+
+log = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp, as stored by the DateTime columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _as_naive_utc(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# ===========================================================================================
+# JOB MANAGER
+# ===========================================================================================
+
+class ProximityJobManager:
+    """
+    Runs proximity scans in background threads
+    
+    The database is the source of truth: any worker process may pick up a queued
+    job, claiming it with a conditional UPDATE so each job runs exactly once.
+    Running jobs refresh a heartbeat; jobs whose heartbeat went stale (their
+    process stopped) are re-queued and start over.
+    """
+    
+    def __init__(
+        self,
+        event_service,
+        objects_loader: Callable[[Session], Any],
+        max_workers: int = JOB_WORKERS,
+        session_factory=SessionFactory
+    ):
+        """
+        Args:
+            event_service: EventAnalysisService performing the scans
+            objects_loader: Loads catalog objects (with orbits) for a scan
+            max_workers: Number of scans run concurrently by this process
+            session_factory: Creates database sessions for the worker threads
+        """
+        self.event_service = event_service
+        self.objects_loader = objects_loader
+        self.session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="proximity-job")
+        self._cancel_events: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+    
+    def submit(
+        self,
+        db_session: Session,
+        start_time: datetime,
+        end_time: datetime,
+        precision: str
+    ) -> ProximityJobDBModel:
+        """Stores a new job and queues it for execution"""
+        job = ProximityJobDBModel(
+            job_status=JobStatus.QUEUED.value,
+            start_date=_as_naive_utc(start_time),
+            end_date=_as_naive_utc(end_time),
+            precision=precision
+        )
+        db_session.add(job)
+        db_session.commit()
+        db_session.refresh(job)
+        
+        self._enqueue(job.record_id)
+        log.info(f"Queued proximity job ID={job.record_id} ({start_time} - {end_time}, {precision})")
+        
+        return job
+    
+    def cancel(self, db_session: Session, job: ProximityJobDBModel):
+        """
+        Cancels an active job (partial results are kept) or removes a finished one
+        
+        Cancellation is recorded in the database, so the process running the job
+        notices it at its next progress update even if it is another worker.
+        """
+        if job.job_status in ACTIVE_JOB_STATES:
+            job.job_status = JobStatus.CANCELLED.value
+            job.finished_timestamp = _utcnow()
+            db_session.commit()
+            
+            with self._lock:
+                cancel_event = self._cancel_events.get(job.record_id)
+            if cancel_event is not None:
+                cancel_event.set()
+            
+            log.info(f"Cancelled proximity job ID={job.record_id}")
+        else:
+            # Bulk deletes: the ORM cascade would load every stored encounter first
+            job_id = job.record_id
+            db_session.execute(delete(ProximityJobEventDBModel).where(ProximityJobEventDBModel.job_id == job_id))
+            db_session.execute(delete(ProximityJobDBModel).where(ProximityJobDBModel.record_id == job_id))
+            db_session.commit()
+            log.info(f"Deleted proximity job ID={job_id}")
+    
+    def requeue_if_stale(self, db_session: Session, job: ProximityJobDBModel) -> bool:
+        """Re-queues a running job whose process stopped sending heartbeats"""
+        stale_before = _utcnow() - timedelta(seconds=JOB_STALE_AFTER)
+        
+        if job.job_status != JobStatus.RUNNING.value or (
+            job.heartbeat_timestamp is not None and job.heartbeat_timestamp >= stale_before
+        ):
+            return False
+        
+        if not self._reset_to_queued(db_session, [job.record_id], stale_before):
+            return False
+        
+        db_session.refresh(job)
+        self._enqueue(job.record_id)
+        return True
+    
+    def resume_interrupted(self) -> int:
+        """
+        Queues jobs left behind by stopped processes (call at startup)
+        
+        Returns:
+            Number of jobs queued in this process
+        """
+        session = self.session_factory()
+        try:
+            stale_before = _utcnow() - timedelta(seconds=JOB_STALE_AFTER)
+            stale_ids = session.execute(
+                select(ProximityJobDBModel.record_id).where(
+                    ProximityJobDBModel.job_status == JobStatus.RUNNING.value,
+                    (ProximityJobDBModel.heartbeat_timestamp.is_(None))
+                    | (ProximityJobDBModel.heartbeat_timestamp < stale_before)
+                )
+            ).scalars().all()
+            self._reset_to_queued(session, stale_ids, stale_before)
+            
+            queued_ids = session.execute(
+                select(ProximityJobDBModel.record_id)
+                .where(ProximityJobDBModel.job_status == JobStatus.QUEUED.value)
+                .order_by(ProximityJobDBModel.record_id)
+            ).scalars().all()
+        finally:
+            session.close()
+        
+        for job_id in queued_ids:
+            self._enqueue(job_id)
+        
+        if queued_ids:
+            log.info(f"Resumed {len(queued_ids)} proximity jobs")
+        return len(queued_ids)
+    
+    def shutdown(self):
+        """Stops running scans; they go back to the queue for the next start"""
+        self._stopping.set()
+        with self._lock:
+            for cancel_event in self._cancel_events.values():
+                cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+    
+    # ---------------------------------------------------------------------------------------
+    # Worker side
+    # ---------------------------------------------------------------------------------------
+    
+    def _enqueue(self, job_id: int):
+        with self._lock:
+            self._cancel_events.setdefault(job_id, threading.Event())
+        self._executor.submit(self._run, job_id)
+    
+    @staticmethod
+    def _reset_to_queued(db_session: Session, job_ids, stale_before: datetime) -> int:
+        """Returns stale running jobs to the queue and drops their partial results"""
+        if not job_ids:
+            return 0
+        
+        jobs = ProximityJobDBModel.__table__
+        result = db_session.execute(
+            update(jobs)
+            .where(
+                jobs.c.record_id.in_(job_ids),
+                jobs.c.job_status == JobStatus.RUNNING.value,
+                (jobs.c.heartbeat_timestamp.is_(None)) | (jobs.c.heartbeat_timestamp < stale_before)
+            )
+            .values(job_status=JobStatus.QUEUED.value, steps_done=0, heartbeat_timestamp=None)
+        )
+        db_session.execute(
+            delete(ProximityJobEventDBModel).where(
+                ProximityJobEventDBModel.job_id.in_(job_ids),
+                ProximityJobEventDBModel.job_id.in_(
+                    select(jobs.c.record_id).where(jobs.c.job_status == JobStatus.QUEUED.value)
+                )
+            )
+        )
+        db_session.commit()
+        
+        return result.rowcount
+    
+    @staticmethod
+    def _claim(db_session: Session, job_id: int) -> bool:
+        """Marks a queued job as running; False if another thread or worker got it first"""
+        jobs = ProximityJobDBModel.__table__
+        result = db_session.execute(
+            update(jobs)
+            .where(jobs.c.record_id == job_id, jobs.c.job_status == JobStatus.QUEUED.value)
+            .values(job_status=JobStatus.RUNNING.value, steps_done=0, heartbeat_timestamp=_utcnow())
+        )
+        db_session.commit()
+        return result.rowcount == 1
+    
+    def _progress_reporter(self, db_session: Session, job_id: int, cancel_event: threading.Event):
+        """Per-step callback persisting progress at most once per JOB_PROGRESS_INTERVAL"""
+        jobs = ProximityJobDBModel.__table__
+        last_report = time.monotonic()
+        
+        def report(steps_done: int):
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report < JOB_PROGRESS_INTERVAL:
+                return
+            last_report = now
+            
+            db_session.execute(
+                update(jobs)
+                .where(jobs.c.record_id == job_id)
+                .values(steps_done=steps_done, heartbeat_timestamp=_utcnow())
+            )
+            status = db_session.execute(
+                select(jobs.c.job_status).where(jobs.c.record_id == job_id)
+            ).scalar()
+            db_session.commit()
+            
+            # Cancelled (or deleted) through another worker
+            if status != JobStatus.RUNNING.value:
+                cancel_event.set()
+        
+        return report
+    
+    def _run(self, job_id: int):
+        """Executes one job in a pool thread"""
+        with self._lock:
+            cancel_event = self._cancel_events.setdefault(job_id, threading.Event())
+        
+        catalog_session = self.session_factory()
+        status_session = self.session_factory()
+        
+        try:
+            if self._stopping.is_set() or not self._claim(status_session, job_id):
+                return
+            
+            job = status_session.get(ProximityJobDBModel, job_id)
+            start_time = job.start_date.replace(tzinfo=timezone.utc)
+            end_time = job.end_date.replace(tzinfo=timezone.utc)
+            time_delta = self.event_service.parse_precision(job.precision)
+            
+            objects = self.objects_loader(catalog_session)
+            estimate, plan = self.event_service.estimate_scan_cost(objects, start_time, end_time, time_delta)
+            job.steps_total = estimate.steps
+            status_session.commit()
+            
+            log.info(f"Running proximity job ID={job_id}: {estimate.steps} steps x {estimate.pairs} pairs")
+            
+            scan = self.event_service.detect_events_in_interval(
+                objects,
+                start_time,
+                end_time,
+                time_delta,
+                progress_callback=self._progress_reporter(status_session, job_id, cancel_event),
+                cancel_event=cancel_event,
+                plan=plan
+            )
+            
+            status_session.refresh(job)
+            if not scan.complete and self._stopping.is_set():
+                # Interrupted by shutdown - run again from the start after restart
+                self._reset_to_queued(status_session, [job_id], _utcnow() + timedelta(seconds=1))
+                return
+            
+            status_session.add_all(
+                ProximityJobEventDBModel.from_event(job_id, event) for event in scan.events
+            )
+            job.steps_done = estimate.steps if scan.complete else job.steps_done
+            if job.job_status == JobStatus.RUNNING.value:
+                job.job_status = JobStatus.COMPLETED.value if scan.complete else JobStatus.CANCELLED.value
+            job.finished_timestamp = job.finished_timestamp or _utcnow()
+            status_session.commit()
+            
+            log.info(f"Proximity job ID={job_id} {job.job_status}: {len(scan.events)} encounters")
+        
+        except Exception as e:
+            log.exception(f"Proximity job ID={job_id} failed")
+            status_session.rollback()
+            status_session.execute(
+                update(ProximityJobDBModel.__table__)
+                .where(ProximityJobDBModel.__table__.c.record_id == job_id)
+                .values(
+                    job_status=JobStatus.FAILED.value,
+                    error_message=str(e)[:500],
+                    finished_timestamp=_utcnow()
+                )
+            )
+            status_session.commit()
+        
+        finally:
+            catalog_session.close()
+            status_session.close()
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
@@ -0,0 +1,305 @@
+"""
+Load Test - Concurrent traffic generator with latency percentiles
+
+Satellite Orbit Tracking System - Tools
+Author: Aleks Czarnecki
+
+Contains:
+- Catalog seeding through the public API
+- Weighted mix of CRUD, position and proximity requests at fixed concurrency
+- Throughput and p50/p95/p99 latency per route, with optional latency budgets
+
+Usage:
+    python satellite_loadtest.py                       # in-process (ASGI), temporary catalog
+    python satellite_loadtest.py --url http://127.0.0.1:8000 --concurrency 32
+    python satellite_loadtest.py --budget p95=50 --budget proximity:p99=2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+# Default traffic mix - relative weights of the operations below
+DEFAULT_MIX = "list=2,read=3,position=6,update=1,proximity=1"
+PERCENTILES = (50, 95, 99)
+SEED_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+PROXIMITY_WINDOW = timedelta(hours=1)
+PROXIMITY_PRECISION = "5m"
+REQUEST_TIMEOUT = 60.0  # s
+
+
+# ===========================================================================================
+# RESULTS
+# ===========================================================================================
+
+@dataclass
+class RouteStats:
+    """Latencies and failures of one route"""
+    latencies: List[float] = field(default_factory=list)  # seconds, successful requests only
+    errors: int = 0
+    
+    def percentile(self, rank: float) -> float:
+        """Latency percentile in milliseconds (NaN without samples)"""
+        if not self.latencies:
+            return float("nan")
+        return float(np.percentile(self.latencies, rank)) * 1000.0
+
+
+@dataclass
+class LatencyBudget:
+    """Limit for one percentile, for one route or (route None) every route"""
+    percentile: float
+    limit_ms: float
+    route: Optional[str] = None
+    
+    @classmethod
+    def parse(cls, text: str) -> 'LatencyBudget':
+        """Parses "p95=200" or "position:p99=50" """
+        route, _, rule = text.rpartition(":")
+        name, _, limit = rule.partition("=")
+        if not name.startswith("p") or not limit:
+            raise ValueError(f"Invalid budget '{text}', expected [route:]pNN=MS")
+        return cls(float(name[1:]), float(limit), route or None)
+
+
+# ===========================================================================================
+# TRAFFIC
+# ===========================================================================================
+
+class LoadGenerator:
+    """Seeds a catalog and replays a random request mix against it"""
+    
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, float], rng: random.Random):
+        self.client = client
+        self.mix = mix
+        self.rng = rng
+        self.satellites: List[dict] = []
+        self.stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+    
+    async def seed(self, orbit_count: int, satellite_count: int):
+        """Creates orbits and active satellites spread evenly over them"""
+        run_tag = f"{time.time_ns():x}"
+        
+        orbit_ids = []
+        for index in range(orbit_count):
+            response = await self.client.post("/orbits/", json={
+                "name": f"LOAD-{run_tag}-ORB-{index}",
+                "altitude": self.rng.uniform(400.0, 1500.0),
+                "inclination": self.rng.uniform(0.0, 110.0),
+                "raan": self.rng.uniform(0.0, 359.0),
+            })
+            response.raise_for_status()
+            orbit_ids.append(response.json()["id"])
+        
+        for index in range(satellite_count):
+            payload = {
+                "name": f"LOAD-{run_tag}-SAT-{index}",
+                "operator": "LoadTest",
+                "launch_date": SEED_EPOCH.isoformat(),
+                "status": "active",
+                "starting_lon_position": self.rng.uniform(-180.0, 180.0),
+                "associated_orbit_id": orbit_ids[index % orbit_count],
+            }
+            response = await self.client.post("/satellites/", json=payload)
+            response.raise_for_status()
+            self.satellites.append({**payload, "id": response.json()["id"]})
+    
+    def next_request(self) -> Tuple[str, str, str, Optional[dict], Tuple[int, ...]]:
+        """Draws one request: (route, method, url, json body, accepted status codes)"""
+        operation = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        satellite = self.rng.choice(self.satellites)
+        moment = SEED_EPOCH + timedelta(seconds=self.rng.uniform(0.0, 365 * 86400.0))
+        
+        if operation == "list":
+            skip = self.rng.randrange(max(len(self.satellites) - 10, 1))
+            return "GET /satellites/", "GET", f"/satellites/?skip={skip}&limit=10", None, (200,)
+        
+        if operation == "read":
+            return "GET /satellites/{id}", "GET", f"/satellites/{satellite['id']}", None, (200,)
+        
+        if operation == "position":
+            params = httpx.QueryParams({"timestamp": moment.isoformat()})
+            url = f"/satellites/{satellite['id']}/position?{params}"
+            return "GET /satellites/{id}/position", "GET", url, None, (200,)
+        
+        if operation == "update":
+            body = {key: value for key, value in satellite.items() if key != "id"}
+            body["starting_lon_position"] = self.rng.uniform(-180.0, 180.0)
+            # 409 - another worker updated the same satellite concurrently
+            return "PUT /satellites/{id}", "PUT", f"/satellites/{satellite['id']}", body, (200, 409)
+        
+        if operation == "proximity":
+            params = httpx.QueryParams({
+                "start_date": moment.isoformat(),
+                "end_date": (moment + PROXIMITY_WINDOW).isoformat(),
+                "precision": PROXIMITY_PRECISION,
+                "downgrade": "true",
+            })
+            return "GET /proximities", "GET", f"/proximities?{params}", None, (200,)
+        
+        raise ValueError(f"Unknown operation '{operation}'")
+    
+    async def worker(self, remaining: List[int]):
+        """Sends requests one after another until the shared budget is used up"""
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            route, method, url, body, accepted = self.next_request()
+            
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, json=body)
+                ok = response.status_code in accepted
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - started
+            
+            if ok:
+                self.stats[route].latencies.append(elapsed)
+            else:
+                self.stats[route].errors += 1
+    
+    async def run(self, request_count: int, concurrency: int) -> float:
+        """Runs the mix; returns wall-clock duration in seconds"""
+        remaining = [request_count]
+        started = time.perf_counter()
+        await asyncio.gather(*(self.worker(remaining) for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+
+# ===========================================================================================
+# REPORT
+# ===========================================================================================
+
+def print_report(stats: Dict[str, RouteStats], duration: float):
+    """Prints one line per route plus the total"""
+    header = f"{'route':<32}{'requests':>9}{'errors':>8}{'req/s':>9}" + "".join(
+        f"{f'p{rank} ms':>10}" for rank in PERCENTILES
+    )
+    print(header)
+    print("-" * len(header))
+    
+    total = RouteStats()
+    for route in sorted(stats):
+        route_stats = stats[route]
+        total.latencies.extend(route_stats.latencies)
+        total.errors += route_stats.errors
+        _print_row(route, route_stats, duration)
+    
+    print("-" * len(header))
+    _print_row("TOTAL", total, duration)
+
+
+def _print_row(label: str, stats: RouteStats, duration: float):
+    count = len(stats.latencies) + stats.errors
+    print(f"{label:<32}{count:>9}{stats.errors:>8}{count / duration:>9.1f}" + "".join(
+        f"{stats.percentile(rank):>10.1f}" for rank in PERCENTILES
+    ))
+
+
+def check_budgets(stats: Dict[str, RouteStats], budgets: List[LatencyBudget]) -> List[str]:
+    """Returns violated budgets as messages; a route matches by any part of its name"""
+    violations = []
+    for budget in budgets:
+        for route, route_stats in stats.items():
+            if budget.route is not None and budget.route not in route:
+                continue
+            measured = route_stats.percentile(budget.percentile)
+            if measured > budget.limit_ms:
+                violations.append(
+                    f"{route}: p{budget.percentile:g} {measured:.1f} ms > {budget.limit_ms:g} ms"
+                )
+    return violations
+
+
+# ===========================================================================================
+# ENTRY POINT
+# ===========================================================================================
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parses "list=2,position=6" into operation weights"""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def run_load_test(args) -> int:
+    """Seeds, runs and reports; returns the process exit code"""
+    rng = random.Random(args.seed)
+    
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=REQUEST_TIMEOUT)
+        lifespan = None
+    else:
+        # The in-memory default shares one connection between all sessions, which
+        # concurrent requests would interleave - use a throwaway file catalog instead
+        if "SATELLITE_DATABASE_URL" not in os.environ:
+            database_dir = tempfile.mkdtemp(prefix="satellite-loadtest-")
+            os.environ["SATELLITE_DATABASE_URL"] = f"sqlite:///{database_dir}/catalog.db"
+        
+        from satellite_api import create_app
+        app = create_app()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://loadtest",
+            timeout=REQUEST_TIMEOUT
+        )
+        lifespan = app.router.lifespan_context(app)
+    
+    async with client:
+        if lifespan is not None:
+            await lifespan.__aenter__()
+        try:
+            generator = LoadGenerator(client, parse_mix(args.mix), rng)
+            await generator.seed(args.orbits, args.satellites)
+            print(f"Seeded {args.orbits} orbits, {args.satellites} satellites; "
+                  f"{args.requests} requests at concurrency {args.concurrency}")
+            duration = await generator.run(args.requests, args.concurrency)
+        finally:
+            if lifespan is not None:
+                await lifespan.__aexit__(None, None, None)
+    
+    print_report(generator.stats, duration)
+    
+    violations = check_budgets(generator.stats, args.budget)
+    errors = sum(route_stats.errors for route_stats in generator.stats.values())
+    for message in violations:
+        print(f"BUDGET EXCEEDED {message}")
+    if errors > args.max_errors:
+        print(f"TOO MANY ERRORS {errors} > {args.max_errors}")
+    
+    return 1 if violations or errors > args.max_errors else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test for the satellite tracking API")
+    parser.add_argument("--url", help="Server URL (default: run the app in-process)")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests (default 2000)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients (default 16)")
+    parser.add_argument("--orbits", type=int, default=10, help="Seeded orbits (default 10)")
+    parser.add_argument("--satellites", type=int, default=100, help="Seeded satellites (default 100)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default {DEFAULT_MIX})")
+    parser.add_argument(
+        "--budget", type=LatencyBudget.parse, action="append", default=[],
+        help="Latency budget [route:]pNN=MS, repeatable (e.g. p95=100, proximity:p99=2000)"
+    )
+    parser.add_argument("--max-errors", type=int, default=0, help="Failed requests tolerated (default 0)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default 1)")
+    
+    return asyncio.run(run_load_test(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
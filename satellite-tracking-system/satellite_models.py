@@ -7,44 +7,163 @@ Author: Aleks Czarnecki
 Contains:
 - Database models (SQLAlchemy)
 - Validation schemas (Pydantic)
-- Dataclasses for orbital calculations
+- Dataclasses for orbital calculations (single object and vectorized batches)
 - Physical constants and configuration
 """
 
+import atexit
+import itertools
 import logging
 import math
+import os
+import queue
+import threading
+import time
+import uuid
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, Tuple, List
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING, Any, Dict, Tuple, List, Optional, Union
 
-from pydantic import BaseModel, Field, validator
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey
+from pydantic import BaseModel, Field, root_validator, validator
+from sqlalchemy import (
+    create_engine, event, inspect, literal, select, text,
+    Column, Integer, String, Float, DateTime, ForeignKey, Index,
+)
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.pool import StaticPool
 
+if TYPE_CHECKING:
+    import numpy as np  # imported by the batch code that needs it, not with the models
+
 # ===========================================================================================
 # CONFIGURATION AND CONSTANTS
 # ===========================================================================================
 
-logging.basicConfig(
-    level=logging.WARNING,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-log = logging.getLogger(__name__)
+LOG_LEVEL = os.environ.get("SATELLITE_LOG_LEVEL", "WARNING").upper()
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+ENCOUNTER_LOG_LIMIT = 20  # per-encounter log lines let through per period (rest are counted)
+ENCOUNTER_LOG_PERIOD = 10.0  # s
 
 # Planetary and orbital constants
 EARTH_GRAV_PARAMETER = 398600.4418  # km³/s² - standard gravitational parameter
 EARTH_BASE_RADIUS = 6371.0  # km
 PROXIMITY_TOLERANCE = 0.01  # km - event detection threshold
 NUMERICAL_EPSILON = 1e-9  # for floating-point comparisons
+EARTH_J2 = 1.08262668e-3  # second zonal harmonic - Earth oblateness
+EARTH_EQUATORIAL_RADIUS = 6378.137  # km - reference radius for J2 perturbations
+KEPLER_SOLVER_ITERATIONS = 8  # fixed Newton iterations for Kepler's equation
+SECONDS_PER_DAY = 86400.0
 
 # System operational limits
 MAX_ITEMS_PER_PAGE = 100
 DEFAULT_PAGE_SIZE = 10
+MAX_CHANGES_PER_PAGE = 1000  # change feed entries returned at once
 MINIMUM_ORBIT_ALTITUDE = 160.0  # km above sea level
 MAXIMUM_ORBIT_ALTITUDE = 40000.0  # km
+MAX_ANALYSIS_RANGE_DAYS = 31  # longest interval for eclipse and pass searches
+DEFAULT_MIN_ELEVATION = 10.0  # degrees - ground station horizon mask
+
+# Storage configuration - a file-backed URL lets several workers share one catalog
+DATABASE_URL = os.environ.get("SATELLITE_DATABASE_URL", "sqlite:///:memory:")
+PROPAGATOR_NAME = os.environ.get("SATELLITE_PROPAGATOR", "keplerian")
+COMPUTE_BACKEND_NAME = os.environ.get("SATELLITE_COMPUTE_BACKEND", "auto")  # python, numpy, numba, auto
+SCREEN_CHUNK_PAIR_STEPS = 500_000  # pair-steps screened per call - bounds memory and deadline latency
+SCAN_COST_BUDGET = int(os.environ.get("SATELLITE_SCAN_COST_BUDGET", 20_000_000))  # pair-steps
+SCAN_DEADLINE_SECONDS = float(os.environ.get("SATELLITE_SCAN_DEADLINE_SECONDS", 30))
+JOB_WORKERS = int(os.environ.get("SATELLITE_JOB_WORKERS", 2))  # background scan threads per process
+JOB_PROGRESS_INTERVAL = 1.0  # s - how often a job persists progress and checks for cancellation
+JOB_STALE_AFTER = 60.0  # s - a running job without progress this long is re-queued
+WARM_UP_ON_STARTUP = os.environ.get("SATELLITE_WARM_UP", "0") == "1"  # build services before first request
+SERVER_TIMING_ENABLED = os.environ.get("SATELLITE_SERVER_TIMING", "1") == "1"  # per-stage response header
+POSITION_CACHE_MAX_AGE = 300  # s - how long clients/CDNs may reuse a position response
+EPHEMERIS_DIR = os.environ.get("SATELLITE_EPHEMERIS_DIR", "ephemeris")  # precomputed position archive
+MAX_TRACK_POINTS = 10_000  # samples returned by one track request
+STREAM_TICK_SECONDS = 0.5  # s - base tick of /ws/positions; intervals are multiples of it
+STREAM_DEFAULT_INTERVAL = 1.0  # s
+STREAM_MAX_INTERVAL = 60.0  # s
+STREAM_MAX_OBJECTS = 5000  # objects followed by one connection
+POSE_MODEL_PATH = os.environ.get("SATELLITE_POSE_MODEL", "")  # TorchScript (.pt) or ONNX (.onnx); "" = /pose off
+POSE_BATCH_WINDOW_MS = float(os.environ.get("SATELLITE_POSE_BATCH_WINDOW_MS", 2))  # wait for more requests
+POSE_MAX_BATCH = int(os.environ.get("SATELLITE_POSE_MAX_BATCH", 64))  # requests per forward pass
+POSE_THREADS = int(os.environ.get("SATELLITE_POSE_THREADS", 0))  # inference threads; 0 = CPU count
+SQLITE_BUSY_TIMEOUT_MS = 5000  # how long a writer waits for another worker's lock
+CATALOG_REVISION_ROW_ID = 1
+
+
+# ===========================================================================================
+# LOGGING - queue-based, written by a background thread
+# ===========================================================================================
+
+_log_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: str = LOG_LEVEL):
+    """
+    Routes log records through a queue to one background writer thread
+    
+    Request and scan threads only enqueue; stream formatting and I/O happen in
+    the listener, which is flushed and stopped at interpreter exit. Like
+    logging.basicConfig, does nothing if the root logger already has handlers.
+    Called by the application lifespan and command-line entry points, not at import.
+    """
+    global _log_listener
+    root = logging.getLogger()
+    if _log_listener is not None or root.handlers:
+        return
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    log_queue = queue.SimpleQueue()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    
+    _log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+class LogRateLimiter:
+    """
+    Lets at most `limit` records through per `period` seconds and counts the rest
+    
+    For per-item logs in loops whose item count is unbounded (e.g. encounters
+    of a dense scan): the caller reports take_suppressed() once at the end.
+    """
+    
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self._lock = threading.Lock()
+        self._window_start = float("-inf")
+        self._window_count = 0
+        self._suppressed = 0
+    
+    def allow(self) -> bool:
+        """True if the next record may be logged"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._window_start >= self.period:
+                self._window_start = now
+                self._window_count = 0
+            if self._window_count < self.limit:
+                self._window_count += 1
+                return True
+            self._suppressed += 1
+            return False
+    
+    def take_suppressed(self) -> int:
+        """Number of records dropped since the last call"""
+        with self._lock:
+            suppressed, self._suppressed = self._suppressed, 0
+        return suppressed
+
+
+log = logging.getLogger(__name__)
 
 
 # ===========================================================================================
@@ -58,6 +177,18 @@ class ObjectType(str, Enum):
     DEORBITED = "deorbited"
 
 
+class JobStatus(str, Enum):
+    """Lifecycle of a background proximity job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+ACTIVE_JOB_STATES = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
 class PrecisionCategory(str, Enum):
     """Time precision categories for calculations"""
     MILLISECONDS = "ms"
@@ -105,6 +236,21 @@ class OrbitalParameters:
     semi_major_axis: float  # semi-major axis [km]
     inclination_deg: float  # inclination [degrees]
     ascending_node: float  # RAAN - Right Ascension of Ascending Node [degrees]
+    eccentricity: float = 0.0  # orbit eccentricity [0, 1)
+    argument_of_perigee: float = 0.0  # argument of perigee [degrees]
+    drag_term: float = 0.0  # SGP4 B* drag term [1/earth radii]
+    
+    @classmethod
+    def from_model(cls, orbit: 'OrbitDBModel') -> 'OrbitalParameters':
+        """Conversion from DB model"""
+        return cls(
+            semi_major_axis=EARTH_BASE_RADIUS + orbit.altitude_km,
+            inclination_deg=orbit.inclination_angle,
+            ascending_node=orbit.ascending_node,
+            eccentricity=orbit.eccentricity or 0.0,
+            argument_of_perigee=orbit.argument_of_perigee or 0.0,
+            drag_term=orbit.drag_term or 0.0
+        )
     
     def calculate_orbital_period(self) -> float:
         """Calculates orbital period T = 2Pi*sqrt(a3/μ)"""
@@ -118,14 +264,140 @@ class OrbitalParameters:
         return 2 * math.pi / T if T > NUMERICAL_EPSILON else 0.0
 
 
+@dataclass
+class OrbitalElementsBatch:
+    """Orbital elements of many objects as parallel arrays for vectorized propagation"""
+    object_ids: 'np.ndarray'  # object record IDs
+    semi_major_axis: 'np.ndarray'  # [km]
+    inclination_deg: 'np.ndarray'  # [degrees]
+    ascending_node: 'np.ndarray'  # [degrees]
+    eccentricity: 'np.ndarray'
+    argument_of_perigee: 'np.ndarray'  # [degrees]
+    initial_longitude: 'np.ndarray'  # [degrees]
+    epoch: 'np.ndarray'  # introduction date [POSIX seconds]
+    drag_term: 'np.ndarray'  # SGP4 B* drag term [1/earth radii]
+    
+    def __len__(self) -> int:
+        return len(self.object_ids)
+    
+    def subset(self, rows) -> 'OrbitalElementsBatch':
+        """Selects rows by index array or boolean mask (rows may repeat)"""
+        return OrbitalElementsBatch(**{
+            name: getattr(self, name)[rows] for name in self.__dataclass_fields__
+        })
+    
+    @classmethod
+    def from_models(cls, objects: List['ObjectDBModel']) -> 'OrbitalElementsBatch':
+        """Builds the batch from objects with loaded orbits"""
+        import numpy as np
+        
+        def column(values, dtype=np.float64):
+            return np.fromiter(values, dtype=dtype, count=len(objects))
+        
+        def epoch_of(obj):
+            introduction_date = obj.introduction_date
+            if introduction_date.tzinfo is None:
+                introduction_date = introduction_date.replace(tzinfo=timezone.utc)
+            return introduction_date.timestamp()
+        
+        return cls(
+            object_ids=column((o.record_id for o in objects), np.int64),
+            semi_major_axis=column(EARTH_BASE_RADIUS + o.orbit_ref.altitude_km for o in objects),
+            inclination_deg=column(o.orbit_ref.inclination_angle for o in objects),
+            ascending_node=column(o.orbit_ref.ascending_node for o in objects),
+            eccentricity=column(o.orbit_ref.eccentricity or 0.0 for o in objects),
+            argument_of_perigee=column(o.orbit_ref.argument_of_perigee or 0.0 for o in objects),
+            initial_longitude=column(o.starting_lon_position for o in objects),
+            epoch=column(epoch_of(o) for o in objects),
+            drag_term=column(o.orbit_ref.drag_term or 0.0 for o in objects)
+        )
+
+
+@dataclass
+class TwoLineElementSet:
+    """Mean orbital elements parsed from a NORAD two-line element set"""
+    catalog_number: int
+    name: Optional[str]
+    epoch: datetime  # element set epoch (UTC)
+    inclination_deg: float  # [degrees]
+    ascending_node: float  # RAAN [degrees]
+    eccentricity: float
+    argument_of_perigee: float  # [degrees]
+    mean_anomaly: float  # [degrees]
+    mean_motion: float  # [revolutions per day]
+    drag_term: float  # B* [1/earth radii]
+    
+    @property
+    def semi_major_axis(self) -> float:
+        """Semi-major axis from mean motion a = (mu/n^2)^(1/3) [km]"""
+        mean_motion_rad = self.mean_motion * 2 * math.pi / SECONDS_PER_DAY
+        return (EARTH_GRAV_PARAMETER / mean_motion_rad**2) ** (1 / 3)
+    
+    @property
+    def initial_argument_of_latitude(self) -> float:
+        """Mean argument of latitude at epoch, normalized to [-180, 180] [degrees]"""
+        return ((self.argument_of_perigee + self.mean_anomaly + 180) % 360) - 180
+    
+    @staticmethod
+    def epoch_from_fields(year_2digit: int, day_of_year: float) -> datetime:
+        """Converts TLE epoch fields (YY, DDD.DDDDDDDD) to datetime"""
+        year = 2000 + year_2digit if year_2digit < 57 else 1900 + year_2digit
+        return datetime(year, 1, 1, tzinfo=timezone.utc) + timedelta(days=day_of_year - 1)
+
+
+@dataclass
+class EclipseWindow:
+    """Interval during which an object is in the Earth's shadow"""
+    object_id: int
+    entry_time: datetime
+    exit_time: datetime
+    
+    @property
+    def duration(self) -> float:
+        """Eclipse duration [seconds]"""
+        return (self.exit_time - self.entry_time).total_seconds()
+
+
+@dataclass
+class PassWindow:
+    """Interval during which an object is above a ground station's elevation mask"""
+    object_id: int
+    station_id: int
+    aos_time: datetime
+    los_time: datetime
+    culmination_time: datetime
+    max_elevation: float
+    
+    @property
+    def duration(self) -> float:
+        """Pass duration [seconds]"""
+        return (self.los_time - self.aos_time).total_seconds()
+
+
 @dataclass
 class SpaceEvent:
-    """Space event - e.g. object proximity"""
+    """
+    Space event - e.g. object proximity
+    
+    For an encounter spanning several analysis steps, time_moment and location
+    describe the closest approach (TCA) and start/end the first/last step in range.
+    """
     object_id_a: int
     object_id_b: int
     time_moment: datetime
     location: GeodeticCoordinates
     min_distance: float = 0.0
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    
+    def record_step(self, moment: datetime, location: GeodeticCoordinates, distance: float):
+        """Extends encounter by one more step in range"""
+        self.end_time = moment
+        
+        if distance < self.min_distance:
+            self.time_moment = moment
+            self.location = location
+            self.min_distance = distance
     
     def to_dict(self) -> Dict[str, Any]:
         """Export to dictionary"""
@@ -133,6 +405,8 @@ class SpaceEvent:
             "satellite1": self.object_id_a,
             "satellite2": self.object_id_b,
             "time": self.time_moment.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "start": (self.start_time or self.time_moment).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "end": (self.end_time or self.time_moment).strftime("%Y-%m-%dT%H:%M:%SZ"),
             "position": {
                 "latitude": self.location.latitude,
                 "longitude": self.location.longitude,
@@ -142,21 +416,130 @@ class SpaceEvent:
         }
 
 
+@dataclass
+class ScanCostEstimate:
+    """Size of a proximity scan, known before it runs"""
+    steps: int
+    pairs: int  # pairs stepped through time (closed-form pairs excluded)
+    span_seconds: float
+    
+    @property
+    def cost(self) -> int:
+        """Pair-steps - number of distance evaluations"""
+        return self.steps * self.pairs
+
+
+@dataclass
+class ScanPlan:
+    """Closed-form encounters and the pairs left to step, for one time grid"""
+    events: List[SpaceEvent]  # co-orbital encounters (not logged yet)
+    stepped_pairs: List[Tuple[int, int]]
+    stepped_objects: list  # objects involved in stepped pairs
+    time_delta: timedelta  # grid step the plan was made for
+
+
+@dataclass
+class ProximityScanResult:
+    """Encounters found by a proximity scan, possibly cut short by its deadline"""
+    events: List[SpaceEvent]
+    analyzed_until: Optional[datetime]  # last grid step analyzed
+    complete: bool = True
+
+
+@dataclass
+class ScreeningHits:
+    """
+    Pair-steps of a screening run closer than the detection threshold
+    
+    Parallel arrays sorted by (step, pair); the position is that of the pair's
+    first object, as reported for encounters.
+    """
+    steps: 'np.ndarray'  # index into the screened moments
+    pairs: 'np.ndarray'  # index into the screened pairs
+    distances: 'np.ndarray'  # [km]
+    latitude: 'np.ndarray'  # [degrees]
+    longitude: 'np.ndarray'  # [degrees]
+    altitude: 'np.ndarray'  # [km]
+    
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+@dataclass
+class RegionPositions:
+    """Objects inside a latitude/longitude box at one moment (parallel arrays, by object ID)"""
+    object_ids: 'np.ndarray'
+    latitude: 'np.ndarray'  # [degrees]
+    longitude: 'np.ndarray'  # [degrees]
+    altitude: 'np.ndarray'  # [km]
+    candidates: int  # objects propagated after the orbital-element pre-filter
+    
+    def __len__(self) -> int:
+        return len(self.object_ids)
+
+
+def format_precise_timestamp(moment: datetime) -> str:
+    """Formats UTC datetime as ISO-8601 with millisecond resolution"""
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
 # ===========================================================================================
 # DATABASE MODELS - SQLAlchemy
 # ===========================================================================================
 
+def _is_memory_database(url: str) -> bool:
+    """Checks whether the URL points to a private in-memory SQLite database"""
+    return url in ("sqlite://", "sqlite:///:memory:")
+
+
+def uses_memory_database() -> bool:
+    """
+    True for the in-memory default, whose sessions all share one connection
+    
+    Transactions of concurrent sessions interleave on it, so work running
+    outside the request (background jobs) must not write to it.
+    """
+    return _is_memory_database(DATABASE_URL)
+
+
+def _create_database_engine(url: str):
+    """Creates the engine - one shared connection in memory, a pool for file databases"""
+    if _is_memory_database(url):
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+    
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_pre_ping=True)
+    
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite_connection(dbapi_connection, _connection_record):
+        """WAL lets readers in other workers proceed while one worker writes"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+    
+    return engine
+
+
 # Database engine
-db_engine = create_engine(
-    "sqlite:///:memory:",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool
-)
+db_engine = _create_database_engine(DATABASE_URL)
 
 SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
 Base = declarative_base()
 
 
+def _new_row_revision(_current_revision: Optional[str]) -> str:
+    """Random revision - unlike a counter, never repeats when a deleted ID is reused"""
+    return uuid.uuid4().hex
+
+
 class OrbitDBModel(Base):
     """Database model for orbits"""
     __tablename__ = "orb_catalog"
@@ -166,9 +549,16 @@ class OrbitDBModel(Base):
     altitude_km = Column(Float, nullable=False)
     inclination_angle = Column(Float, nullable=False)
     ascending_node = Column(Float, nullable=False)
+    eccentricity = Column(Float, nullable=False, default=0.0)
+    argument_of_perigee = Column(Float, nullable=False, default=0.0)
+    drag_term = Column(Float, nullable=False, default=0.0)
+    row_revision = Column(String(32), nullable=False)
     
     # Relationships
     associated_objects = relationship("ObjectDBModel", back_populates="orbit_ref")
+    
+    # Every ORM update sets a new revision (ETags) and fails on concurrent modification
+    __mapper_args__ = {"version_id_col": row_revision, "version_id_generator": _new_row_revision}
 
 
 class ObjectDBModel(Base):
@@ -183,17 +573,299 @@ class ObjectDBModel(Base):
     starting_lon_position = Column(Float, nullable=False)
     associated_orbit_id = Column(Integer, ForeignKey("orb_catalog.record_id"), nullable=False)
     creation_timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+    row_revision = Column(String(32), nullable=False)
     
     # Relationships
     orbit_ref = relationship("OrbitDBModel", back_populates="associated_objects")
+    
+    # Active-catalog loads filter by state; the orbit column serves the join and per-orbit filters
+    __table_args__ = (Index("ix_obj_catalog_state_orbit", "operational_state", "associated_orbit_id"),)
+    __mapper_args__ = {"version_id_col": row_revision, "version_id_generator": _new_row_revision}
+
+
+class GroundStationDBModel(Base):
+    """Database model for ground stations"""
+    __tablename__ = "ground_stations"
+    
+    record_id = Column(Integer, primary_key=True, index=True)
+    station_name = Column(String(100), unique=True, nullable=False, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    altitude_km = Column(Float, nullable=False, default=0.0)
+    min_elevation = Column(Float, nullable=False, default=DEFAULT_MIN_ELEVATION)
+
+
+class ProximityJobDBModel(Base):
+    """Database model for background proximity scans"""
+    __tablename__ = "proximity_jobs"
+    
+    record_id = Column(Integer, primary_key=True, index=True)
+    job_status = Column(String(20), nullable=False, default=JobStatus.QUEUED.value, index=True)
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    precision = Column(String(20), nullable=False)
+    steps_done = Column(Integer, nullable=False, default=0)
+    steps_total = Column(Integer, nullable=False, default=0)
+    error_message = Column(String(500), nullable=True)
+    creation_timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+    heartbeat_timestamp = Column(DateTime, nullable=True)
+    finished_timestamp = Column(DateTime, nullable=True)
+    
+    # Relationships
+    found_events = relationship(
+        "ProximityJobEventDBModel", back_populates="job_ref", cascade="all, delete-orphan"
+    )
+
+
+class ProximityJobEventDBModel(Base):
+    """Database model for encounters found by a proximity job"""
+    __tablename__ = "proximity_job_events"
+    
+    record_id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("proximity_jobs.record_id"), nullable=False, index=True)
+    object_id_a = Column(Integer, nullable=False)
+    object_id_b = Column(Integer, nullable=False)
+    closest_approach = Column(DateTime, nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    altitude_km = Column(Float, nullable=False)
+    min_distance = Column(Float, nullable=False)
+    
+    # Relationships
+    job_ref = relationship("ProximityJobDBModel", back_populates="found_events")
+    
+    @classmethod
+    def from_event(cls, job_id: int, event: SpaceEvent):
+        """Conversion from domain dataclass (datetimes stored as naive UTC)"""
+        def naive(moment: datetime) -> datetime:
+            return moment.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        return cls(
+            job_id=job_id,
+            object_id_a=event.object_id_a,
+            object_id_b=event.object_id_b,
+            closest_approach=naive(event.time_moment),
+            start_time=naive(event.start_time or event.time_moment),
+            end_time=naive(event.end_time or event.time_moment),
+            latitude=event.location.latitude,
+            longitude=event.location.longitude,
+            altitude_km=event.location.altitude_asl,
+            min_distance=event.min_distance
+        )
+    
+    def to_event(self) -> SpaceEvent:
+        """Conversion back to domain dataclass"""
+        def aware(moment: datetime) -> datetime:
+            return moment.replace(tzinfo=timezone.utc)
+        
+        return SpaceEvent(
+            object_id_a=self.object_id_a,
+            object_id_b=self.object_id_b,
+            time_moment=aware(self.closest_approach),
+            location=GeodeticCoordinates(self.latitude, self.longitude, self.altitude_km),
+            min_distance=self.min_distance,
+            start_time=aware(self.start_time),
+            end_time=aware(self.end_time)
+        )
+
+
+class CatalogRevisionDBModel(Base):
+    """Single-row counter bumped on every catalog write, shared by all workers"""
+    __tablename__ = "catalog_revision"
+    
+    record_id = Column(Integer, primary_key=True)
+    revision = Column(Integer, nullable=False, default=0)
+
+
+class CatalogChangeDBModel(Base):
+    """Change feed: one row per created, updated or deleted catalog entity"""
+    __tablename__ = "catalog_changes"
+    # AUTOINCREMENT - cursors must never be reused, even if old changes are deleted
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    record_id = Column(Integer, primary_key=True)  # the cursor
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)
+    row_revision = Column(String(32), nullable=True)  # revision written (none for deletes)
+    change_timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+CATALOG_MODELS = (OrbitDBModel, ObjectDBModel)
+
+# Entities reported by the change feed, by the name used in the API
+CHANGE_FEED_ENTITIES = {
+    OrbitDBModel: "orbit",
+    ObjectDBModel: "satellite",
+    GroundStationDBModel: "ground_station",
+}
+
+
+@event.listens_for(SessionFactory, "before_flush")
+def _bump_catalog_revision(session, _flush_context, _instances):
+    """Increments the catalog revision in the same transaction as the catalog write"""
+    pending = itertools.chain(session.new, session.dirty, session.deleted)
+    
+    if not any(
+        isinstance(instance, CATALOG_MODELS) and
+        (instance not in session.dirty or session.is_modified(instance))
+        for instance in pending
+    ):
+        return
+    
+    revision_table = CatalogRevisionDBModel.__table__
+    session.connection().execute(
+        revision_table.update()
+        .where(revision_table.c.record_id == CATALOG_REVISION_ROW_ID)
+        .values(revision=revision_table.c.revision + 1)
+    )
+
+
+@event.listens_for(SessionFactory, "after_flush")
+def _record_catalog_changes(session, _flush_context):
+    """
+    Appends change-feed rows in the same transaction as the write
+    
+    After (not before) the flush, so new rows already have their IDs and
+    revisions; session.new/dirty/deleted still describe what was flushed.
+    """
+    entity_order = list(CHANGE_FEED_ENTITIES)
+    changes = []
+    
+    for operation, instances in (("create", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        written = [
+            instance for instance in instances
+            if type(instance) in CHANGE_FEED_ENTITIES and (operation != "update" or session.is_modified(instance))
+        ]
+        # Orbits are created before and deleted after the satellites referencing them
+        written.sort(
+            key=lambda instance: (entity_order.index(type(instance)), instance.record_id),
+            reverse=operation == "delete"
+        )
+        changes.extend(
+            {
+                "entity_type": CHANGE_FEED_ENTITIES[type(instance)],
+                "entity_id": instance.record_id,
+                "operation": operation,
+                "row_revision": None if operation == "delete" else getattr(instance, "row_revision", None),
+                "change_timestamp": datetime.utcnow(),
+            }
+            for instance in written
+        )
+    
+    if changes:
+        session.connection().execute(CatalogChangeDBModel.__table__.insert(), changes)
 
 
-# Create tables
-Base.metadata.create_all(bind=db_engine)
+def read_catalog_revision(session) -> int:
+    """Reads the shared catalog revision - a single primary key lookup"""
+    revision = session.execute(
+        select(CatalogRevisionDBModel.revision)
+        .where(CatalogRevisionDBModel.record_id == CATALOG_REVISION_ROW_ID)
+    ).scalar()
+    return revision or 0
 
 
-def get_db_session():
-    """Dependency injection for database session"""
+_database_lock = threading.Lock()
+_database_ready = False
+
+
+def init_database():
+    """
+    Creates tables and the revision row; safe to run from several workers at once
+    
+    Runs once per process - at application startup, or on the first session
+    when the app is used without its lifespan (scripts, test clients).
+    """
+    global _database_ready
+    if _database_ready:
+        return
+    
+    with _database_lock:
+        if not _database_ready:
+            _create_schema()
+            _database_ready = True
+
+
+def _create_schema():
+    try:
+        Base.metadata.create_all(bind=db_engine)
+    except OperationalError:
+        # Another worker created the tables between the existence check and CREATE
+        Base.metadata.create_all(bind=db_engine)
+    
+    # create_all skips columns and indexes of tables that already exist (databases from older versions)
+    _add_missing_columns()
+    for index in ObjectDBModel.__table__.indexes:
+        try:
+            index.create(bind=db_engine, checkfirst=True)
+        except OperationalError:
+            pass  # created by another worker meanwhile
+    
+    session = SessionFactory()
+    try:
+        if session.get(CatalogRevisionDBModel, CATALOG_REVISION_ROW_ID) is None:
+            session.add(CatalogRevisionDBModel(record_id=CATALOG_REVISION_ROW_ID, revision=0))
+            session.commit()
+    except IntegrityError:
+        session.rollback()
+    finally:
+        session.close()
+
+
+def _add_missing_columns():
+    """
+    Adds columns introduced after a database file was created
+    
+    A column with a default is added NOT NULL with it; others are added nullable
+    and, for row revisions (the ORM version column), filled with random values.
+    """
+    inspector = inspect(db_engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            
+            definition = column.type.compile(dialect=db_engine.dialect)
+            if column.default is not None and column.default.is_scalar:
+                default = literal(column.default.arg).compile(
+                    dialect=db_engine.dialect, compile_kwargs={"literal_binds": True}
+                )
+                definition += f" NOT NULL DEFAULT {default}"
+            try:
+                with db_engine.begin() as connection:
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {definition}"))
+            except OperationalError:
+                pass  # added by another worker meanwhile
+            
+            if column.name == "row_revision":
+                with db_engine.begin() as connection:
+                    connection.execute(text(
+                        f"UPDATE {table.name} SET row_revision = lower(hex(randomblob(16))) "
+                        f"WHERE row_revision IS NULL"
+                    ))
+            log.info(f"Added column {table.name}.{column.name} to an older database")
+
+
+async def get_db_session():
+    """
+    Dependency injection for database session
+    
+    Async because the endpoints are: they run their queries on the event loop,
+    one request at a time, which the shared in-memory connection relies on. A
+    sync dependency is closed in the thread pool, and scheduling that needs the
+    loop. Once the connection pool was exhausted, an endpoint blocked the loop
+    waiting for a connection that only such a pending close would return, until
+    the pool timeout (30 s). Opening does no I/O (the first query checks out the
+    connection); closing rolls back and returns it on the loop that used it.
+    """
+    init_database()
     session = SessionFactory()
     try:
         yield session
@@ -211,10 +883,24 @@ class OrbitInputSchema(BaseModel):
     altitude: float = Field(..., gt=MINIMUM_ORBIT_ALTITUDE, le=MAXIMUM_ORBIT_ALTITUDE)
     inclination: float = Field(..., ge=0, le=180)
     raan: float = Field(..., ge=0, lt=360)
+    eccentricity: float = Field(0.0, ge=0, lt=1)
+    arg_perigee: float = Field(0.0, ge=0, lt=360)
     
     class Config:
         """Pydantic schema configuration"""
         populate_by_name = True
+    
+    @root_validator(skip_on_failure=True)
+    @classmethod
+    def validate_perigee(cls, values):
+        """Validates that an eccentric orbit does not dip below minimum altitude"""
+        semi_major_axis = EARTH_BASE_RADIUS + values['altitude']
+        perigee_altitude = semi_major_axis * (1 - values['eccentricity']) - EARTH_BASE_RADIUS
+        
+        if perigee_altitude < MINIMUM_ORBIT_ALTITUDE:
+            raise ValueError('Perigee altitude below minimum orbit altitude')
+        
+        return values
 
 
 class OrbitOutputSchema(BaseModel):
@@ -224,6 +910,8 @@ class OrbitOutputSchema(BaseModel):
     altitude: float
     inclination: float
     node: float
+    eccentricity: float = 0.0
+    arg_perigee: float = 0.0
     
     class Config:
         """Pydantic schema configuration"""
@@ -238,7 +926,9 @@ class OrbitOutputSchema(BaseModel):
             name=model.orbit_identifier,
             altitude=model.altitude_km,
             inclination=model.inclination_angle,
-            node=model.ascending_node
+            node=model.ascending_node,
+            eccentricity=model.eccentricity or 0.0,
+            arg_perigee=model.argument_of_perigee or 0.0
         )
 
 
@@ -306,6 +996,57 @@ class ObjectOutputSchema(BaseModel):
         )
 
 
+class TLEImportResultSchema(BaseModel):
+    """Summary of a two-line element catalog import"""
+    created: int = Field(description="Number of new objects added to catalog")
+    updated: int = Field(description="Number of existing objects refreshed with newer elements")
+    errors: List[str] = Field(default_factory=list, description="Rejected element sets")
+
+
+class GroundStationInputSchema(BaseModel):
+    """Input schema for ground station"""
+    name: str = Field(..., min_length=1, max_length=100)
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    altitude: float = Field(0.0, ge=-0.5, le=10)
+    min_elevation: float = Field(DEFAULT_MIN_ELEVATION, ge=0, lt=90)
+    
+    class Config:
+        """Pydantic schema configuration"""
+        populate_by_name = True
+
+
+class GroundStationOutputSchema(BaseModel):
+    """Output schema for ground station"""
+    id: int
+    name: str
+    latitude: float
+    longitude: float
+    altitude: float
+    min_elevation: float
+    
+    class Config:
+        """Pydantic schema configuration"""
+        from_attributes = True
+    
+    @classmethod
+    def from_model(cls, model: GroundStationDBModel):
+        """Conversion from DB model"""
+        return cls(
+            id=model.record_id,
+            name=model.station_name,
+            latitude=model.latitude,
+            longitude=model.longitude,
+            altitude=model.altitude_km,
+            min_elevation=model.min_elevation
+        )
+
+
+class GroundStationListSchema(BaseModel):
+    """List of ground stations"""
+    stations: List[GroundStationOutputSchema]
+
+
 class PositionOutputSchema(BaseModel):
     """Schema for object position"""
     latitude: float
@@ -313,6 +1054,66 @@ class PositionOutputSchema(BaseModel):
     altitude: float
 
 
+class TrackPointSchema(BaseModel):
+    """One sample of a satellite track"""
+    time: str
+    latitude: float
+    longitude: float
+    altitude: float
+
+
+class TrackSchema(BaseModel):
+    """Positions of one satellite on a time grid"""
+    satellite_id: int
+    source: str = Field(description="archive (precomputed ephemeris) or propagated")
+    points: List[TrackPointSchema]
+
+
+class CatalogChangeSchema(BaseModel):
+    """One entry of the catalog change feed"""
+    cursor: int
+    entity: str = Field(description="orbit, satellite or ground_station")
+    id: int
+    operation: str = Field(description="create, update or delete")
+    revision: Optional[str] = Field(None, description="Row revision written (none for deletes and ground stations)")
+    time: str
+    data: Optional[Union[OrbitOutputSchema, ObjectOutputSchema, GroundStationOutputSchema]] = Field(
+        None, description="Current state of the entity; null once it is deleted"
+    )
+
+
+class CatalogChangeListSchema(BaseModel):
+    """Page of the change feed"""
+    changes: List[CatalogChangeSchema]
+    next_cursor: int = Field(description="Pass as since= to continue")
+    has_more: bool
+
+
+class OverheadPositionSchema(BaseModel):
+    """Position of one object found by the overhead query"""
+    id: int
+    latitude: float
+    longitude: float
+    altitude: float
+
+
+class OverheadListSchema(BaseModel):
+    """Objects inside a geographic box at one moment"""
+    timestamp: str
+    satellites: List[OverheadPositionSchema]
+    candidates: int = Field(description="Active objects propagated after the inclination pre-filter")
+    total: int = Field(description="Active objects in the catalog")
+
+
+class PositionSubscriptionSchema(BaseModel):
+    """Message sent by a /ws/positions client to change its subscription"""
+    action: str = Field("subscribe", pattern="^(subscribe|unsubscribe|replace)$")
+    ids: List[int] = Field(default_factory=list, max_length=STREAM_MAX_OBJECTS)
+    interval: Optional[float] = Field(
+        None, ge=STREAM_TICK_SECONDS, le=STREAM_MAX_INTERVAL, description="Update interval [s]"
+    )
+
+
 class OrbitListSchema(BaseModel):
     """List of orbits with pagination metadata"""
     orbits: List[OrbitOutputSchema]
@@ -329,15 +1130,172 @@ class ObjectListSchema(BaseModel):
     limit: int
 
 
+class EclipseWindowSchema(BaseModel):
+    """Schema for one eclipse (Earth shadow) window"""
+    entry: str = Field(description="Shadow entry time (ISO-8601)")
+    exit: str = Field(description="Shadow exit time (ISO-8601)")
+    duration: float = Field(description="Eclipse duration in seconds")
+    
+    @classmethod
+    def from_window(cls, window: EclipseWindow):
+        """Conversion from domain dataclass"""
+        return cls(
+            entry=format_precise_timestamp(window.entry_time),
+            exit=format_precise_timestamp(window.exit_time),
+            duration=round(window.duration, 3)
+        )
+
+
+class SatelliteEclipsesSchema(BaseModel):
+    """Eclipse windows of one satellite"""
+    satellite_id: int
+    eclipses: List[EclipseWindowSchema]
+
+
+class EclipseListSchema(BaseModel):
+    """Eclipse windows of many satellites"""
+    satellites: List[SatelliteEclipsesSchema]
+
+
+class PassWindowSchema(BaseModel):
+    """Schema for one ground station pass"""
+    aos: str = Field(description="Acquisition of signal - rises above elevation mask (ISO-8601)")
+    los: str = Field(description="Loss of signal - sets below elevation mask (ISO-8601)")
+    culmination: str = Field(description="Moment of maximum elevation (ISO-8601)")
+    max_elevation: float = Field(description="Maximum elevation in degrees")
+    duration: float = Field(description="Pass duration in seconds")
+    
+    @classmethod
+    def from_window(cls, window: PassWindow):
+        """Conversion from domain dataclass"""
+        return cls(
+            aos=format_precise_timestamp(window.aos_time),
+            los=format_precise_timestamp(window.los_time),
+            culmination=format_precise_timestamp(window.culmination_time),
+            max_elevation=round(window.max_elevation, 3),
+            duration=round(window.duration, 3)
+        )
+
+
+class SatellitePassesSchema(BaseModel):
+    """Passes of one satellite over one ground station"""
+    satellite_id: int
+    station_id: int
+    passes: List[PassWindowSchema]
+
+
+class PassListSchema(BaseModel):
+    """Passes of many satellites over one ground station"""
+    station_id: int
+    satellites: List[SatellitePassesSchema]
+
+
 class CollisionEventSchema(BaseModel):
     """Schema for satellite proximity event (orbit encounter)"""
     satellite1: int = Field(description="ID of first object in proximity")
     satellite2: int = Field(description="ID of second object in proximity")
-    time: str = Field(description="Moment of proximity (ISO-8601)")
-    position: PositionOutputSchema = Field(description="Coordinates of proximity location")
-    distance: float = Field(description="Distance between objects in kilometers")
+    time: str = Field(description="Moment of closest approach (ISO-8601)")
+    start: str = Field(description="First analysis step within threshold (ISO-8601)")
+    end: str = Field(description="Last analysis step within threshold (ISO-8601)")
+    position: PositionOutputSchema = Field(description="Coordinates at closest approach")
+    distance: float = Field(description="Minimum distance between objects in kilometers")
+    
+    @classmethod
+    def from_event(cls, event: SpaceEvent):
+        """Conversion from domain dataclass"""
+        exported = event.to_dict()
+        return cls(
+            satellite1=exported["satellite1"],
+            satellite2=exported["satellite2"],
+            time=exported["time"],
+            start=exported["start"],
+            end=exported["end"],
+            position=PositionOutputSchema(**exported["position"]),
+            distance=exported["distance"]
+        )
 
 
 class CollisionListSchema(BaseModel):
     """List of detected proximities between satellites"""
     proximities: List[CollisionEventSchema] = Field(description="Detected orbit proximities")
+    precision: str = Field("", description="Time step actually used (may be downgraded)")
+    complete: bool = Field(True, description="False if the scan stopped at its deadline")
+    analyzed_until: Optional[str] = Field(None, description="Last analyzed moment (ISO-8601)")
+    timings: Optional[Dict[str, float]] = Field(None, description="Per-stage durations [ms] (debug=true)")
+
+
+class ProximityJobInputSchema(BaseModel):
+    """Input schema for a background proximity scan"""
+    start_date: str = Field(..., description="Analysis start date (ISO-8601)")
+    end_date: str = Field(..., description="Analysis end date (ISO-8601)")
+    precision: str = Field("1m", description="Time precision (e.g. 1m, 5s, 1h)")
+
+
+class ProximityJobOutputSchema(BaseModel):
+    """Status and progress of a background proximity scan"""
+    id: int
+    status: str
+    start_date: str
+    end_date: str
+    precision: str
+    steps_done: int
+    steps_total: int
+    progress: float = Field(description="Fraction of time steps analyzed, 0..1")
+    created: str
+    finished: Optional[str] = None
+    error: Optional[str] = None
+    
+    class Config:
+        """Pydantic schema configuration"""
+        from_attributes = True
+    
+    @classmethod
+    def from_model(cls, model: ProximityJobDBModel):
+        """Conversion from DB model"""
+        def iso(moment: Optional[datetime]) -> Optional[str]:
+            return moment.strftime("%Y-%m-%dT%H:%M:%SZ") if moment else None
+        
+        return cls(
+            id=model.record_id,
+            status=model.job_status,
+            start_date=iso(model.start_date),
+            end_date=iso(model.end_date),
+            precision=model.precision,
+            steps_done=model.steps_done,
+            steps_total=model.steps_total,
+            progress=round(model.steps_done / model.steps_total, 4) if model.steps_total else 0.0,
+            created=iso(model.creation_timestamp),
+            finished=iso(model.finished_timestamp),
+            error=model.error_message
+        )
+
+
+class ProximityJobResultsSchema(BaseModel):
+    """Page of encounters found by a background proximity scan"""
+    job_id: int
+    status: str
+    proximities: List[CollisionEventSchema]
+    total: int
+    skip: int
+    limit: int
+
+
+class PoseInputSchema(BaseModel):
+    """Input of the docking pose regressor"""
+    features: List[float] = Field(..., description="Image embedding followed by relative position (x, y, z)")
+
+
+class QuaternionSchema(BaseModel):
+    """Orientation quaternion (as predicted - not normalized)"""
+    x: float
+    y: float
+    z: float
+    w: float
+
+
+class PoseOutputSchema(BaseModel):
+    """Predicted target and chaser orientation"""
+    target: QuaternionSchema
+    chaser: QuaternionSchema
+    batch_size: int = Field(description="Requests served by the same forward pass")
+    batch_ms: float = Field(description="Duration of that forward pass")
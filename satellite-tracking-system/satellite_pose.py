@@ -0,0 +1,226 @@
+"""
+Pose - Docking pose regressor served with micro-batching
+
+Satellite Orbit Tracking System - Services Layer
+Author: Aleks Czarnecki
+
+Contains:
+- Runtimes for the exported regressor of docking_vision_system/train_model.ipynb
+  (TorchScript via torch, ONNX via onnxruntime - both optional)
+- Micro-batcher: concurrent requests arriving within a short window share one
+  forward pass, run off the event loop on a single inference thread
+"""
+
+import asyncio
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from satellite_models import (
+    POSE_MODEL_PATH,
+    POSE_BATCH_WINDOW_MS,
+    POSE_MAX_BATCH,
+    POSE_THREADS,
+)
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+log = logging.getLogger(__name__)
+
+POSE_OUTPUTS = 8  # target x, y, z, w, chaser x, y, z, w
+
+
+class PoseModelUnavailableError(RuntimeError):
+    """Pose model not configured or its runtime not installed"""
+
+
+# ===========================================================================================
+# MODEL RUNTIMES
+# ===========================================================================================
+
+class PoseModel(ABC):
+    """Exported regressor: (n, input_dim) float32 -> (n, 8) float32"""
+    
+    input_dim: int
+    
+    @abstractmethod
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        pass
+
+
+class TorchScriptPoseModel(PoseModel):
+    """Model saved with torch.jit.save (eval mode: BatchNorm uses running statistics)"""
+    
+    def __init__(self, path: str, input_dim: int, threads: int):
+        if torch is None:
+            raise PoseModelUnavailableError("TorchScript pose model needs torch: pip install torch")
+        torch.set_num_threads(threads)
+        self.module = torch.jit.load(path, map_location="cpu").eval()
+        self.input_dim = input_dim
+    
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            return self.module(torch.from_numpy(features)).numpy()
+
+
+class OnnxPoseModel(PoseModel):
+    """Model exported with torch.onnx.export (dynamic batch axis)"""
+    
+    def __init__(self, path: str, input_dim: int, threads: int):
+        if onnxruntime is None:
+            raise PoseModelUnavailableError("ONNX pose model needs onnxruntime: pip install onnxruntime")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # A symbolic feature axis (exported without example shape) falls back to the default
+        self.input_dim = model_input.shape[1] if isinstance(model_input.shape[1], int) else input_dim
+    
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: features})[0]
+
+
+def load_pose_model(path: str = POSE_MODEL_PATH, threads: int = POSE_THREADS, input_dim: int = 771) -> PoseModel:
+    """
+    Opens an exported regressor by file extension
+    
+    Args:
+        input_dim: Features per request for TorchScript files, which do not
+            record it (ViT-Base embedding 768 + relative position 3);
+            ONNX files normally carry their own
+    
+    Raises:
+        PoseModelUnavailableError: no path configured, unknown format or runtime missing
+    """
+    if not path:
+        raise PoseModelUnavailableError("Pose model not configured (set SATELLITE_POSE_MODEL)")
+    if not os.path.exists(path):
+        raise PoseModelUnavailableError(f"Pose model file {path} does not exist")
+    
+    threads = threads or os.cpu_count() or 1
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".onnx":
+        return OnnxPoseModel(path, input_dim, threads)
+    if extension in (".pt", ".pth", ".ts"):
+        return TorchScriptPoseModel(path, input_dim, threads)
+    raise PoseModelUnavailableError(f"Unknown pose model format: {extension}. Available: .onnx, .pt, .pth, .ts")
+
+
+# ===========================================================================================
+# MICRO-BATCHING
+# ===========================================================================================
+
+@dataclass
+class PoseBatch:
+    """Forward pass shared by a group of requests"""
+    size: int
+    waited: float  # s - from the first request of the batch to the forward pass
+    duration: float  # s - forward pass
+
+
+class PoseBatcher:
+    """
+    Coalesces concurrent predictions into micro-batches
+    
+    The first request of a batch waits up to `window` seconds (or until
+    `max_batch` requests are queued); the batch then runs on the inference
+    thread while new requests queue for the next one. Under load batches fill
+    up and one pass serves many requests; a lone request pays at most the window.
+    """
+    
+    def __init__(
+        self,
+        model: PoseModel,
+        window: float = POSE_BATCH_WINDOW_MS / 1000.0,
+        max_batch: int = POSE_MAX_BATCH
+    ):
+        self.model = model
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[np.ndarray, asyncio.Future, float]] = []  # features, result, queued at
+        self._full: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pose")
+        self.batches = 0
+        self.requests = 0
+    
+    @property
+    def input_dim(self) -> int:
+        return self.model.input_dim
+    
+    async def predict(self, features: np.ndarray) -> Tuple[np.ndarray, PoseBatch]:
+        """8 outputs for one feature vector, and the batch that computed them"""
+        loop = asyncio.get_running_loop()
+        if self._full is None:
+            self._full = asyncio.Event()
+        
+        future = loop.create_future()
+        self._pending.append((features, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        
+        if self._runner is None or self._runner.done():
+            self._runner = loop.create_task(self._run())
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if len(self._pending) < self.max_batch:
+                self._full.clear()
+                remaining = self.window - (time.perf_counter() - self._pending[0][2])
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(self._full.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            started = time.perf_counter()
+            waited = started - batch[0][2]
+            try:
+                inputs = np.stack([features for features, _, _ in batch]).astype(np.float32, copy=False)
+                outputs = await loop.run_in_executor(self._executor, self.model.predict, inputs)
+                if outputs.shape != (len(batch), POSE_OUTPUTS):
+                    raise ValueError(f"Pose model returned {outputs.shape}, expected ({len(batch)}, {POSE_OUTPUTS})")
+            except Exception as error:
+                log.exception("Pose inference failed for a batch of %d", len(batch))
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            
+            info = PoseBatch(size=len(batch), waited=waited, duration=time.perf_counter() - started)
+            self.batches += 1
+            self.requests += len(batch)
+            log.debug("Pose batch of %d in %.1f ms", info.size, info.duration * 1000.0)
+            
+            for (_, future, _), row in zip(batch, outputs):
+                if not future.done():  # client may have disconnected
+                    future.set_result((row, info))
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def create_pose_batcher() -> PoseBatcher:
+    """Batcher around the configured model (raises PoseModelUnavailableError)"""
+    model = load_pose_model()
+    log.info("Pose model %s loaded (%d inputs)", POSE_MODEL_PATH, model.input_dim)
+    return PoseBatcher(model)
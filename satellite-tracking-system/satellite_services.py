@@ -5,31 +5,58 @@ Satellite Orbit Tracking System - Services Layer
 Author: Aleks Czarnecki
 
 Contains:
-- Orbital propagators (Keplerian)
+- Orbital propagators (Keplerian circular, eccentric with J2 drift, SGP4)
+- Vectorized batch propagation over whole catalogs (NumPy)
+- Two-line element set (TLE) parsing and catalog import
 - Data validators (ISO8601, range)
 - Satellite position calculation algorithms
+- Catalog snapshot cache (invalidated by the shared catalog revision)
+- Per-request stage timers (Server-Timing)
 - Patterns: Strategy Pattern, Service Layer
 """
 
 import logging
 import math
+import threading
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import dateutil.parser
-from sqlalchemy.orm import Session
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+try:
+    from sgp4.api import Satrec, SatrecArray, WGS72
+except ImportError:  # optional dependency - only needed by SGP4Propagator
+    Satrec = SatrecArray = WGS72 = None
 
 from satellite_models import (
     GeodeticCoordinates,
     OrbitalParameters,
+    OrbitalElementsBatch,
+    TwoLineElementSet,
     SpaceEvent,
     OrbitDBModel,
     ObjectDBModel,
     PrecisionCategory,
     EARTH_BASE_RADIUS,
+    EARTH_EQUATORIAL_RADIUS,
+    EARTH_GRAV_PARAMETER,
+    EARTH_J2,
+    KEPLER_SOLVER_ITERATIONS,
+    MINIMUM_ORBIT_ALTITUDE,
+    MAXIMUM_ORBIT_ALTITUDE,
+    SECONDS_PER_DAY,
     PROXIMITY_TOLERANCE,
-    NUMERICAL_EPSILON
+    NUMERICAL_EPSILON,
+    db_engine,
+    read_catalog_revision
 )
 
 log = logging.getLogger(__name__)
@@ -51,6 +78,10 @@ class ResourceNotFoundError(RuntimeError):
     """Resource not found in database"""
 
 
+class TLEValidationError(ValueError):
+    """Malformed two-line element set"""
+
+
 
 # ===========================================================================================
 # ABSTRACT CLASSES - Strategy Pattern
@@ -59,6 +90,56 @@ class ResourceNotFoundError(RuntimeError):
 class OrbitPropagator(ABC):
     """Abstract base class for orbit propagators"""
     
+    @abstractmethod
+    def propagate_position(
+        self,
+        parameters: OrbitalParameters,
+        time_from_epoch: float,
+        initial_longitude: float
+    ) -> GeodeticCoordinates:
+        """Propagates position of one object by time elapsed from its epoch"""
+    
+    def propagate_batch(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Propagates many objects over a time grid
+        
+        Args:
+            elements: Orbital elements of N objects
+            moments: T time moments shared by all objects, or an (N, T) array
+                with separate moments per object [POSIX seconds]
+        
+        Returns:
+            Latitude, longitude [degrees] and altitude [km] arrays of shape (N, T),
+            NaN where the moment precedes the object's epoch
+        """
+        time_from_epoch = self._time_from_epoch(elements, moments)
+        latitude, longitude, altitude = (np.full(time_from_epoch.shape, np.nan) for _ in range(3))
+        
+        for row in range(len(elements)):
+            parameters = OrbitalParameters(
+                semi_major_axis=float(elements.semi_major_axis[row]),
+                inclination_deg=float(elements.inclination_deg[row]),
+                ascending_node=float(elements.ascending_node[row]),
+                eccentricity=float(elements.eccentricity[row]),
+                argument_of_perigee=float(elements.argument_of_perigee[row]),
+                drag_term=float(elements.drag_term[row])
+            )
+            for column, elapsed in enumerate(time_from_epoch[row]):
+                if elapsed < 0:
+                    continue
+                position = self.propagate_position(
+                    parameters, float(elapsed), float(elements.initial_longitude[row])
+                )
+                latitude[row, column] = position.latitude
+                longitude[row, column] = position.longitude
+                altitude[row, column] = position.altitude_asl
+        
+        return latitude, longitude, altitude
+    
     @abstractmethod
     def calculate_position(
         self,
@@ -70,6 +151,44 @@ class OrbitPropagator(ABC):
         """Calculates object position at given moment"""
 
 
+    def propagate_batch_cartesian(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Propagates many objects over a time grid to Cartesian coordinates
+        
+        Same frame as GeodeticCoordinates.to_cartesian; (N, T) arrays of x, y, z [km],
+        NaN before the object's epoch. Strategies override this to skip the
+        round trip through latitude/longitude.
+        """
+        return geodetic_to_cartesian(*self.propagate_batch(elements, moments))
+    
+    def co_orbital_separation(
+        self,
+        parameters: OrbitalParameters,
+        initial_longitude_a: float,
+        epoch_a: datetime,
+        initial_longitude_b: float,
+        epoch_b: datetime
+    ) -> Optional[float]:
+        """
+        Distance [km] between two objects sharing one orbit, if the model keeps it constant
+        
+        Returns None when the separation varies in time; callers then step through it.
+        """
+        return None
+    
+    @staticmethod
+    def _time_from_epoch(elements: OrbitalElementsBatch, moments: np.ndarray) -> np.ndarray:
+        """Broadcasts moments against object epochs into an (N, T) array of elapsed seconds"""
+        moments = np.asarray(moments, dtype=np.float64)
+        if moments.ndim == 1:
+            moments = moments[None, :]
+        return moments - elements.epoch[:, None]
+
+
 class TimeValidator(ABC):
     """Abstract base class for time validators"""
     
@@ -87,7 +206,7 @@ class KeplerianPropagator(OrbitPropagator):
     
     def __init__(self):
         self.name = "Keplerian Circular Propagator"
-        log.debug(f"Initialized propagator: {self.name}")
+        log.debug("Initialized propagator: %s", self.name)
     
     def propagate_position(
         self,
@@ -137,9 +256,104 @@ class KeplerianPropagator(OrbitPropagator):
             altitude_asl=altitude
         )
     
+    def _orbit_plane_grid(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Radius, argument of latitude, inclination, RAAN (radians) and elapsed time grids"""
+        time_from_epoch = self._time_from_epoch(elements, moments)
+        
+        angular_omega = np.sqrt(EARTH_GRAV_PARAMETER / elements.semi_major_axis**3)[:, None]
+        argument_of_latitude = np.mod(
+            angular_omega * time_from_epoch + np.radians(elements.initial_longitude)[:, None],
+            2 * math.pi
+        )
+        
+        return (
+            elements.semi_major_axis[:, None],
+            argument_of_latitude,
+            np.radians(elements.inclination_deg)[:, None],
+            np.radians(elements.ascending_node)[:, None],
+            time_from_epoch
+        )
+    
+    def _orbit_plane_to_geodetic(self, radius, argument_of_latitude, inclination_rad, raan_rad):
+        """Converts orbit-plane position to latitude, longitude [degrees] and altitude [km]"""
+        sin_u = np.sin(argument_of_latitude)
+        
+        latitude = np.degrees(np.arcsin(np.sin(inclination_rad) * sin_u))
+        longitude = self._normalize_longitude(np.degrees(
+            np.arctan2(np.cos(inclination_rad) * sin_u, np.cos(argument_of_latitude)) + raan_rad
+        ))
+        altitude = np.broadcast_to(radius - EARTH_BASE_RADIUS, latitude.shape).copy()
+        
+        return latitude, longitude, altitude
+    
     @staticmethod
-    def _normalize_longitude(longitude_deg: float) -> float:
-        """Normalizes longitude to range [-180, 180]"""
+    def _orbit_plane_to_cartesian(radius, argument_of_latitude, inclination_rad, raan_rad):
+        """Converts orbit-plane position to x, y, z [km] without trigonometry on the result"""
+        cos_u, sin_u = np.cos(argument_of_latitude), np.sin(argument_of_latitude)
+        cos_raan, sin_raan = np.cos(raan_rad), np.sin(raan_rad)
+        cos_incl = np.cos(inclination_rad)
+        
+        x = radius * (cos_u * cos_raan - sin_u * cos_incl * sin_raan)
+        y = radius * (cos_u * sin_raan + sin_u * cos_incl * cos_raan)
+        z = radius * sin_u * np.sin(inclination_rad)
+        
+        return x, y, z
+    
+    @staticmethod
+    def _mask_before_epoch(time_from_epoch: np.ndarray, *arrays) -> Tuple[np.ndarray, ...]:
+        """Sets NaN where the object was not yet introduced"""
+        not_introduced = time_from_epoch < 0
+        for array in arrays:
+            array[not_introduced] = np.nan
+        return arrays
+    
+    def propagate_batch(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized circular propagation of the whole batch over the time grid"""
+        *orbit_plane, time_from_epoch = self._orbit_plane_grid(elements, moments)
+        return self._mask_before_epoch(time_from_epoch, *self._orbit_plane_to_geodetic(*orbit_plane))
+    
+    def propagate_batch_cartesian(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized circular propagation straight to Cartesian coordinates"""
+        *orbit_plane, time_from_epoch = self._orbit_plane_grid(elements, moments)
+        return self._mask_before_epoch(time_from_epoch, *self._orbit_plane_to_cartesian(*orbit_plane))
+    
+    def co_orbital_separation(
+        self,
+        parameters: OrbitalParameters,
+        initial_longitude_a: float,
+        epoch_a: datetime,
+        initial_longitude_b: float,
+        epoch_b: datetime
+    ) -> Optional[float]:
+        """
+        Constant chord between two objects on one circular orbit
+        
+        Both move at the same angular velocity, so their phase difference
+        du = lon_a - lon_b - omega * (epoch_a - epoch_b) never changes
+        and the distance is 2 * r * |sin(du / 2)|.
+        """
+        angular_omega = parameters.calculate_angular_velocity()
+        phase_difference = (
+            math.radians(initial_longitude_a - initial_longitude_b)
+            - angular_omega * (epoch_a - epoch_b).total_seconds()
+        )
+        return abs(2 * parameters.semi_major_axis * math.sin(phase_difference / 2))
+    
+    @staticmethod
+    def _normalize_longitude(longitude_deg):
+        """Normalizes longitude (scalar or array) to range [-180, 180]"""
         normalized = ((longitude_deg + 180) % 360) - 180
         return normalized
     
@@ -181,6 +395,341 @@ class KeplerianPropagator(OrbitPropagator):
 
 
 
+class EccentricJ2Propagator(KeplerianPropagator):
+    """
+    Orbit propagator for elliptical orbits with secular J2 drift
+    
+    Solves Kepler's equation with a fixed number of Newton iterations, so
+    whole catalogs are propagated as NumPy arrays without per-object branching.
+    RAAN, argument of perigee and mean anomaly drift at their secular J2 rates.
+    The initial longitude is interpreted as the initial argument of latitude,
+    so a circular orbit without J2 reproduces KeplerianPropagator exactly.
+    """
+    
+    def __init__(self, include_j2: bool = True, solver_iterations: int = KEPLER_SOLVER_ITERATIONS):
+        self.name = "Eccentric J2 Propagator"
+        self.include_j2 = include_j2
+        self.solver_iterations = solver_iterations
+        log.debug("Initialized propagator: %s", self.name)
+    
+    def co_orbital_separation(
+        self,
+        parameters: OrbitalParameters,
+        initial_longitude_a: float,
+        epoch_a: datetime,
+        initial_longitude_b: float,
+        epoch_b: datetime
+    ) -> Optional[float]:
+        """Closed form only where the model reduces to the circular Keplerian one"""
+        if self.include_j2 or parameters.eccentricity > 0:
+            return None
+        return super().co_orbital_separation(
+            parameters, initial_longitude_a, epoch_a, initial_longitude_b, epoch_b
+        )
+    
+    def _propagate_elements(
+        self,
+        semi_major_axis,
+        eccentricity,
+        inclination_deg,
+        raan_deg,
+        perigee_deg,
+        initial_longitude_deg,
+        time_from_epoch
+    ):
+        """Propagates broadcastable element arrays; returns radius, argument of latitude, inclination, RAAN"""
+        inclination_rad = np.radians(inclination_deg)
+        perigee_rad = np.radians(perigee_deg)
+        mean_motion = np.sqrt(EARTH_GRAV_PARAMETER / semi_major_axis**3)
+        
+        raan_rad = np.radians(raan_deg)
+        mean_anomaly_rate = mean_motion
+        
+        if self.include_j2:
+            semi_latus_rectum = semi_major_axis * (1 - eccentricity**2)
+            j2_factor = EARTH_J2 * (EARTH_EQUATORIAL_RADIUS / semi_latus_rectum)**2
+            cos_incl_sq = np.cos(inclination_rad)**2
+            
+            raan_rad = raan_rad - 1.5 * mean_motion * j2_factor * np.cos(inclination_rad) * time_from_epoch
+            perigee_drift = 0.75 * mean_motion * j2_factor * (5 * cos_incl_sq - 1)
+            mean_anomaly_rate = mean_motion * (
+                1 + 0.75 * j2_factor * np.sqrt(1 - eccentricity**2) * (3 * cos_incl_sq - 1)
+            )
+        else:
+            perigee_drift = 0.0
+        
+        initial_mean_anomaly = np.radians(initial_longitude_deg) - perigee_rad
+        mean_anomaly = initial_mean_anomaly + mean_anomaly_rate * time_from_epoch
+        perigee_rad = perigee_rad + perigee_drift * time_from_epoch
+        
+        eccentric_anomaly = solve_kepler_equation(mean_anomaly, eccentricity, self.solver_iterations)
+        true_anomaly = 2 * np.arctan2(
+            np.sqrt(1 + eccentricity) * np.sin(eccentric_anomaly / 2),
+            np.sqrt(1 - eccentricity) * np.cos(eccentric_anomaly / 2)
+        )
+        radius = semi_major_axis * (1 - eccentricity * np.cos(eccentric_anomaly))
+        
+        # Argument of latitude measured from the ascending node
+        argument_of_latitude = np.mod(perigee_rad + true_anomaly, 2 * math.pi)
+        
+        return radius, argument_of_latitude, inclination_rad, raan_rad
+    
+    def propagate_position(
+        self,
+        parameters: OrbitalParameters,
+        time_from_epoch: float,
+        initial_longitude: float
+    ) -> GeodeticCoordinates:
+        """Position propagation of one object on an elliptical orbit"""
+        latitude, longitude, altitude = self._orbit_plane_to_geodetic(*self._propagate_elements(
+            parameters.semi_major_axis,
+            parameters.eccentricity,
+            parameters.inclination_deg,
+            parameters.ascending_node,
+            parameters.argument_of_perigee,
+            initial_longitude,
+            time_from_epoch
+        ))
+        
+        return GeodeticCoordinates(
+            latitude=float(latitude),
+            longitude=float(longitude),
+            altitude_asl=float(altitude)
+        )
+    
+    def propagate_batch(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized elliptical propagation of the whole batch over the time grid"""
+        orbit_plane, time_from_epoch = self._orbit_plane_batch(elements, moments)
+        return self._mask_before_epoch(time_from_epoch, *self._orbit_plane_to_geodetic(*orbit_plane))
+    
+    def propagate_batch_cartesian(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized elliptical propagation straight to Cartesian coordinates"""
+        orbit_plane, time_from_epoch = self._orbit_plane_batch(elements, moments)
+        return self._mask_before_epoch(time_from_epoch, *self._orbit_plane_to_cartesian(*orbit_plane))
+    
+    def _orbit_plane_batch(self, elements: OrbitalElementsBatch, moments: np.ndarray):
+        time_from_epoch = self._time_from_epoch(elements, moments)
+        orbit_plane = self._propagate_elements(
+            elements.semi_major_axis[:, None],
+            elements.eccentricity[:, None],
+            elements.inclination_deg[:, None],
+            elements.ascending_node[:, None],
+            elements.argument_of_perigee[:, None],
+            elements.initial_longitude[:, None],
+            time_from_epoch
+        )
+        return orbit_plane, time_from_epoch
+
+
+# SGP4 epochs are counted in days from 1949 December 31 00:00 UT
+SGP4_EPOCH_ORIGIN = datetime(1949, 12, 31, tzinfo=timezone.utc).timestamp()
+SGP4_J2000_EPOCH = datetime(2000, 1, 1, 12, tzinfo=timezone.utc).timestamp()
+POSIX_EPOCH_JULIAN_DATE = 2440587.5
+
+
+@lru_cache(maxsize=65536)
+def _build_satrec(
+    semi_major_axis: float,
+    eccentricity: float,
+    inclination_deg: float,
+    raan_deg: float,
+    perigee_deg: float,
+    initial_longitude_deg: float,
+    drag_term: float,
+    epoch: float
+):
+    """Initializes (and caches) an SGP4 record from catalog elements"""
+    mean_motion = math.sqrt(EARTH_GRAV_PARAMETER / semi_major_axis**3) * 60.0  # rad/min
+    
+    satrec = Satrec()
+    satrec.sgp4init(
+        WGS72,
+        'i',
+        0,
+        (epoch - SGP4_EPOCH_ORIGIN) / SECONDS_PER_DAY,
+        drag_term,
+        0.0,
+        0.0,
+        eccentricity,
+        math.radians(perigee_deg),
+        math.radians(inclination_deg),
+        math.radians(initial_longitude_deg - perigee_deg),
+        mean_motion,
+        math.radians(raan_deg)
+    )
+    return satrec
+
+
+class SGP4Propagator(OrbitPropagator):
+    """
+    Orbit propagator using the SGP4 model (requires the optional sgp4 package)
+    
+    Catalog elements are treated as SGP4 mean elements with the object's
+    introduction date as epoch - objects imported from TLEs reproduce the
+    original element set. Positions are reported in the same inertial
+    spherical convention as KeplerianPropagator (TEME right ascension as
+    longitude), so the proximity engine can compare them directly.
+    """
+    
+    def __init__(self):
+        if Satrec is None:
+            raise OrbitalCalculationError("SGP4 propagator requires the 'sgp4' package")
+        self.name = "SGP4 Propagator"
+        log.debug("Initialized propagator: %s", self.name)
+    
+    @staticmethod
+    def _satrec_for(parameters: OrbitalParameters, initial_longitude: float, epoch: float):
+        return _build_satrec(
+            parameters.semi_major_axis,
+            parameters.eccentricity,
+            parameters.inclination_deg,
+            parameters.ascending_node,
+            parameters.argument_of_perigee,
+            initial_longitude,
+            parameters.drag_term,
+            epoch
+        )
+    
+    @staticmethod
+    def _to_spherical(x, y, z):
+        """Converts TEME Cartesian coordinates to latitude, longitude, altitude"""
+        radius = np.sqrt(x**2 + y**2 + z**2)
+        latitude = np.degrees(np.arcsin(z / radius))
+        longitude = ((np.degrees(np.arctan2(y, x)) + 180) % 360) - 180
+        return latitude, longitude, radius - EARTH_BASE_RADIUS
+    
+    def _propagate_single(self, satrec, time_from_epoch: float) -> GeodeticCoordinates:
+        error_code, position, _velocity = satrec.sgp4_tsince(time_from_epoch / 60.0)
+        if error_code != 0:
+            raise OrbitalCalculationError(f"SGP4 propagation failed with error code {error_code}")
+        
+        latitude, longitude, altitude = self._to_spherical(*position)
+        return GeodeticCoordinates(
+            latitude=float(latitude),
+            longitude=float(longitude),
+            altitude_asl=float(altitude)
+        )
+    
+    def propagate_position(
+        self,
+        parameters: OrbitalParameters,
+        time_from_epoch: float,
+        initial_longitude: float
+    ) -> GeodeticCoordinates:
+        """
+        Position propagation without an absolute epoch
+        
+        Deep-space (period >= 225 min) lunar/solar terms depend on the epoch;
+        J2000 is assumed here. calculate_position and propagate_batch use the
+        object's real epoch.
+        """
+        satrec = self._satrec_for(parameters, initial_longitude, SGP4_J2000_EPOCH)
+        return self._propagate_single(satrec, time_from_epoch)
+    
+    def calculate_position(
+        self,
+        orbit_params: OrbitalParameters,
+        moment: datetime,
+        initial_longitude: float,
+        start_date: datetime
+    ) -> GeodeticCoordinates:
+        """Calculates object position at given moment"""
+        if not isinstance(moment, datetime) or not isinstance(start_date, datetime):
+            raise OrbitalCalculationError("Invalid date format")
+        
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=timezone.utc)
+        
+        delta_t = (moment - start_date).total_seconds()
+        if delta_t < 0:
+            raise OrbitalCalculationError(
+                "Calculation moment cannot be earlier than start date"
+            )
+        
+        satrec = self._satrec_for(orbit_params, initial_longitude, start_date.timestamp())
+        return self._propagate_single(satrec, delta_t)
+    
+    def propagate_batch_cartesian(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Propagates the whole batch over the time grid with the vectorized SatrecArray (TEME)"""
+        moments = np.asarray(moments, dtype=np.float64)
+        
+        satrecs = [
+            _build_satrec(
+                float(elements.semi_major_axis[row]),
+                float(elements.eccentricity[row]),
+                float(elements.inclination_deg[row]),
+                float(elements.ascending_node[row]),
+                float(elements.argument_of_perigee[row]),
+                float(elements.initial_longitude[row]),
+                float(elements.drag_term[row]),
+                float(elements.epoch[row])
+            )
+            for row in range(len(elements))
+        ]
+        
+        # Julian date split into whole and fractional days to keep sub-ms precision
+        julian_days = moments / SECONDS_PER_DAY + POSIX_EPOCH_JULIAN_DATE
+        whole_days = np.floor(julian_days)
+        fractions = julian_days - whole_days
+        
+        if moments.ndim == 1:
+            error_codes, positions, _velocities = SatrecArray(satrecs).sgp4(whole_days, fractions)
+        else:
+            # Separate moments per object - propagate row by row
+            error_codes = np.empty(moments.shape, dtype=np.uint8)
+            positions = np.empty(moments.shape + (3,))
+            for row, satrec in enumerate(satrecs):
+                error_codes[row], positions[row], _velocities = satrec.sgp4_array(
+                    whole_days[row], fractions[row]
+                )
+        
+        invalid = (error_codes != 0) | (self._time_from_epoch(elements, moments) < 0)
+        positions[invalid] = np.nan
+        
+        return positions[..., 0], positions[..., 1], positions[..., 2]
+    
+    def propagate_batch(
+        self,
+        elements: OrbitalElementsBatch,
+        moments: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Propagates the whole batch over the time grid with the vectorized SatrecArray"""
+        # NaN coordinates propagate to NaN latitude/longitude/altitude
+        return self._to_spherical(*self.propagate_batch_cartesian(elements, moments))
+
+
+# Propagation strategies selectable by name (SATELLITE_PROPAGATOR)
+PROPAGATORS: Dict[str, Callable[[], OrbitPropagator]] = {
+    "keplerian": KeplerianPropagator,
+    "eccentric-j2": EccentricJ2Propagator,
+    "sgp4": SGP4Propagator,
+}
+
+
+def create_propagator(name: str) -> OrbitPropagator:
+    """Creates propagation strategy by its registered name"""
+    try:
+        return PROPAGATORS[name]()
+    except KeyError:
+        raise OrbitalCalculationError(
+            f"Unknown propagator: {name}. Available: {', '.join(sorted(PROPAGATORS))}"
+        ) from None
+
+
 # ===========================================================================================
 # VALIDATORS
 # ===========================================================================================
@@ -206,6 +755,359 @@ class ISO8601Validator(TimeValidator):
             ) from e
 
 
+# ===========================================================================================
+# TLE INGESTION
+# ===========================================================================================
+
+class TwoLineElementParser:
+    """Fixed-column parser for NORAD two-line element sets (2-line or 3-line format)"""
+    
+    LINE_LENGTH = 69
+    
+    @staticmethod
+    def _checksum(line: str) -> int:
+        """Modulo-10 checksum: digits count by value, minus signs count as 1"""
+        total = 0
+        for char in line[:68]:
+            if char.isdigit():
+                total += ord(char) - 48
+            elif char == '-':
+                total += 1
+        return total % 10
+    
+    @staticmethod
+    def _exponent_field(field: str) -> float:
+        """Parses TLE implied-decimal exponent notation, e.g. ' 10270-3' -> 0.10270e-3"""
+        field = field.strip()
+        if not field or field.strip('0+-') == '':
+            return 0.0
+        sign = -1.0 if field[0] == '-' else 1.0
+        field = field.lstrip('+-')
+        return sign * float(f"0.{field[:-2]}e{field[-2:]}")
+    
+    def parse(self, line1: str, line2: str, name: Optional[str] = None) -> TwoLineElementSet:
+        """Parses one element set"""
+        line1, line2 = line1.rstrip(), line2.rstrip()
+        
+        if len(line1) < self.LINE_LENGTH or len(line2) < self.LINE_LENGTH:
+            raise TLEValidationError("Element set lines must be 69 characters long")
+        if line1[0] != '1' or line2[0] != '2':
+            raise TLEValidationError("Element set lines must start with '1' and '2'")
+        if self._checksum(line1) != int(line1[68]) or self._checksum(line2) != int(line2[68]):
+            raise TLEValidationError("Element set checksum mismatch")
+        if line1[2:7] != line2[2:7]:
+            raise TLEValidationError("Catalog numbers of both lines differ")
+        
+        try:
+            return TwoLineElementSet(
+                catalog_number=int(line1[2:7]),
+                name=name.strip() if name else None,
+                epoch=TwoLineElementSet.epoch_from_fields(int(line1[18:20]), float(line1[20:32])),
+                inclination_deg=float(line2[8:16]),
+                ascending_node=float(line2[17:25]),
+                eccentricity=float(f"0.{line2[26:33].strip()}"),
+                argument_of_perigee=float(line2[34:42]),
+                mean_anomaly=float(line2[43:51]),
+                mean_motion=float(line2[52:63]),
+                drag_term=self._exponent_field(line1[53:61])
+            )
+        except ValueError as e:
+            raise TLEValidationError(f"Invalid numeric field: {e}") from e
+    
+    def parse_catalog(self, text: str) -> Tuple[List[TwoLineElementSet], List[str]]:
+        """
+        Parses a catalog file, collecting errors instead of stopping at the first
+        
+        Returns:
+            Parsed element sets and error messages of rejected entries
+        """
+        lines = [line for line in text.splitlines() if line.strip()]
+        element_sets, errors = [], []
+        
+        index = 0
+        while index < len(lines):
+            name = None
+            if not lines[index].startswith('1 '):
+                name = lines[index]
+                index += 1
+            
+            if index + 1 >= len(lines):
+                errors.append(f"Line {index + 1}: incomplete element set")
+                break
+            
+            try:
+                element_sets.append(self.parse(lines[index], lines[index + 1], name))
+            except TLEValidationError as e:
+                errors.append(f"Line {index + 1}: {e}")
+            index += 2
+        
+        return element_sets, errors
+
+
+class TLECatalogImporter:
+    """Imports element sets into the catalog - one orbit and one object per catalog number"""
+    
+    QUERY_CHUNK_SIZE = 500
+    
+    def __init__(self, parser: Optional[TwoLineElementParser] = None):
+        self.parser = parser or TwoLineElementParser()
+    
+    @staticmethod
+    def orbit_identifier(element_set: TwoLineElementSet) -> str:
+        return f"TLE-{element_set.catalog_number:05d}"
+    
+    @staticmethod
+    def object_name(element_set: TwoLineElementSet) -> str:
+        return element_set.name or f"NORAD-{element_set.catalog_number:05d}"
+    
+    @staticmethod
+    def _validate_range(element_set: TwoLineElementSet) -> Optional[str]:
+        altitude = element_set.semi_major_axis - EARTH_BASE_RADIUS
+        perigee = element_set.semi_major_axis * (1 - element_set.eccentricity) - EARTH_BASE_RADIUS
+        
+        if not (MINIMUM_ORBIT_ALTITUDE < altitude <= MAXIMUM_ORBIT_ALTITUDE):
+            return f"altitude {altitude:.1f} km outside supported range"
+        if perigee < MINIMUM_ORBIT_ALTITUDE:
+            return f"perigee {perigee:.1f} km below minimum orbit altitude"
+        return None
+    
+    def _chunks(self, values: List[str]) -> Iterable[List[str]]:
+        for start in range(0, len(values), self.QUERY_CHUNK_SIZE):
+            yield values[start:start + self.QUERY_CHUNK_SIZE]
+    
+    @staticmethod
+    def _apply_elements(orbit: OrbitDBModel, obj: ObjectDBModel, element_set: TwoLineElementSet):
+        orbit.altitude_km = element_set.semi_major_axis - EARTH_BASE_RADIUS
+        orbit.inclination_angle = element_set.inclination_deg
+        orbit.ascending_node = element_set.ascending_node
+        orbit.eccentricity = element_set.eccentricity
+        orbit.argument_of_perigee = element_set.argument_of_perigee
+        orbit.drag_term = element_set.drag_term
+        
+        # Epoch of the element set becomes the object's reference date
+        obj.introduction_date = element_set.epoch
+        obj.starting_lon_position = element_set.initial_argument_of_latitude
+    
+    def import_catalog(
+        self,
+        db_session: Session,
+        text: str,
+        operator: str
+    ) -> Tuple[int, int, List[str]]:
+        """
+        Parses and upserts a TLE catalog in one transaction
+        
+        Returns:
+            Number of created objects, updated objects and error messages
+        """
+        element_sets, errors = self.parser.parse_catalog(text)
+        
+        # Newest entry wins when a catalog number repeats
+        latest: Dict[str, TwoLineElementSet] = {}
+        for element_set in element_sets:
+            message = self._validate_range(element_set)
+            if message:
+                errors.append(f"Catalog number {element_set.catalog_number}: {message}")
+                continue
+            identifier = self.orbit_identifier(element_set)
+            if identifier not in latest or latest[identifier].epoch <= element_set.epoch:
+                latest[identifier] = element_set
+        
+        identifiers = list(latest)
+        existing_orbits: Dict[str, OrbitDBModel] = {}
+        for chunk in self._chunks(identifiers):
+            for orbit in db_session.query(OrbitDBModel).options(
+                selectinload(OrbitDBModel.associated_objects)
+            ).filter(OrbitDBModel.orbit_identifier.in_(chunk)):
+                existing_orbits[orbit.orbit_identifier] = orbit
+        
+        candidate_names = [self.object_name(latest[identifier]) for identifier in identifiers]
+        taken_names = set()
+        for chunk in self._chunks(candidate_names):
+            taken_names.update(
+                name for (name,) in db_session.query(ObjectDBModel.object_name).filter(
+                    ObjectDBModel.object_name.in_(chunk)
+                )
+            )
+        
+        created = updated = 0
+        for identifier, element_set in latest.items():
+            orbit = existing_orbits.get(identifier)
+            
+            if orbit is not None and orbit.associated_objects:
+                self._apply_elements(orbit, orbit.associated_objects[0], element_set)
+                updated += 1
+                continue
+            
+            name = self.object_name(element_set)
+            if name in taken_names:
+                errors.append(f"Catalog number {element_set.catalog_number}: object name '{name}' already exists")
+                continue
+            taken_names.add(name)
+            
+            if orbit is None:
+                orbit = OrbitDBModel(orbit_identifier=identifier)
+            obj = ObjectDBModel(
+                object_name=name,
+                system_operator=operator,
+                operational_state="active",
+                orbit_ref=orbit
+            )
+            self._apply_elements(orbit, obj, element_set)
+            db_session.add(obj)
+            created += 1
+        
+        db_session.commit()
+        log.info(f"TLE import: created={created} updated={updated} rejected={len(errors)}")
+        
+        return created, updated, errors
+
+
+# ===========================================================================================
+# CATALOG CACHE
+# ===========================================================================================
+
+class CatalogSnapshotCache:
+    """
+    Per-process cache of values derived from the catalog
+    
+    Every worker keeps its own entries. Before serving an entry the shared
+    catalog revision is read (one primary key lookup); when another worker
+    has written to the catalog the revision differs and all entries are dropped.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revision: Optional[int] = None
+        self._entries: Dict[str, Any] = {}
+    
+    def get_or_build(
+        self,
+        db_session: Session,
+        key: str,
+        builder: Callable[[Session], Any]
+    ) -> Any:
+        """Returns cached value for current catalog revision, building it on a miss"""
+        revision = read_catalog_revision(db_session)
+        
+        with self._lock:
+            if revision != self._revision:
+                self._entries.clear()
+                self._revision = revision
+            if key in self._entries:
+                return self._entries[key]
+        
+        value = builder(db_session)
+        
+        with self._lock:
+            # Do not store values built against a revision that is already stale
+            if revision == self._revision:
+                self._entries[key] = value
+        
+        log.debug("Rebuilt catalog snapshot '%s' at revision %s", key, revision)
+        return value
+    
+    def invalidate(self):
+        """Drops all entries regardless of revision"""
+        with self._lock:
+            self._entries.clear()
+            self._revision = None
+
+
+# ===========================================================================================
+# STAGE TIMING
+# ===========================================================================================
+
+_current_stage_timer: ContextVar[Optional['StageTimer']] = ContextVar("stage_timer", default=None)
+
+
+class StageTimer:
+    """
+    Wall-clock time spent in named stages of one request
+    
+    Activated per request by the Server-Timing middleware; code on the request
+    path records into it through timed_stage/record_stage, which do nothing
+    outside a request (background jobs, scripts).
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.queries = 0  # database round trips (SQL statements executed)
+    
+    def add(self, name: str, seconds: float):
+        """Adds time to a stage (stages entered repeatedly accumulate)"""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+    
+    def elapsed(self) -> float:
+        """Seconds since the timer was created"""
+        return time.perf_counter() - self.started
+    
+    def as_milliseconds(self) -> Dict[str, float]:
+        """Stage durations plus the total so far [ms]"""
+        timings = {name: round(seconds * 1000.0, 3) for name, seconds in self.durations.items()}
+        timings["total"] = round(self.elapsed() * 1000.0, 3)
+        return timings
+    
+    def header_value(self) -> str:
+        """
+        Server-Timing header value, e.g. "db;dur=1.2, propagate;dur=30.5, total;dur=33.0, queries;desc=1"
+        
+        "other" is the time outside all stages (routing, response validation, JSON encoding);
+        "queries" the number of SQL statements the request executed.
+        """
+        total = self.elapsed()
+        entries = [(name, seconds) for name, seconds in self.durations.items()]
+        entries.append(("other", max(total - sum(self.durations.values()), 0.0)))
+        entries.append(("total", total))
+        return ", ".join(
+            [f"{name};dur={seconds * 1000.0:.1f}" for name, seconds in entries] + [f"queries;desc={self.queries}"]
+        )
+    
+    def activate(self):
+        """Makes this the current request's timer; returns a token for deactivate()"""
+        return _current_stage_timer.set(self)
+    
+    @staticmethod
+    def deactivate(token):
+        _current_stage_timer.reset(token)
+
+
+def current_stage_timer() -> Optional[StageTimer]:
+    """Timer of the request being handled, None outside requests"""
+    return _current_stage_timer.get()
+
+
+@event.listens_for(db_engine, "before_cursor_execute")
+def _count_query(_connection, _cursor, _statement, _parameters, _context, _executemany):
+    """Counts SQL statements of the current request (for the Server-Timing query count)"""
+    timer = _current_stage_timer.get()
+    if timer is not None:
+        timer.queries += 1
+
+
+def record_stage(name: str, seconds: float):
+    """Adds measured time to a stage of the current request, if any"""
+    timer = _current_stage_timer.get()
+    if timer is not None:
+        timer.add(name, seconds)
+
+
+@contextmanager
+def timed_stage(name: str):
+    """Times the enclosed block as a stage of the current request"""
+    timer = _current_stage_timer.get()
+    if timer is None:
+        yield
+        return
+    
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
+
+
 # ===========================================================================================
 # BUSINESS SERVICES
 # ===========================================================================================
@@ -229,25 +1131,25 @@ class OrbitalCalculationService:
         # Time validation
         moment = self.validator.validate_timestamp(timestamp)
         
-        # Retrieve object and its orbit
-        obj = db_session.query(ObjectDBModel).filter_by(record_id=object_id).first()
+        # Retrieve object and its orbit in one query
+        obj = (
+            db_session.query(ObjectDBModel)
+            .options(joinedload(ObjectDBModel.orbit_ref))
+            .filter_by(record_id=object_id)
+            .first()
+        )
         if not obj:
             raise ResourceNotFoundError(f"Object with ID {object_id} does not exist")
         
-        orbit = db_session.query(OrbitDBModel).filter_by(record_id=obj.associated_orbit_id).first()
-        if not orbit:
-            raise ResourceNotFoundError(f"Orbit of object {object_id} does not exist")
-        
-        # Convert to orbital parameters
-        params = OrbitalParameters(
-            semi_major_axis=orbit.altitude_km + EARTH_BASE_RADIUS,
-            inclination_deg=orbit.inclination_angle,
-            ascending_node=orbit.ascending_node
-        )
+        return self.position_of(obj, moment)
+    
+    def position_of(self, obj: ObjectDBModel, moment: datetime) -> GeodeticCoordinates:
+        """Calculates position of an object loaded together with its orbit (no queries)"""
+        if obj.orbit_ref is None:
+            raise ResourceNotFoundError(f"Orbit of object {obj.record_id} does not exist")
         
-        # Calculate position
         return self.propagator.calculate_position(
-            orbit_params=params,
+            orbit_params=OrbitalParameters.from_model(obj.orbit_ref),
             moment=moment,
             initial_longitude=obj.starting_lon_position,
             start_date=obj.introduction_date
@@ -274,8 +1176,14 @@ class EventAnalysisService:
     ) -> List[SpaceEvent]:
         """Detects potential collisions between objects"""
         
-        # Get all active objects
-        query = db_session.query(ObjectDBModel).filter_by(operational_state="active")
+        moment = self.calculation_service.validator.validate_timestamp(timestamp)
+        
+        # Get all active objects with their orbits - one query (state/orbit index)
+        query = (
+            db_session.query(ObjectDBModel)
+            .options(joinedload(ObjectDBModel.orbit_ref))
+            .filter_by(operational_state="active")
+        )
         
         if orbit_filter:
             query = query.filter_by(associated_orbit_id=orbit_filter)
@@ -289,14 +1197,10 @@ class EventAnalysisService:
         positions = {}
         for obj in objects:
             try:
-                pos = self.calculation_service.calculate_object_position(
-                    db_session=db_session,
-                    object_id=obj.record_id,
-                    timestamp=timestamp
-                )
+                pos = self.calculation_service.position_of(obj, moment)
                 positions[obj.record_id] = pos
             except Exception as e:
-                log.warning(f"Error calculating position for object {obj.record_id}: {e}")
+                log.warning("Error calculating position for object %s: %s", obj.record_id, e)
                 continue
         
         # Detect proximities
@@ -316,8 +1220,6 @@ class EventAnalysisService:
                     avg_lon = (pos_a.longitude + pos_b.longitude) / 2
                     avg_alt = (pos_a.altitude_asl + pos_b.altitude_asl) / 2
                     
-                    moment = self.calculation_service.validator.validate_timestamp(timestamp)
-                    
                     event = SpaceEvent(
                         object_id_a=id_a,
                         object_id_b=id_b,
@@ -360,6 +1262,46 @@ def calculate_time_difference(
     return conversions[category](seconds)
 
 
+def geodetic_to_cartesian(latitude, longitude, altitude):
+    """Vectorized GeodeticCoordinates.to_cartesian for arrays in degrees/km"""
+    total_radius = EARTH_BASE_RADIUS + altitude
+    lat_rad = np.radians(latitude)
+    lon_rad = np.radians(longitude)
+    
+    x = total_radius * np.cos(lat_rad) * np.cos(lon_rad)
+    y = total_radius * np.cos(lat_rad) * np.sin(lon_rad)
+    z = total_radius * np.sin(lat_rad)
+    
+    return x, y, z
+
+
+def solve_kepler_equation(
+    mean_anomaly,
+    eccentricity,
+    iterations: int = KEPLER_SOLVER_ITERATIONS
+):
+    """
+    Solves Kepler's equation M = E - e*sin(E) for the eccentric anomaly
+    
+    Runs a fixed number of Newton steps on whole arrays at once - no
+    per-element convergence test, so the cost is identical for every object.
+    """
+    mean_anomaly = np.mod(mean_anomaly, 2 * math.pi)
+    
+    # Circular orbits only: eccentric anomaly equals mean anomaly
+    if not np.any(eccentricity):
+        return mean_anomaly
+    
+    eccentric_anomaly = np.where(eccentricity < 0.8, mean_anomaly, math.pi)
+    
+    for _ in range(iterations):
+        eccentric_anomaly = eccentric_anomaly - (
+            eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly
+        ) / (1 - eccentricity * np.cos(eccentric_anomaly))
+    
+    return eccentric_anomaly
+
+
 def validate_orbital_parameters(altitude: float, inclination: float, raan: float) -> bool:
     """Validates orbital parameters"""
     from satellite_models import MINIMUM_ORBIT_ALTITUDE, MAXIMUM_ORBIT_ALTITUDE
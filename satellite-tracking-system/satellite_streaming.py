@@ -0,0 +1,213 @@
+"""
+Streaming - Live position updates for WebSocket clients
+
+Satellite Orbit Tracking System - Services Layer
+Author: Aleks Czarnecki
+
+Contains:
+- Subscriptions: each client follows a set of object IDs at its own interval
+- One tick loop propagating the union of due objects in a single batch
+- Fan-out of per-object results encoded once; slow clients skip frames instead of blocking
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from satellite_models import (
+    OrbitalElementsBatch,
+    format_precise_timestamp,
+    STREAM_TICK_SECONDS,
+    STREAM_DEFAULT_INTERVAL,
+    STREAM_MAX_OBJECTS,
+)
+
+log = logging.getLogger(__name__)
+
+# Loads the catalog as one batch plus the row of every object ID in it
+ElementsLoader = Callable[[], Tuple[OrbitalElementsBatch, Dict[int, int]]]
+
+
+# ===========================================================================================
+# SUBSCRIBER
+# ===========================================================================================
+
+class PositionSubscriber:
+    """One connected client: followed objects, update interval and a one-frame mailbox"""
+    
+    def __init__(self, interval_ticks: int, first_tick: int):
+        self.object_ids: Set[int] = set()
+        self.interval_ticks = interval_ticks
+        self.next_tick = first_tick
+        self.frames: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.dropped_frames = 0
+    
+    def offer(self, frame: str):
+        """Replaces an unsent frame - a client that cannot keep up gets the newest positions"""
+        if self.frames.full():
+            self.frames.get_nowait()
+            self.dropped_frames += 1
+        self.frames.put_nowait(frame)
+
+
+# ===========================================================================================
+# HUB
+# ===========================================================================================
+
+class PositionStreamHub:
+    """
+    Shared position computation for all streaming clients
+    
+    Every tick the hub collects the subscribers that are due, propagates the
+    union of their objects once (one batch call) and sends each subscriber its
+    subset. Cost per tick grows with the number of distinct objects, not clients.
+    The tick loop runs only while somebody is connected.
+    """
+    
+    def __init__(self, propagator, elements_loader: ElementsLoader, tick_seconds: float = STREAM_TICK_SECONDS):
+        """
+        Args:
+            propagator: OrbitPropagator used for batch propagation
+            elements_loader: Returns the catalog batch and object ID -> row mapping
+            tick_seconds: Base tick; subscriber intervals are whole multiples of it
+        """
+        self.propagator = propagator
+        self.elements_loader = elements_loader
+        self.tick_seconds = tick_seconds
+        self._subscribers: List[PositionSubscriber] = []
+        self._tick = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def connect(self) -> PositionSubscriber:
+        """Registers a client (with nothing subscribed yet) and starts ticking if idle"""
+        subscriber = PositionSubscriber(self.interval_to_ticks(STREAM_DEFAULT_INTERVAL), self._tick)
+        self._subscribers.append(subscriber)
+        
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        
+        return subscriber
+    
+    def disconnect(self, subscriber: PositionSubscriber):
+        """Removes a client; the tick loop ends after the last one"""
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+    
+    def update(
+        self,
+        subscriber: PositionSubscriber,
+        action: str,
+        object_ids: Iterable[int],
+        interval: Optional[float] = None
+    ):
+        """
+        Changes what a client follows
+        
+        Args:
+            action: "subscribe" (add IDs), "unsubscribe" (remove IDs) or "replace"
+            object_ids: Object IDs the action applies to
+            interval: New update interval [s], rounded to whole ticks
+        
+        Raises:
+            ValueError: If the client would follow more than STREAM_MAX_OBJECTS objects
+        """
+        object_ids = set(object_ids)
+        
+        if action == "subscribe":
+            followed = subscriber.object_ids | object_ids
+        elif action == "unsubscribe":
+            followed = subscriber.object_ids - object_ids
+        else:
+            followed = object_ids
+        
+        if len(followed) > STREAM_MAX_OBJECTS:
+            raise ValueError(f"At most {STREAM_MAX_OBJECTS} objects per connection")
+        
+        subscriber.object_ids = followed
+        if interval is not None:
+            subscriber.interval_ticks = self.interval_to_ticks(interval)
+        
+        # Newly followed objects are sent at the next tick, not after a full interval
+        subscriber.next_tick = min(subscriber.next_tick, self._tick)
+    
+    def interval_to_ticks(self, interval: float) -> int:
+        return max(1, round(interval / self.tick_seconds))
+    
+    async def close(self):
+        """Stops the tick loop (application shutdown)"""
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+    
+    # ---------------------------------------------------------------------------------------
+    # Tick loop
+    # ---------------------------------------------------------------------------------------
+    
+    async def _run(self):
+        """Publishes due subscribers every tick, aligned to the wall clock"""
+        next_tick_at = time.monotonic()
+        
+        while self._subscribers:
+            due = [
+                subscriber for subscriber in self._subscribers
+                if subscriber.object_ids and subscriber.next_tick <= self._tick
+            ]
+            if due:
+                try:
+                    self.publish(due, time.time())
+                except Exception:
+                    log.exception("Position stream tick failed")
+                for subscriber in due:
+                    subscriber.next_tick = self._tick + subscriber.interval_ticks
+            
+            self._tick += 1
+            next_tick_at += self.tick_seconds
+            # A tick that overran is not repeated - the schedule skips ahead
+            next_tick_at = max(next_tick_at, time.monotonic())
+            await asyncio.sleep(next_tick_at - time.monotonic())
+    
+    def publish(self, subscribers: List[PositionSubscriber], moment: float) -> int:
+        """
+        Propagates the union of the subscribers' objects once and fans it out
+        
+        Returns:
+            Number of distinct objects propagated
+        """
+        requested = set().union(*(subscriber.object_ids for subscriber in subscribers))
+        elements, rows = self.elements_loader()
+        
+        known_ids = sorted(object_id for object_id in requested if object_id in rows)
+        fragments: Dict[int, str] = {}
+        
+        if known_ids:
+            batch = elements.subset(np.fromiter((rows[i] for i in known_ids), dtype=np.int64, count=len(known_ids)))
+            latitude, longitude, altitude = self.propagator.propagate_batch(batch, np.array([moment]))
+            
+            # Encoded once per object, shared by every subscriber following it
+            for index, object_id in enumerate(known_ids):
+                if np.isnan(latitude[index, 0]):
+                    continue  # before introduction date
+                fragments[object_id] = (
+                    f'{{"id":{object_id},"latitude":{latitude[index, 0]:.6f},'
+                    f'"longitude":{longitude[index, 0]:.6f},"altitude":{altitude[index, 0]:.6f}}}'
+                )
+        
+        timestamp = format_precise_timestamp(datetime.fromtimestamp(moment, tz=timezone.utc))
+        
+        for subscriber in subscribers:
+            followed = sorted(subscriber.object_ids)
+            positions = ",".join(fragments[i] for i in followed if i in fragments)
+            unavailable = ",".join(str(i) for i in followed if i not in fragments)
+            subscriber.offer(
+                f'{{"timestamp":"{timestamp}","positions":[{positions}],"unavailable":[{unavailable}]}}'
+            )
+        
+        return len(known_ids)
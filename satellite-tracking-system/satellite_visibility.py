@@ -0,0 +1,516 @@
+"""
+Visibility - Sunlight, Earth-shadow, ground station and region geometry
+
+Satellite Orbit Tracking System - Services Layer
+Author: Aleks Czarnecki
+
+Contains:
+- Low-precision Sun direction (vectorized over time grids)
+- Cylindrical Earth-shadow test
+- Eclipse window search: coarse grid + bisection refinement
+- Ground station pass prediction: visibility pre-filter, coarse elevation
+  grid, AOS/LOS bisection and max-elevation golden-section search
+- Region query: objects inside a latitude/longitude box at one moment,
+  with an inclination pre-filter
+"""
+
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from satellite_models import (
+    EclipseWindow,
+    GroundStationDBModel,
+    OrbitalElementsBatch,
+    PassWindow,
+    RegionPositions,
+    EARTH_BASE_RADIUS,
+    SECONDS_PER_DAY,
+)
+from satellite_services import (
+    OrbitPropagator,
+    POSIX_EPOCH_JULIAN_DATE,
+)
+
+log = logging.getLogger(__name__)
+
+J2000_JULIAN_DATE = 2451545.0
+ECLIPSE_SEARCH_STEP = 60.0  # s - coarse grid step (shorter eclipses may be missed)
+ECLIPSE_TIME_TOLERANCE = 0.1  # s - bisection stops below this bracket width
+PASS_SEARCH_STEP = 60.0  # s - coarse elevation grid step (shorter passes may be missed)
+PASS_TIME_TOLERANCE = 0.1  # s - AOS/LOS/max-elevation refinement tolerance
+GRID_CELLS_PER_CHUNK = 2_000_000  # objects x steps evaluated at once (bounds memory)
+GOLDEN_RATIO_CONJUGATE = (math.sqrt(5) - 1) / 2
+
+
+# ===========================================================================================
+# GEOMETRY HELPERS
+# ===========================================================================================
+
+def sun_direction(moments: np.ndarray) -> np.ndarray:
+    """
+    Unit vector towards the Sun in the inertial frame (Astronomical Almanac
+    low-precision formula, ~0.01 degree accuracy)
+    
+    Args:
+        moments: Time moments [POSIX seconds], any shape
+    
+    Returns:
+        Array of shape moments.shape + (3,)
+    """
+    days = np.asarray(moments, dtype=np.float64) / SECONDS_PER_DAY + POSIX_EPOCH_JULIAN_DATE - J2000_JULIAN_DATE
+    
+    mean_longitude = np.radians(280.460 + 0.9856474 * days)
+    mean_anomaly = np.radians(357.528 + 0.9856003 * days)
+    ecliptic_longitude = (
+        mean_longitude
+        + np.radians(1.915) * np.sin(mean_anomaly)
+        + np.radians(0.020) * np.sin(2 * mean_anomaly)
+    )
+    obliquity = np.radians(23.439 - 0.0000004 * days)
+    
+    return np.stack((
+        np.cos(ecliptic_longitude),
+        np.cos(obliquity) * np.sin(ecliptic_longitude),
+        np.sin(obliquity) * np.sin(ecliptic_longitude)
+    ), axis=-1)
+
+
+def in_earth_shadow(x, y, z, sun: np.ndarray) -> np.ndarray:
+    """
+    Cylindrical shadow test - behind the Earth and within one Earth radius
+    of the Sun-Earth axis. Arrays broadcast against sun[..., 0..2].
+    """
+    along_sun = x * sun[..., 0] + y * sun[..., 1] + z * sun[..., 2]
+    off_axis_sq = x**2 + y**2 + z**2 - along_sun**2
+    return (along_sun < 0) & (off_axis_sq < EARTH_BASE_RADIUS**2)
+
+
+def greenwich_sidereal_angle(moments: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal angle [radians] - Earth rotation against the inertial frame"""
+    days = np.asarray(moments, dtype=np.float64) / SECONDS_PER_DAY + POSIX_EPOCH_JULIAN_DATE - J2000_JULIAN_DATE
+    return np.radians(np.mod(280.46061837 + 360.98564736629 * days, 360.0))
+
+
+def station_position(station: GroundStationDBModel, moments: np.ndarray) -> np.ndarray:
+    """
+    Inertial position of a ground station [km], shape moments.shape + (3,)
+    
+    Satellite positions are inertial, so the station is rotated with the Earth.
+    """
+    radius = EARTH_BASE_RADIUS + station.altitude_km
+    lat_rad = math.radians(station.latitude)
+    angle = math.radians(station.longitude) + greenwich_sidereal_angle(moments)
+    
+    return np.stack((
+        radius * math.cos(lat_rad) * np.cos(angle),
+        radius * math.cos(lat_rad) * np.sin(angle),
+        np.full(np.shape(angle), radius * math.sin(lat_rad))
+    ), axis=-1)
+
+
+def coverage_half_angle(altitude, min_elevation_deg: float):
+    """Earth central angle [degrees] within which an object at altitude is above min elevation"""
+    min_elevation = math.radians(min_elevation_deg)
+    ratio = EARTH_BASE_RADIUS * math.cos(min_elevation) / (EARTH_BASE_RADIUS + altitude)
+    return np.degrees(np.arccos(np.clip(ratio, -1.0, 1.0)) - min_elevation)
+
+
+def _to_datetime(moment: float) -> datetime:
+    return datetime.fromtimestamp(moment, tz=timezone.utc)
+
+
+def bisect_transitions(
+    evaluate: Callable[[np.ndarray], np.ndarray],
+    lower: np.ndarray,
+    upper: np.ndarray,
+    lower_state: np.ndarray,
+    iterations: int
+) -> np.ndarray:
+    """
+    Bisects many state changes at once
+    
+    Args:
+        evaluate: Returns boolean state for one moment per bracket
+        lower, upper: Bracket bounds [POSIX seconds]
+        lower_state: State at the lower bounds
+        iterations: Number of halvings
+    
+    Returns:
+        Refined transition moments
+    """
+    for _ in range(iterations):
+        middle = (lower + upper) / 2
+        same_as_lower = evaluate(middle) == lower_state
+        lower = np.where(same_as_lower, middle, lower)
+        upper = np.where(same_as_lower, upper, middle)
+    
+    return (lower + upper) / 2
+
+
+def iterate_windows(
+    state: np.ndarray,
+    change_rows: np.ndarray,
+    change_columns: np.ndarray,
+    transition_moments: np.ndarray,
+    start: float,
+    end: float
+) -> Iterator[Tuple[int, float, float, int, int]]:
+    """
+    Pairs refined state changes into windows where the state is True
+    
+    Yields:
+        Row, entry moment, exit moment and the first/last grid columns inside the window
+    """
+    entering = ~state[change_rows, change_columns]
+    last_column = state.shape[1] - 1
+    
+    # Changes come ordered by row, so each row's changes form one slice
+    bounds = np.searchsorted(change_rows, np.arange(state.shape[0] + 1))
+    
+    for row in range(state.shape[0]):
+        selected = slice(bounds[row], bounds[row + 1])
+        
+        entry, first_column = (start, 0) if state[row, 0] else (None, None)
+        for moment, column, is_entry in zip(
+            transition_moments[selected], change_columns[selected], entering[selected]
+        ):
+            if is_entry:
+                entry, first_column = float(moment), int(column) + 1
+            elif entry is not None:
+                yield row, entry, float(moment), first_column, int(column)
+                entry = None
+        
+        if entry is not None:
+            yield row, entry, end, first_column, last_column
+
+
+def _search_grid(start_time: datetime, end_time: datetime, step: float) -> np.ndarray:
+    start, end = start_time.timestamp(), end_time.timestamp()
+    return np.append(np.arange(start, end, step), end)
+
+
+# ===========================================================================================
+# ECLIPSE SERVICE
+# ===========================================================================================
+
+class EclipseAnalysisService:
+    """Service computing eclipse (Earth shadow) windows for whole batches of objects"""
+    
+    def __init__(
+        self,
+        propagator: OrbitPropagator,
+        search_step: float = ECLIPSE_SEARCH_STEP,
+        tolerance: float = ECLIPSE_TIME_TOLERANCE
+    ):
+        self.propagator = propagator
+        self.search_step = search_step
+        self.tolerance = tolerance
+    
+    def shadow_state(self, elements: OrbitalElementsBatch, moments: np.ndarray) -> np.ndarray:
+        """Boolean (N, T) eclipse state; moments before an object's epoch count as sunlit"""
+        x, y, z = self.propagator.propagate_batch_cartesian(elements, moments)
+        
+        sun = sun_direction(moments)
+        if sun.ndim == 2:
+            sun = sun[None, :, :]
+        
+        # NaN positions compare False, i.e. sunlit
+        return in_earth_shadow(x, y, z, sun)
+    
+    def find_eclipses(
+        self,
+        elements: OrbitalElementsBatch,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict[int, List[EclipseWindow]]:
+        """
+        Finds eclipse windows of every object in the interval
+        
+        Returns:
+            Mapping object ID -> windows ordered by entry time
+        """
+        moments = _search_grid(start_time, end_time, self.search_step)
+        iterations = max(1, math.ceil(math.log2(self.search_step / self.tolerance)))
+        
+        windows: Dict[int, List[EclipseWindow]] = {int(object_id): [] for object_id in elements.object_ids}
+        rows_per_chunk = max(1, GRID_CELLS_PER_CHUNK // len(moments))
+        
+        for chunk_start in range(0, len(elements), rows_per_chunk):
+            chunk = elements.subset(np.arange(chunk_start, min(chunk_start + rows_per_chunk, len(elements))))
+            state = self.shadow_state(chunk, moments)
+            
+            # Bracket every change of state between consecutive grid moments
+            change_rows, change_columns = np.nonzero(state[:, 1:] != state[:, :-1])
+            changing = chunk.subset(change_rows)
+            transition_moments = bisect_transitions(
+                lambda middle: self.shadow_state(changing, middle[:, None])[:, 0],
+                moments[change_columns],
+                moments[change_columns + 1],
+                state[change_rows, change_columns],
+                iterations
+            )
+            
+            for row, entry, exit_, _first, _last in iterate_windows(
+                state, change_rows, change_columns, transition_moments, moments[0], moments[-1]
+            ):
+                object_id = int(chunk.object_ids[row])
+                windows[object_id].append(
+                    EclipseWindow(object_id, _to_datetime(entry), _to_datetime(exit_))
+                )
+        
+        log.info(f"Eclipse search: {len(elements)} objects, {len(moments)} grid steps")
+        return windows
+
+
+# ===========================================================================================
+# GROUND STATION PASS SERVICE
+# ===========================================================================================
+
+class PassPredictionService:
+    """Service predicting ground station passes (AOS, LOS, maximum elevation)"""
+    
+    def __init__(
+        self,
+        propagator: OrbitPropagator,
+        search_step: float = PASS_SEARCH_STEP,
+        tolerance: float = PASS_TIME_TOLERANCE
+    ):
+        self.propagator = propagator
+        self.search_step = search_step
+        self.tolerance = tolerance
+    
+    @staticmethod
+    def can_ever_be_visible(
+        elements: OrbitalElementsBatch,
+        station: GroundStationDBModel
+    ) -> np.ndarray:
+        """
+        Cheap pre-filter on orbital elements
+        
+        The ground track never leaves the latitude band +-inclination (retrograde:
+        180 - inclination); add the coverage half-angle at apogee altitude. Objects
+        whose band cannot reach the station latitude are never visible.
+        """
+        max_track_latitude = np.minimum(elements.inclination_deg, 180.0 - elements.inclination_deg)
+        apogee_altitude = elements.semi_major_axis * (1 + elements.eccentricity) - EARTH_BASE_RADIUS
+        reach = max_track_latitude + coverage_half_angle(apogee_altitude, station.min_elevation)
+        return reach >= abs(station.latitude)
+    
+    def elevation(
+        self,
+        elements: OrbitalElementsBatch,
+        station: GroundStationDBModel,
+        moments: np.ndarray
+    ) -> np.ndarray:
+        """Elevation above station horizon [degrees], (N, T); NaN before object epoch"""
+        x, y, z = self.propagator.propagate_batch_cartesian(elements, moments)
+        site = station_position(station, moments)
+        if site.ndim == 2:
+            site = site[None, :, :]
+        
+        range_x, range_y, range_z = x - site[..., 0], y - site[..., 1], z - site[..., 2]
+        site_radius = np.sqrt(np.sum(site**2, axis=-1))
+        slant_range = np.sqrt(range_x**2 + range_y**2 + range_z**2)
+        
+        # Spherical Earth: local vertical is the station's radial direction
+        up_component = (range_x * site[..., 0] + range_y * site[..., 1] + range_z * site[..., 2]) / site_radius
+        return np.degrees(np.arcsin(up_component / slant_range))
+    
+    def _maximize_elevation(
+        self,
+        elements: OrbitalElementsBatch,
+        station: GroundStationDBModel,
+        lower: np.ndarray,
+        upper: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized golden-section search for the culmination inside each bracket"""
+        def evaluate(moments):
+            return self.elevation(elements, station, moments[:, None])[:, 0]
+        
+        inner_low = upper - GOLDEN_RATIO_CONJUGATE * (upper - lower)
+        inner_high = lower + GOLDEN_RATIO_CONJUGATE * (upper - lower)
+        value_low, value_high = evaluate(inner_low), evaluate(inner_high)
+        
+        while np.any(upper - lower > self.tolerance):
+            keep_low = value_low > value_high
+            
+            upper = np.where(keep_low, inner_high, upper)
+            lower = np.where(keep_low, lower, inner_low)
+            
+            new_inner = np.where(
+                keep_low,
+                upper - GOLDEN_RATIO_CONJUGATE * (upper - lower),
+                lower + GOLDEN_RATIO_CONJUGATE * (upper - lower)
+            )
+            new_value = evaluate(new_inner)
+            
+            # The surviving inner point is reused, only one evaluation per iteration
+            inner_low, inner_high = (
+                np.where(keep_low, new_inner, inner_high),
+                np.where(keep_low, inner_low, new_inner)
+            )
+            value_low, value_high = (
+                np.where(keep_low, new_value, value_high),
+                np.where(keep_low, value_low, new_value)
+            )
+        
+        culmination = (lower + upper) / 2
+        return culmination, evaluate(culmination)
+    
+    def find_passes(
+        self,
+        elements: OrbitalElementsBatch,
+        station: GroundStationDBModel,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict[int, List[PassWindow]]:
+        """
+        Finds passes of every object over the station in the interval
+        
+        Returns:
+            Mapping object ID -> passes ordered by AOS (empty for filtered objects)
+        """
+        passes: Dict[int, List[PassWindow]] = {int(object_id): [] for object_id in elements.object_ids}
+        
+        candidates = elements.subset(self.can_ever_be_visible(elements, station))
+        if len(candidates) == 0:
+            return passes
+        
+        moments = _search_grid(start_time, end_time, self.search_step)
+        iterations = max(1, math.ceil(math.log2(self.search_step / self.tolerance)))
+        rows_per_chunk = max(1, GRID_CELLS_PER_CHUNK // len(moments))
+        
+        for chunk_start in range(0, len(candidates), rows_per_chunk):
+            chunk = candidates.subset(np.arange(chunk_start, min(chunk_start + rows_per_chunk, len(candidates))))
+            elevation = self.elevation(chunk, station, moments)
+            visible = elevation >= station.min_elevation  # NaN compares False
+            
+            change_rows, change_columns = np.nonzero(visible[:, 1:] != visible[:, :-1])
+            changing = chunk.subset(change_rows)
+            transition_moments = bisect_transitions(
+                lambda middle: self.elevation(changing, station, middle[:, None])[:, 0] >= station.min_elevation,
+                moments[change_columns],
+                moments[change_columns + 1],
+                visible[change_rows, change_columns],
+                iterations
+            )
+            
+            windows = list(iterate_windows(
+                visible, change_rows, change_columns, transition_moments, moments[0], moments[-1]
+            ))
+            if not windows:
+                continue
+            
+            rows, aos, los, first, last = (np.array(values) for values in zip(*windows))
+            
+            # Bracket culmination around the highest grid sample, clipped to the pass
+            peak_columns = np.array([
+                f + int(np.argmax(elevation[r, f:l + 1])) for r, f, l in zip(rows, first, last)
+            ])
+            culmination, max_elevation = self._maximize_elevation(
+                chunk.subset(rows),
+                station,
+                np.maximum(aos, moments[np.maximum(peak_columns - 1, 0)]),
+                np.minimum(los, moments[np.minimum(peak_columns + 1, len(moments) - 1)])
+            )
+            
+            for index, row in enumerate(rows):
+                object_id = int(chunk.object_ids[row])
+                passes[object_id].append(PassWindow(
+                    object_id=object_id,
+                    station_id=station.record_id,
+                    aos_time=_to_datetime(aos[index]),
+                    los_time=_to_datetime(los[index]),
+                    culmination_time=_to_datetime(culmination[index]),
+                    max_elevation=float(max_elevation[index])
+                ))
+        
+        log.info(
+            f"Pass search: {len(candidates)}/{len(elements)} objects after pre-filter, "
+            f"{len(moments)} grid steps"
+        )
+        return passes
+
+
+# ===========================================================================================
+# REGION QUERY SERVICE
+# ===========================================================================================
+
+class RegionQueryService:
+    """Service finding the objects over a geographic region ("what's overhead")"""
+    
+    def __init__(self, propagator: OrbitPropagator):
+        self.propagator = propagator
+    
+    @staticmethod
+    def can_reach_latitudes(
+        elements: OrbitalElementsBatch,
+        moment: float,
+        latitude_min: float,
+        latitude_max: float
+    ) -> np.ndarray:
+        """
+        Cheap pre-filter on orbital elements
+        
+        The ground track stays within +-inclination (retrograde: 180 - inclination),
+        so an orbit whose band does not overlap [latitude_min, latitude_max] never
+        passes over the region. Objects introduced after the moment are dropped too.
+        """
+        max_track_latitude = np.minimum(elements.inclination_deg, 180.0 - elements.inclination_deg)
+        return (
+            (max_track_latitude >= latitude_min)
+            & (-max_track_latitude <= latitude_max)
+            & (elements.epoch <= moment)
+        )
+    
+    def find_in_region(
+        self,
+        elements: OrbitalElementsBatch,
+        moment: datetime,
+        latitude_min: float,
+        latitude_max: float,
+        longitude_min: float,
+        longitude_max: float
+    ) -> RegionPositions:
+        """
+        Positions of the objects inside the box at the moment
+        
+        Returned longitudes are geographic, in [-180, 180), like the box.
+        
+        Args:
+            latitude_min, latitude_max: Latitude range [degrees]
+            longitude_min, longitude_max: Longitude range [degrees]; longitude_min greater
+                than longitude_max selects a box crossing the antimeridian
+        """
+        moment_seconds = moment.timestamp()
+        candidates = elements.subset(
+            self.can_reach_latitudes(elements, moment_seconds, latitude_min, latitude_max)
+        )
+        
+        latitude, right_ascension, altitude = (
+            values[:, 0] for values in self.propagator.propagate_batch(candidates, np.array([moment_seconds]))
+        )
+        # Propagated longitude is inertial; the box is geographic (Earth-fixed)
+        longitude = np.mod(
+            right_ascension - np.degrees(greenwich_sidereal_angle(moment_seconds)) + 180.0, 360.0
+        ) - 180.0
+        
+        if longitude_min <= longitude_max:
+            in_longitude = (longitude >= longitude_min) & (longitude <= longitude_max)
+        else:
+            in_longitude = (longitude >= longitude_min) | (longitude <= longitude_max)
+        # NaN (propagation failed) compares False
+        inside = in_longitude & (latitude >= latitude_min) & (latitude <= latitude_max)
+        
+        order = np.argsort(candidates.object_ids[inside], kind="stable")
+        return RegionPositions(
+            object_ids=candidates.object_ids[inside][order],
+            latitude=latitude[inside][order],
+            longitude=longitude[inside][order],
+            altitude=altitude[inside][order],
+            candidates=len(candidates)
+        )
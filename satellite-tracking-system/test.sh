@@ -32,7 +32,10 @@ echo ""
 echo "Preparing test environment..."
 pkill -f "uvicorn satellite_api:system_api" 2>/dev/null
 sleep 1
-.venv/bin/uvicorn satellite_api:system_api --host 127.0.0.1 --port 8001 --log-level error > /dev/null 2>&1 &
+# File database: background jobs are refused on the in-memory default
+TEST_DB_DIR=$(mktemp -d)
+SATELLITE_DATABASE_URL="sqlite:///$TEST_DB_DIR/catalog.db" \
+    .venv/bin/uvicorn satellite_api:system_api --host 127.0.0.1 --port 8001 --log-level error > /dev/null 2>&1 &
 UVICORN_PID=$!
 sleep 3
 echo ""
@@ -95,6 +98,10 @@ test_endpoint "Update Satellite" \
     "curl -s -X PUT $BASE_URL/satellites/1 -H 'Content-Type: application/json' -d '{\"name\":\"SAT-A-UPDATED\",\"operator\":\"TestOrg\",\"launch_date\":\"2020-01-01T00:00:00Z\",\"status\":\"active\",\"starting_lon_position\":0,\"associated_orbit_id\":1}'" \
     'SAT-A-UPDATED'
 
+test_endpoint "Catalog Change Feed" \
+    "curl -s '$BASE_URL/changes?since=0&limit=3'" \
+    '"cursor":1,"entity":"orbit","id":1,"operation":"create"'
+
 echo ""
 echo "PART 4: Orbital Calculations"
 echo "-----------------------------------"
@@ -107,6 +114,41 @@ test_endpoint "Calculate Position (2025)" \
     "curl -s '$BASE_URL/satellites/2/position?timestamp=2025-01-01T00:00:00Z'" \
     '"longitude"'
 
+test_endpoint "Position In One Query" \
+    "curl -s -D - -o /dev/null '$BASE_URL/satellites/1/position?timestamp=2024-06-15T12:00:00Z'" \
+    'queries;desc=1[^0-9]'
+
+test_endpoint "Satellite Track" \
+    "curl -s '$BASE_URL/satellites/1/track?start=2024-06-15T00:00:00Z&end=2024-06-15T01:00:00Z&step=10m'" \
+    '"source":"propagated","points":\[{"time":"2024-06-15T00:00:00.000Z"'
+
+test_endpoint "Satellites Overhead (whole globe)" \
+    "curl -s '$BASE_URL/satellites/overhead?lat_min=-90&lat_max=90&lon_min=-180&lon_max=180&timestamp=2024-06-15T12:00:00Z'" \
+    '"satellites":\[{"id":1,'
+
+test_endpoint "Conditional GET (ETag -> 304)" \
+    "curl -s -o /dev/null -w '%{http_code}' -H \"If-None-Match: \$(curl -s -D - -o /dev/null '$BASE_URL/satellites/1/position?timestamp=2024-06-15T12:00:00Z' | tr -d '\\r' | sed -n 's/^etag: //Ip')\" '$BASE_URL/satellites/1/position?timestamp=2024-06-15T12:00:00Z'" \
+    '304'
+
+test_endpoint "Calculate Eclipses" \
+    "curl -s '$BASE_URL/satellites/1/eclipses?start=2024-06-15T00:00:00Z&end=2024-06-16T00:00:00Z'" \
+    '"entry"'
+
+test_endpoint "Create Ground Station" \
+    "curl -s -X POST $BASE_URL/ground-stations/ -H 'Content-Type: application/json' -d '{\"name\":\"KRAKOW\",\"latitude\":50.06,\"longitude\":19.94,\"altitude\":0.22}'" \
+    '"min_elevation":10.0'
+
+test_endpoint "Predict Passes" \
+    "curl -s '$BASE_URL/satellites/1/passes?station_id=1&start=2024-06-15T00:00:00Z&end=2024-06-16T00:00:00Z'" \
+    '"max_elevation"'
+
+# At culmination the satellite is near the station: it must be inside a box around it
+CULMINATION=$(curl -s "$BASE_URL/satellites/1/passes?station_id=1&start=2024-06-15T00:00:00Z&end=2024-06-16T00:00:00Z" \
+    | grep -o '"culmination":"[^"]*"' | head -1 | cut -d'"' -f4)
+test_endpoint "Pass Culmination Is Overhead" \
+    "curl -s '$BASE_URL/satellites/overhead?lat_min=30&lat_max=70&lon_min=-15&lon_max=55&timestamp=$CULMINATION'" \
+    '"satellites":\[{"id":1,'
+
 echo ""
 echo "PART 5: Proximity Detection"
 echo "-----------------------------------"
@@ -115,10 +157,71 @@ test_endpoint "Detect Proximities" \
     "curl -s '$BASE_URL/proximities?start_date=2020-01-01T00:00:00Z&end_date=2025-06-30T00:00:00Z'" \
     'proximities'
 
+test_endpoint "Server-Timing Breakdown" \
+    "curl -s -D - -o /dev/null '$BASE_URL/proximities?start_date=2024-01-01T00:00:00Z&end_date=2024-01-01T06:00:00Z&precision=10m'" \
+    'plan;dur=.*total;dur='
+
+test_endpoint "Pose Without Model" \
+    "curl -s -X POST $BASE_URL/pose -H 'Content-Type: application/json' -d '{\"features\":[0.0]}'" \
+    'Pose model not configured'
+
+test_endpoint "Compute Backends Match Reference" \
+    ".venv/bin/python satellite_backends.py --verify --objects 20 --steps 60 && echo VERIFIED" \
+    'VERIFIED'
+
+# One orbit, three objects; the propagator solves only the pair that excludes object 3:
+# the whole orbit must be stepped, and the co-located pair reported once
+read -r -d '' MIXED_ORBIT_CHECK <<'PYTHON'
+from datetime import datetime, timedelta, timezone
+from satellite_api import EventAnalysisService, OrbitalCalculationService, ObjectDBModel, OrbitDBModel
+from satellite_services import KeplerianPropagator
+
+class PartlySolvablePropagator(KeplerianPropagator):
+    def co_orbital_separation(self, parameters, longitude_a, epoch_a, longitude_b, epoch_b):
+        if 120.0 in (longitude_a, longitude_b):
+            return None
+        return super().co_orbital_separation(parameters, longitude_a, epoch_a, longitude_b, epoch_b)
+
+orbit = OrbitDBModel(record_id=1, altitude_km=550, inclination_angle=51.6, ascending_node=90,
+                     eccentricity=0.0, argument_of_perigee=0.0, drag_term=0.0)
+objects = [
+    ObjectDBModel(record_id=record_id, operational_state="active", starting_lon_position=longitude,
+                  introduction_date=datetime(2020, 1, 1, tzinfo=timezone.utc),
+                  associated_orbit_id=1, orbit_ref=orbit)
+    for record_id, longitude in ((1, 0.0), (2, 0.0), (3, 120.0))
+]
+service = EventAnalysisService(OrbitalCalculationService(PartlySolvablePropagator()))
+start, end, step = datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 1, 1, 1, tzinfo=timezone.utc), timedelta(minutes=10)
+plan = service.plan_scan(objects, start, end, step)
+result = service.detect_events_in_interval(objects, start, end, step, plan=plan)
+print(f"closed_form={len(plan.events)} stepped={sorted(plan.stepped_pairs)} "
+      f"encounters={sorted((e.object_id_a, e.object_id_b) for e in result.events)}")
+PYTHON
+
+test_endpoint "Partly Solvable Orbit Is Stepped" \
+    ".venv/bin/python -c \"\$MIXED_ORBIT_CHECK\" 2>/dev/null" \
+    '^closed_form=0 stepped=\[(1, 2), (1, 3), (2, 3)\] encounters=\[(1, 2)\]$'
+
+test_endpoint "Submit Proximity Job" \
+    "curl -s -X POST $BASE_URL/proximities/jobs -H 'Content-Type: application/json' -d '{\"start_date\":\"2024-01-01T00:00:00Z\",\"end_date\":\"2024-01-02T00:00:00Z\",\"precision\":\"1m\"}'" \
+    '"steps_total"'
+
 echo ""
-echo "PART 6: Validation and Errors"
+echo "PART 6: Catalog Import"
 echo "-----------------------------------"
 
+test_endpoint "Import TLE Catalog" \
+    "printf '%s\\n' 'ISS (ZARYA)' '1 25544U 98067A   24001.50000000  .00016717  00000-0  10270-3 0  9009' '2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391 56354' | curl -s -X POST '$BASE_URL/satellites/tle?operator=NASA' --data-binary @-" \
+    '"created":1'
+
+echo ""
+echo "PART 7: Validation and Errors"
+echo "-----------------------------------"
+
+test_endpoint "Reject Over-Budget Scan" \
+    "curl -s '$BASE_URL/proximities?start_date=2020-01-01T00:00:00Z&end_date=2025-06-30T00:00:00Z&precision=1ms'" \
+    'Scan too expensive'
+
 test_endpoint "Invalid Altitude (too low)" \
     "curl -s -X POST $BASE_URL/orbits/ -H 'Content-Type: application/json' -d '{\"name\":\"INVALID\",\"altitude\":50,\"inclination\":51.6,\"raan\":90}'" \
     '"detail"'
@@ -140,7 +243,7 @@ test_endpoint "Non-existent Satellite" \
     "not found"
 
 echo ""
-echo "PART 7: Resource Deletion"
+echo "PART 8: Resource Deletion"
 echo "-----------------------------------"
 
 test_endpoint "Delete Satellite" \
@@ -156,7 +259,7 @@ test_endpoint "Delete Orbit (with satellites)" \
     "detail"
 
 echo ""
-echo "PART 8: Pagination"
+echo "PART 9: Pagination"
 echo "-----------------------------------"
 
 test_endpoint "Pagination (skip=0, limit=1)" \
@@ -167,6 +270,62 @@ test_endpoint "Pagination (skip=1, limit=1)" \
     "curl -s '$BASE_URL/satellites/?skip=1&limit=1'" \
     'skip'
 
+echo ""
+echo "PART 10: Query Counts (constant as the catalog grows)"
+echo "-----------------------------------"
+
+# SQL statements of one request, from the Server-Timing header
+query_count() {
+    curl -s -D - -o /dev/null "$1" | tr -d '\r' | sed -n 's/^server-timing:.*queries;desc=\([0-9]*\).*/\1/Ip'
+}
+
+# Any catalog write bumps the revision, so the next request rebuilds the cached catalog
+CATALOG_WRITES=0
+touch_catalog() {
+    CATALOG_WRITES=$((CATALOG_WRITES + 1))
+    curl -s -o /dev/null -X PUT $BASE_URL/satellites/1 -H 'Content-Type: application/json' \
+        -d "{\"name\":\"SAT-A-UPDATED\",\"operator\":\"TestOrg-$CATALOG_WRITES\",\"launch_date\":\"2020-01-01T00:00:00Z\",\"status\":\"active\",\"starting_lon_position\":0,\"associated_orbit_id\":1}"
+}
+
+# "cold warm": first request after a catalog write, then the same request again
+query_counts() {
+    touch_catalog
+    local cold=$(query_count "$1")
+    echo "$cold $(query_count "$1")"
+}
+
+QUERY_COUNT_URLS=(
+    "$BASE_URL/satellites/1/position?timestamp=2024-06-15T12:00:00Z"
+    "$BASE_URL/proximities?start_date=2024-01-01T00:00:00Z&end_date=2024-01-01T06:00:00Z&precision=10m"
+    "$BASE_URL/satellites/overhead?lat_min=-90&lat_max=90&lon_min=-180&lon_max=180&timestamp=2024-06-15T12:00:00Z"
+    "$BASE_URL/satellites/"
+    "$BASE_URL/orbits/"
+    "$BASE_URL/changes?since=0"
+)
+QUERY_COUNT_NAMES=("Position" "Proximities" "Overhead" "List Satellites" "List Orbits" "Change Feed")
+QUERY_COUNT_EXPECTED=("1 1" "2 1" "3 1" "2 2" "2 2" "4 4")
+
+QUERIES_BEFORE=()
+for url in "${QUERY_COUNT_URLS[@]}"; do
+    QUERIES_BEFORE+=("$(query_counts "$url")")
+done
+
+# Grow the catalog by 30 satellites
+for i in $(seq 1 30); do
+    curl -s -o /dev/null -X POST $BASE_URL/satellites/ -H 'Content-Type: application/json' \
+        -d "{\"name\":\"SEED-$i\",\"operator\":\"TestOrg\",\"launch_date\":\"2020-01-01T00:00:00Z\",\"status\":\"active\",\"starting_lon_position\":$((i * 11 - 170)),\"associated_orbit_id\":2}"
+done
+
+test_endpoint "Catalog Grown" \
+    "curl -s '$BASE_URL/satellites/?limit=100'" \
+    '"name":"SEED-30"'
+
+for index in "${!QUERY_COUNT_URLS[@]}"; do
+    test_endpoint "Query Count: ${QUERY_COUNT_NAMES[$index]}" \
+        "echo before=${QUERIES_BEFORE[$index]} after=\$(query_counts '${QUERY_COUNT_URLS[$index]}')" \
+        "^before=${QUERY_COUNT_EXPECTED[$index]} after=${QUERY_COUNT_EXPECTED[$index]}\$"
+done
+
 echo ""
 echo "========================================="
 echo "FINAL RESULTS"
@@ -189,3 +348,4 @@ fi
 echo ""
 echo "Test completed."
 pkill -f "uvicorn satellite_api:system_api" 2>/dev/null || true
+rm -rf "$TEST_DB_DIR"